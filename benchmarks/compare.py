@@ -0,0 +1,64 @@
+"""Compare two benchmark result files case by case.
+
+    python benchmarks/compare.py base.json new.json [--threshold 10] [--fail]
+
+Latency and CPU going up, or throughput going down, by more than threshold percent
+is flagged as a regression; --fail makes that the exit code.
+"""
+import argparse
+import json
+import sys
+
+# (label, getter, True if higher is better)
+METRICS = [
+    ("p50 ms", lambda r: r["latency_ms"].get("p50"), False),
+    ("p99 ms", lambda r: r["latency_ms"].get("p99"), False),
+    ("thru/s", lambda r: r["throughput_hz"], True),
+    ("prod cpu%", lambda r: r["producer"]["cpu_percent"], False),
+    ("cons cpu%", lambda r: r["consumer"]["cpu_percent"], False),
+    ("cons rss MB", lambda r: r["consumer"]["max_rss_mb"], False),
+]
+
+
+def load(path):
+    with open(path, "r") as f:
+        data = json.load(f)
+    return data["meta"], {row["case"]: row for row in data["results"]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("base")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=10.0, help="percent change flagged as a regression")
+    parser.add_argument("--fail", action="store_true", help="exit 1 when there is a regression")
+    args = parser.parse_args()
+
+    base_meta, base = load(args.base)
+    new_meta, new = load(args.new)
+    print(f"base {base_meta['commit']}  ->  new {new_meta['commit']}")
+    regressions = 0
+    for case in sorted(set(base) | set(new)):
+        if case not in base or case not in new:
+            print(f"{case:<28} only in {'new' if case in new else 'base'}")
+            continue
+        b, n = base[case], new[case]
+        if "error" in b or "error" in n:
+            print(f"{case:<28} error in {'base' if 'error' in b else 'new'}")
+            continue
+        cells = []
+        for label, get, higher_better in METRICS:
+            old, cur = get(b), get(n)
+            if not old or cur is None:
+                continue
+            change = 100.0 * (cur - old) / old
+            worse = change < -args.threshold if higher_better else change > args.threshold
+            regressions += worse
+            cells.append(f"{label} {old:.2f}->{cur:.2f} ({change:+.0f}%){' !' if worse else ''}")
+        print(f"{case:<28} " + "  ".join(cells))
+    print(f"{regressions} regression(s) over {args.threshold:.0f}%")
+    return 1 if args.fail and regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
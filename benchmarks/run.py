@@ -0,0 +1,186 @@
+"""Data plane benchmarks: one producer and one consumer skill per case, each case a
+payload kind under one set of bot runtime settings (transport, envelope, codec).
+
+    python benchmarks/run.py                      # every case, results/<commit>-<time>.json
+    python benchmarks/run.py -p ndarray -c raw    # only cases whose names contain these
+    python benchmarks/compare.py old.json new.json
+
+The skills import std_functs from this checkout (TALOS_STD_FUNCTS), so the numbers
+belong to the working tree that is measured.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import yaml
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+STD_FUNCTS = os.path.join(REPO_ROOT, "docs", "assets", "lib", "std_functs")
+SKILLS = os.path.join(BENCH_DIR, "skills")
+ATTR = "bench_producer.payload"
+
+TRANSPORTS = {
+    "file-json": {},
+    "file-binary": {"envelope": "binary"},
+    "shm-json": {"transport": "shm"},
+    "shm-binary": {"transport": "shm", "envelope": "binary"},
+}
+
+# payload -> [(case name, runtime settings)]
+CASES = {
+    "scalar": list(TRANSPORTS.items()),
+    "list": list(TRANSPORTS.items()) + [("json-zlib", {"codecs": {ATTR: "json-zlib"}})],
+    "dict": [("file-json", {}), ("json-zlib", {"codecs": {ATTR: "json-zlib"}})],
+    "ndarray": [
+        ("png", {"codecs": {ATTR: "png"}}),
+        ("png-fast", {"codecs": {ATTR: "png-fast"}}),
+        ("raw", {"codecs": {ATTR: "raw"}}),
+        ("delta-zlib", {"codecs": {ATTR: "delta-zlib"}}),
+        ("mmap", {"ndarray_format": "mmap"}),
+        ("raw-shm-binary", {"transport": "shm", "envelope": "binary", "codecs": {ATTR: "raw"}}),
+    ],
+    "image": [("png", {"codecs": {ATTR: "png"}}), ("png-fast", {"codecs": {ATTR: "png-fast"}})],
+}
+
+
+def percentile(ordered, q):
+    if not ordered:
+        return None
+    index = min(len(ordered) - 1, max(0, int(round(q / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def requested_codec(runtime):
+    """Codec a case asks for the payload, None when it leaves the choice to the defaults."""
+    return (runtime.get("codecs") or {}).get(ATTR)
+
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                             capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--", "docs/assets/lib/std_functs"],
+                               cwd=REPO_ROOT, capture_output=True, text=True).stdout.strip()
+        return out + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run_case(payload, name, runtime, duration, hz):
+    bot = tempfile.mkdtemp(prefix="talos_bench_")
+    procs = {}
+    try:
+        shutil.copytree(SKILLS, os.path.join(bot, "skills"))
+        with open(os.path.join(bot, "config.yaml"), "w") as f:
+            yaml.safe_dump({"name": "bench", "runtime": runtime}, f)
+        env = dict(os.environ, TALOS_STD_FUNCTS=STD_FUNCTS, BENCH_PAYLOAD=payload,
+                   BENCH_HZ=str(hz), BENCH_DURATION=str(duration), BENCH_STOP=os.path.join(bot, "stop"))
+        results = {}
+        for role in ("bench_consumer", "bench_producer"):
+            results[role] = os.path.join(bot, f"{role}.json")
+            main_py = os.path.join(bot, "skills", role, "src", "main.py")
+            procs[role] = subprocess.Popen([sys.executable, "-u", main_py], cwd=os.path.dirname(main_py),
+                                           env=dict(env, BENCH_RESULT=results[role]),
+                                           stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+            if role == "bench_consumer":
+                time.sleep(0.3)  # consumer waits on its input before the first frame exists
+
+        start = time.monotonic()
+        out_producer, _ = procs["bench_producer"].communicate(timeout=duration + 60)
+        wall = time.monotonic() - start
+        time.sleep(0.5)  # last frames still in flight
+        open(env["BENCH_STOP"], "w").close()
+        out_consumer, _ = procs["bench_consumer"].communicate(timeout=30)
+
+        data = {}
+        for role, path in results.items():
+            try:
+                with open(path, "r") as f:
+                    data[role] = json.load(f)
+            except (OSError, ValueError):
+                data[role] = {}
+        producer, consumer = data["bench_producer"], data["bench_consumer"]
+        lat = sorted(consumer.get("latencies", []))
+        codecs = sorted(producer.get("codecs", {}))
+        row = {
+            "case": f"{payload}/{name}",
+            "payload": payload,
+            "config": name,
+            "runtime": runtime,
+            "hz": hz,
+            "codecs": codecs,
+            "duration_s": round(wall, 3),
+            "sent": producer.get("sent", 0),
+            "received": len(lat),
+            "throughput_hz": round(len(lat) / wall, 2) if wall else 0.0,
+            "latency_ms": {k: round(v * 1000, 3) for k, v in (
+                ("p50", percentile(lat, 50)), ("p90", percentile(lat, 90)),
+                ("p99", percentile(lat, 99)), ("max", lat[-1] if lat else None)) if v is not None},
+            "producer": {"cpu_percent": round(100 * producer.get("cpu_s", 0) / wall, 1) if wall else 0.0,
+                         "max_rss_mb": round(producer.get("max_rss_bytes", 0) / 1e6, 1),
+                         "overruns": producer.get("clock", {}).get("overruns"),
+                         "write_ms": producer.get("clock", {}).get("phases", {}).get("write", {}).get("mean_ms")},
+            "consumer": {"cpu_percent": round(100 * consumer.get("cpu_s", 0) / wall, 1) if wall else 0.0,
+                         "max_rss_mb": round(consumer.get("max_rss_bytes", 0) / 1e6, 1),
+                         "read_ms": consumer.get("clock", {}).get("phases", {}).get("read", {}).get("mean_ms")},
+        }
+        if not lat:
+            # keep the skills' output, it usually says which dependency is missing
+            row["error"] = (out_producer or "")[-2000:] + (out_consumer or "")[-2000:] or "nothing received"
+        elif requested_codec(runtime) not in (None, *codecs):
+            # e.g. no cv2: "png" quietly falls back to raw, which is not what the case measures
+            row["error"] = f"requested codec {requested_codec(runtime)}, encoded as {', '.join(codecs) or 'nothing'}"
+        return row
+    finally:
+        for proc in procs.values():
+            if proc.poll() is None:
+                proc.kill()
+        shutil.rmtree(bot, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-p", "--payload", action="append", help="payload kinds to run (default: all)")
+    parser.add_argument("-c", "--config", action="append", help="only case names containing this")
+    parser.add_argument("-d", "--duration", type=float, default=5.0, help="seconds per case")
+    parser.add_argument("--hz", type=float, default=60.0, help="producer tick rate")
+    parser.add_argument("-o", "--out", help="result file (default: benchmarks/results/<commit>-<time>.json)")
+    args = parser.parse_args()
+
+    rows = []
+    for payload, cases in CASES.items():
+        if args.payload and payload not in args.payload:
+            continue
+        for name, runtime in cases:
+            if args.config and not any(c in name for c in args.config):
+                continue
+            row = run_case(payload, name, runtime, args.duration, args.hz)
+            rows.append(row)
+            lat = row["latency_ms"]
+            status = f"ERROR {row['error'].strip().splitlines()[-1]}" if "error" in row else \
+                f"p50 {lat.get('p50', 0):8.2f} ms  p99 {lat.get('p99', 0):8.2f} ms  " \
+                f"{row['throughput_hz']:7.1f}/s  cpu {row['producer']['cpu_percent']:5.1f}% + {row['consumer']['cpu_percent']:5.1f}%"
+            print(f"{row['case']:<28} {status}")
+
+    commit = git_commit()
+    out = args.out or os.path.join(BENCH_DIR, "results", f"{commit}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w") as f:
+        json.dump({
+            "meta": {"commit": commit, "time": time.time(), "python": platform.python_version(),
+                     "platform": platform.platform(), "cpus": os.cpu_count(),
+                     "duration_s": args.duration, "hz": args.hz},
+            "results": rows,
+        }, f, indent=2)
+    print(f"results written to {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# Generated from Skill_template, with the std_functs path taken from the benchmark harness
+import os, sys, time, json
+
+path = os.environ.get("TALOS_STD_FUNCTS") or os.path.join(os.path.expanduser("~"), "Documents", "talos", "assets", "lib", "std_functs")
+
+if path not in sys.path:
+    sys.path.insert(0, path)
+
+from read_write_temp import *
+from tick_clock import TickClock
+
+CURRENT = os.path.abspath(os.path.dirname(__file__))
+T_O_P = os.path.abspath(os.path.join(CURRENT, "..", "..", "..", "out"))
+S_A_P = os.path.abspath(os.path.join(CURRENT, "..", "..", ".."))
+os.makedirs(T_O_P, exist_ok=True)
+CONF_FILE = os.path.join(S_A_P, "config.yaml")
+RESULT_FILE = os.environ.get("BENCH_RESULT")
+STOP_FILE = os.environ.get("BENCH_STOP", os.path.join(S_A_P, "stop"))
+
+from user_main import userMain
+
+from skill_io import *
+
+#--------------------------
+
+def main():
+
+    input_descriptor = [("bench_producer_out.glob", "seq", "seq", 0),
+                        ("bench_producer_out.glob", "sent", "sent", 0),
+                        ("bench_producer_out.glob", "payload", "payload", 0)]
+    clock = TickClock(0)
+    latencies = []
+    last_seq = 0
+    try:
+        # the harness creates STOP_FILE once the producer is done
+        while not os.path.exists(STOP_FILE):
+            if not wait_for_inputs(T_O_P, input_descriptor, timeout=0.1):
+                continue
+            clock.wait()
+
+            with clock.phase("read"):
+                bench_consumer_IP_obj = readFromFile(T_O_P, CONF_FILE, bench_consumer_IP(), input_descriptor)
+            if bench_consumer_IP_obj.seq == last_seq or bench_consumer_IP_obj.payload is None:
+                continue
+            last_seq = bench_consumer_IP_obj.seq
+            with clock.phase("compute"):
+                bench_consumer_OP_obj = userMain(bench_consumer_IP_obj)
+            latencies.append(bench_consumer_OP_obj.latency)
+
+    except KeyboardInterrupt:
+        print("\nStopped.")
+    if RESULT_FILE:
+        result = {"received": len(latencies), "last_seq": last_seq, "latencies": latencies, "clock": clock.stats()}
+        result.update(usage())
+        with open(RESULT_FILE, "w") as f:
+            json.dump(result, f)
+
+def usage():
+    try:
+        import resource
+    except ImportError:
+        return {}
+    ru = resource.getrusage(resource.RUSAGE_SELF)
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = ru.ru_maxrss if sys.platform == "darwin" else ru.ru_maxrss * 1024
+    return {"cpu_s": ru.ru_utime + ru.ru_stime, "max_rss_bytes": rss}
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,9 @@
+class bench_consumer_IP:
+    def __init__(self):
+        self.seq = 0
+        self.sent = 0.0
+        self.payload = None
+
+class bench_consumer_OP:
+    def __init__(self):
+        self.latency = 0.0
@@ -0,0 +1,13 @@
+# Benchmark consumer: measures how long a payload took from the producer to here
+#--------IMPORTS-------------#
+import time
+#----------------------------
+
+from skill_io import *
+
+def userMain(bench_consumer_IP_obj) -> bench_consumer_OP:
+    OP_obj = bench_consumer_OP()
+    #----------- User-Driver Code -----------#
+    OP_obj.latency = time.time() - bench_consumer_IP_obj.sent
+    #----------------------------------------
+    return OP_obj
@@ -0,0 +1,63 @@
+# Generated from Skill_template, with the std_functs path and tick rate taken from the benchmark harness
+import os, sys, time, json
+
+path = os.environ.get("TALOS_STD_FUNCTS") or os.path.join(os.path.expanduser("~"), "Documents", "talos", "assets", "lib", "std_functs")
+
+if path not in sys.path:
+    sys.path.insert(0, path)
+
+from read_write_temp import *
+from tick_clock import TickClock
+
+CURRENT = os.path.abspath(os.path.dirname(__file__))
+T_O_P = os.path.abspath(os.path.join(CURRENT, "..", "..", "..", "out"))
+S_A_P = os.path.abspath(os.path.join(CURRENT, "..", "..", ".."))
+os.makedirs(T_O_P, exist_ok=True)
+CONF_FILE = os.path.join(S_A_P, "config.yaml")
+OUTPUT_FILE = os.path.join(T_O_P, "bench_producer_out.glob")
+TICK_HZ = float(os.environ.get("BENCH_HZ", "60"))
+DURATION = float(os.environ.get("BENCH_DURATION", "5"))
+RESULT_FILE = os.environ.get("BENCH_RESULT")
+
+from user_main import userMain
+
+from skill_io import *
+
+#--------------------------
+
+def main():
+
+    input_descriptor = []
+    clock = TickClock(TICK_HZ, policy="drop")
+    end = time.monotonic() + DURATION
+    try:
+        while time.monotonic() < end:
+            clock.wait()
+
+            with clock.phase("compute"):
+                bench_producer_OP_obj = userMain(bench_producer_IP())
+            with clock.phase("write"):
+                writeToFile(bench_producer_OP_obj, OUTPUT_FILE, "bench_producer")
+
+    except KeyboardInterrupt:
+        print("\nStopped.")
+    flush_writers()
+    if RESULT_FILE:
+        # codecs the payload was actually encoded with, a missing dependency falls back to another one
+        result = {"sent": clock.ticks, "clock": clock.stats(), "writer": writer_stats(), "codecs": codec_stats()}
+        result.update(usage())
+        with open(RESULT_FILE, "w") as f:
+            json.dump(result, f)
+
+def usage():
+    try:
+        import resource
+    except ImportError:
+        return {}
+    ru = resource.getrusage(resource.RUSAGE_SELF)
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = ru.ru_maxrss if sys.platform == "darwin" else ru.ru_maxrss * 1024
+    return {"cpu_s": ru.ru_utime + ru.ru_stime, "max_rss_bytes": rss}
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,9 @@
+class bench_producer_IP:
+    def __init__(self):
+        pass
+
+class bench_producer_OP:
+    def __init__(self):
+        self.seq = 0
+        self.sent = 0.0
+        self.payload = None
@@ -0,0 +1,52 @@
+# Benchmark producer: emits a sequence number, a send timestamp and a synthetic payload
+#--------IMPORTS-------------#
+import os
+import time
+#----------------------------
+
+from skill_io import *
+
+PAYLOAD = os.environ.get("BENCH_PAYLOAD", "scalar")
+_state = {"seq": 0, "base": None}
+
+def _base():
+    if _state["base"] is None:
+        if PAYLOAD == "list":
+            _state["base"] = [float(i) for i in range(100_000)]
+        elif PAYLOAD == "dict":
+            _state["base"] = {f"key_{i}": {"id": i, "score": i * 0.5, "tag": "x" * 8} for i in range(10_000)}
+        elif PAYLOAD in ("ndarray", "image"):
+            import numpy as np
+            # noise compresses like a real frame would, not like a flat color
+            rng = np.random.default_rng(0)
+            _state["base"] = rng.integers(0, 255, (1080, 1920, 3), dtype=np.uint8)
+    return _state["base"]
+
+def userMain(bench_producer_IP_obj) -> bench_producer_OP:
+    OP_obj = bench_producer_OP()
+    #----------- User-Driver Code -----------#
+    _state["seq"] += 1
+    seq = _state["seq"]
+    if PAYLOAD == "scalar":
+        payload = seq * 0.5
+    elif PAYLOAD == "list":
+        payload = list(_base())
+        payload[0] = float(seq)
+    elif PAYLOAD == "dict":
+        payload = dict(_base())
+        payload["seq"] = seq
+    else:
+        # a new frame object every tick, like a camera
+        payload = _base().copy()
+        payload[0, :16] = seq % 256
+        if PAYLOAD == "image":
+            from PIL import Image
+            payload = Image.fromarray(payload)
+    #----------------------------------------
+
+    #-------- Output->Object wrapping -------#
+    OP_obj.seq = seq
+    OP_obj.payload = payload
+    OP_obj.sent = time.time()  # last, so encode time counts as latency
+    #----------------------------------------
+    return OP_obj
@@ -15,6 +15,7 @@ if path not in sys.path:
     sys.path.append(path)
 
 from read_write_temp import *
+from tick_clock import TickClock
 
 
 CURRENT = os.path.abspath(os.path.dirname(__file__))
@@ -32,13 +33,22 @@ def main():
     keys = ["w", "a", "s", "d", "space"]
     print("Press some keys...")
 
+    input_descriptor = [] # keys only come from static config, nothing upstream to wait on
+
+    clock = TickClock(200, stats_path=os.path.join(OUTPUT_FILE, "tick_stats.json"))
+
     try:
         while True:
-            keyboard_input_IP = KeyboardInput_IP()
-            # keyboard_input_IP = readFromFile(...)
-            keyboard_input_OP = userMain(keyboard_input_IP.keys)
-
-            writeToFile(keyboard_input_OP, OUTPUT_FILE)
+            # keyboard state has to be polled, at a fixed rate instead of spinning a core
+            clock.wait()
+
+            with clock.phase("read"):
+                keyboard_input_IP = KeyboardInput_IP()
+                # keyboard_input_IP = readFromFile(...)
+            with clock.phase("compute"):
+                keyboard_input_OP = userMain(keyboard_input_IP.keys)
+            with clock.phase("write"):
+                writeToFile(keyboard_input_OP, OUTPUT_FILE)
 
     except KeyboardInterrupt:
         print("\nStopped.")
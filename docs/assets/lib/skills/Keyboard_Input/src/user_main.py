@@ -3,9 +3,15 @@ import keyboard
 
 from skill_io import *
 
+# key_list arrives every tick, it is only parsed again when it changes
+_watched = None
+
 def userMain(key_list) -> KeyboardInput_OP:
+    global _watched
+    if _watched is None or _watched.hotkeys != tuple(key_list):
+        _watched = keyboard.KeySet(key_list)
     OP_obj = KeyboardInput_OP()
-    OP_obj.pressed = [keyboard.is_pressed(key) for key in key_list]
+    OP_obj.pressed = keyboard.are_pressed(_watched)
     return OP_obj
 
 
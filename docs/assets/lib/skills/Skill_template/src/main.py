@@ -15,6 +15,7 @@ if path not in sys.path:
     sys.path.append(path)
 
 from read_write_temp import *
+from tick_clock import TickClock
 
 CURRENT = os.path.abspath(os.path.dirname(__file__))
 T_O_P = os.path.abspath(os.path.join(CURRENT, "..", "..", "..", "out"))
@@ -22,6 +23,7 @@ S_A_P = os.path.abspath(os.path.join(CURRENT, "..", "..", ".."))
 os.makedirs(T_O_P, exist_ok=True)
 CONF_FILE = os.path.join(S_A_P, "config.yaml")
 OUTPUT_FILE = os.path.join(T_O_P, "<skill_ID>_out.glob")
+TICK_HZ = None # ticks per second; None -> TALOS_TICK_HZ, 0 -> tick whenever an upstream skill publishes
 
 from user_main import userMain
 
@@ -31,14 +33,26 @@ from skill_io import *
 
 def main():
 
+    input_descriptor =  [(fromSkillID, fromAttributeID, toAttributeID, isStatic? 1:0), ...]
+    # overruns and read/compute/write timings end up in OUTPUT_FILE/tick_stats.json
+    clock = TickClock(TICK_HZ, policy="drop", stats_path=os.path.join(OUTPUT_FILE, "tick_stats.json"))
+
     try:
         while True:
-            <skill_id>_IP_obj = KeyboardInput_IP()
-            input_descriptor =  [(fromSkillID, fromAttributeID, toAttributeID, isStatic? 1:0), ...]
-            <skill_id>_IP_obj = readFromFile(T_O_P, CONF_PATH, <skill_id>_IP_obj, input_descriptor) # temp_path -> /out i.e T_O_P for dynamic. If static, temp_path -> bot's config.yaml
-            <skill_id>_OP_obj = userMain(<skill_id>_IP_obj)
-
-            writeToFile(<skill_id>_OP_obj, OUTPUT_FILE, <fromSkillID>)
+            # without a fixed rate, sleep until an upstream skill publishes; skills with only static inputs tick once per timeout
+            if not clock.hz and not wait_for_inputs(T_O_P, input_descriptor, timeout=1.0):
+                continue
+            clock.wait()
+
+            with clock.phase("read"):
+                <skill_id>_IP_obj = KeyboardInput_IP()
+                <skill_id>_IP_obj = readFromFile(T_O_P, CONF_PATH, <skill_id>_IP_obj, input_descriptor) # temp_path -> /out i.e T_O_P for dynamic. If static, temp_path -> bot's config.yaml
+            with clock.phase("compute"):
+                <skill_id>_OP_obj = userMain(<skill_id>_IP_obj)
+            # only attributes that changed are re-encoded; large arrays, lists and dicts are
+            # compared by identity, so after mutating one in place call mark_dirty(OUTPUT_FILE, "<attr>")
+            with clock.phase("write"):
+                writeToFile(<skill_id>_OP_obj, OUTPUT_FILE, <fromSkillID>)
 
     except KeyboardInterrupt:
         print("\nStopped.")
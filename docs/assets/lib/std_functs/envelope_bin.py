@@ -0,0 +1,191 @@
+import json
+import struct
+from array import array
+
+# Compact binary envelope, the alternative to output.json.
+#
+#   header   magic "TLE1", attr count u16, timestamp f64, epoch u64, version u64,
+#            skill_id (u16 length + utf-8)
+#   table    per attribute: name (u16 length + utf-8), offset u32, length u32
+#   records  per attribute: tag u8, version u64, type (u8 length + ascii), payload
+#
+# Readers go through the offset table and decode only the attributes they ask for.
+# Lists of bools/ints/floats are stored as packed native arrays instead of JSON text.
+
+MAGIC = b"TLE1"
+_HEADER = struct.Struct("<4sHdQQH")
+_TABLE = struct.Struct("<II")
+_RECORD = struct.Struct("<BQB")
+_U16 = struct.Struct("<H")
+
+T_BOOL, T_INT, T_FLOAT, T_STR, T_BOOLS, T_INTS, T_FLOATS, T_JSON, T_FILE = range(1, 10)
+_INT_MIN, _INT_MAX = -(1 << 63), (1 << 63) - 1
+
+# envelope entry keys that are rebuilt from the record header, the rest of a file
+# entry (path, format, shape, dtype, ...) is kept as JSON
+_RECORD_KEYS = ("storage", "type", "version", "value")
+
+
+def _pack_str(s):
+    data = s.encode("utf-8")
+    return _U16.pack(len(data)) + data
+
+
+def _encode_value(value):
+    if isinstance(value, bool):
+        return T_BOOL, b"\x01" if value else b"\x00"
+    if isinstance(value, int) and _INT_MIN <= value <= _INT_MAX:
+        return T_INT, struct.pack("<q", value)
+    if isinstance(value, float):
+        return T_FLOAT, struct.pack("<d", value)
+    if isinstance(value, str):
+        return T_STR, value.encode("utf-8")
+    if isinstance(value, list) and value:
+        kinds = {type(v) for v in value}
+        if kinds == {bool}:
+            return T_BOOLS, bytes(value)
+        if kinds == {int} and _INT_MIN <= min(value) and max(value) <= _INT_MAX:
+            return T_INTS, array("q", value).tobytes()
+        if kinds == {float}:
+            return T_FLOATS, array("d", value).tobytes()
+    return T_JSON, json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+
+def _decode_value(tag, payload):
+    if tag == T_BOOL:
+        return payload == b"\x01"
+    if tag == T_INT:
+        return struct.unpack("<q", payload)[0]
+    if tag == T_FLOAT:
+        return struct.unpack("<d", payload)[0]
+    if tag == T_STR:
+        return payload.decode("utf-8")
+    if tag == T_BOOLS:
+        return [b != 0 for b in payload]
+    if tag == T_INTS:
+        arr = array("q")
+        arr.frombytes(payload)
+        return arr.tolist()
+    if tag == T_FLOATS:
+        arr = array("d")
+        arr.frombytes(payload)
+        return arr.tolist()
+    return json.loads(payload)
+
+
+def encode(envelope):
+    """Envelope dict (same shape as output.json) -> bytes."""
+    attrs = envelope["attributes"]
+    records = []
+    for name, entry in attrs.items():
+        if entry.get("storage") == "inline":
+            tag, payload = _encode_value(entry.get("value"))
+        else:
+            tag = T_FILE
+            meta = {k: v for k, v in entry.items() if k not in _RECORD_KEYS}
+            payload = json.dumps(meta, separators=(",", ":")).encode("utf-8")
+        type_name = entry.get("type", "unknown").encode("ascii")
+        records.append((name, _RECORD.pack(tag, entry.get("version", 0), len(type_name)) + type_name + payload))
+
+    skill_id = envelope.get("skill_id", "").encode("utf-8")
+    head = _HEADER.pack(MAGIC, len(records), envelope.get("timestamp", 0.0), envelope.get("epoch", 0),
+                        envelope.get("version", 0), len(skill_id)) + skill_id
+    table_size = sum(_U16.size + len(name.encode("utf-8")) + _TABLE.size for name, _ in records)
+    offset = len(head) + table_size
+    table = []
+    for name, record in records:
+        table.append(_pack_str(name) + _TABLE.pack(offset, len(record)))
+        offset += len(record)
+    return b"".join([head] + table + [record for _, record in records])
+
+
+class LazyAttributes:
+    """dict-like view over the records of a binary envelope; decodes on first access."""
+
+    def __init__(self, buf, table):
+        self._buf = buf
+        self._table = table  # name -> (offset, length)
+        self._decoded = {}
+
+    def get(self, name, default=None):
+        entry = self._decoded.get(name)
+        if entry is not None:
+            return entry
+        loc = self._table.get(name)
+        if loc is None:
+            return default
+        entry = _decode_record(memoryview(self._buf)[loc[0]:loc[0] + loc[1]])
+        self._decoded[name] = entry
+        return entry
+
+    def __getitem__(self, name):
+        entry = self.get(name)
+        if entry is None:
+            raise KeyError(name)
+        return entry
+
+    def __contains__(self, name):
+        return name in self._table
+
+    def __iter__(self):
+        return iter(self._table)
+
+    def __len__(self):
+        return len(self._table)
+
+    def keys(self):
+        return self._table.keys()
+
+    def items(self):
+        return [(name, self.get(name)) for name in self._table]
+
+
+def _decode_record(rec):
+    tag, version, type_len = _RECORD.unpack_from(rec, 0)
+    start = _RECORD.size
+    type_name = bytes(rec[start:start + type_len]).decode("ascii")
+    payload = bytes(rec[start + type_len:])
+    if tag == T_FILE:
+        entry = json.loads(payload)
+        entry["storage"] = "file"
+    else:
+        entry = {"storage": "inline", "value": _decode_value(tag, payload)}
+    entry["type"] = type_name
+    entry["version"] = version
+    return entry
+
+
+def is_binary(buf):
+    return bytes(buf[:4]) == MAGIC
+
+
+def peek_version(head):
+    """(epoch, version) from the first bytes of a binary envelope, None if they don't hold one."""
+    if len(head) < _HEADER.size or not is_binary(head):
+        return None
+    return _HEADER.unpack_from(head, 0)[3:5]
+
+
+def decode(buf):
+    """bytes -> envelope dict whose "attributes" decode lazily, per attribute."""
+    magic, count, timestamp, epoch, version, sid_len = _HEADER.unpack_from(buf, 0)
+    if magic != MAGIC:
+        raise ValueError("not a binary envelope")
+    pos = _HEADER.size
+    skill_id = bytes(buf[pos:pos + sid_len]).decode("utf-8")
+    pos += sid_len
+    table = {}
+    for _ in range(count):
+        name_len = _U16.unpack_from(buf, pos)[0]
+        pos += _U16.size
+        name = bytes(buf[pos:pos + name_len]).decode("utf-8")
+        pos += name_len
+        table[name] = _TABLE.unpack_from(buf, pos)
+        pos += _TABLE.size
+    return {
+        "skill_id": skill_id,
+        "timestamp": timestamp,
+        "epoch": epoch,
+        "version": version,
+        "attributes": LazyAttributes(buf, table),
+    }
@@ -0,0 +1,69 @@
+import os
+import sys
+import select
+import ctypes
+import ctypes.util
+
+# Minimal inotify binding (Linux only) used to sleep until an upstream skill publishes.
+# Everything else falls back to polling in read_write_temp.wait_for_inputs.
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+_libc = None
+if sys.platform.startswith("linux"):
+    try:
+        _libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        _libc.inotify_init1.argtypes = [ctypes.c_int]
+        _libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    except (OSError, AttributeError):
+        _libc = None
+
+
+def available():
+    return _libc is not None
+
+
+class DirWatcher:
+    """One inotify fd watching a set of directories."""
+
+    def __init__(self):
+        if _libc is None:
+            raise OSError("inotify is not available on this platform")
+        fd = _libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.fd = fd
+        self.watched = set()
+
+    def watch(self, path):
+        """Returns False if the directory does not exist (yet)."""
+        if path in self.watched:
+            return True
+        wd = _libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            return False
+        self.watched.add(path)
+        return True
+
+    def wait(self, timeout):
+        """Blocks until at least one event arrived or timeout (seconds) passed."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return False
+        self.drain()
+        return True
+
+    def drain(self):
+        try:
+            while os.read(self.fd, 64 * 1024):
+                pass
+        except BlockingIOError:
+            pass
+
+    def close(self):
+        os.close(self.fd)
+        self.fd = -1
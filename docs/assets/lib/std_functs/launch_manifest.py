@@ -0,0 +1,106 @@
+import os
+import json
+
+# Launch manifests: what python_wrapper.{sh,py} work out on every start (interpreter of
+# the skill's python_version, its python_paths), resolved once and cached in
+# <skill>/env/launch_manifest.json. The cache is rebuilt when env_meta.json or
+# dep_registry.json change, so a launch is a single exec of the target interpreter.
+#
+# sys.path is set up by a fixed -c bootstrap instead of PYTHONPATH: embedded
+# interpreters with a ._pth file ignore PYTHONPATH. The paths are passed as an argument,
+# nothing is interpolated into the code. sys.path ends up in the wrapper's order: the script's
+# directory first, then python_paths last to first, paths already on sys.path left where they are.
+
+MANIFEST_NAME = "launch_manifest.json"
+FORMAT = 2  # bumped when the cached argv changes
+GLOBAL_DEPS = os.path.join(os.path.expanduser("~"), "Documents", "talos", "global_deps")
+
+BOOTSTRAP = (
+    "import sys, os, runpy\n"
+    "script = os.path.abspath(sys.argv[2])\n"
+    "for p in [p for p in sys.argv[1].split(os.pathsep) if p] + [os.path.dirname(script)]:\n"
+    "    if p not in sys.path:\n"
+    "        sys.path.insert(0, p)\n"
+    "sys.argv = sys.argv[2:]\n"
+    "runpy.run_path(script, run_name='__main__')\n"
+)
+
+
+def _stamp(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _source_paths(skill_dir, global_deps):
+    return [os.path.join(skill_dir, "env", "env_meta.json"), os.path.join(global_deps, "dep_registry.json")]
+
+
+def _load_cached(path, sources):
+    try:
+        with open(path, "r") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("format") != FORMAT or manifest.get("sources") != sources:
+        return None
+    if not os.path.isfile(manifest.get("python_exe", "")):
+        return None
+    return manifest
+
+
+def resolve(skill_dir, global_deps=GLOBAL_DEPS):
+    """Launch manifest of a skill, from cache when its sources did not change. None
+    (with the reason printed) when the skill's interpreter can't be resolved."""
+    skill_dir = os.path.abspath(skill_dir)
+    meta_path, reg_path = _source_paths(skill_dir, global_deps)
+    sources = {path: _stamp(path) for path in (meta_path, reg_path)}
+    manifest_path = os.path.join(skill_dir, "env", MANIFEST_NAME)
+    manifest = _load_cached(manifest_path, sources)
+    if manifest is not None:
+        return manifest
+
+    try:
+        with open(meta_path, "r") as f:
+            meta = json.load(f)
+        with open(reg_path, "r") as f:
+            registry = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"[launch_manifest] {skill_dir}: {e}")
+        return None
+
+    version = meta.get("python_version")
+    python_exe = registry.get("python_interpreters", {}).get(version or "")
+    if not version or not python_exe:
+        print(f"[launch_manifest] {skill_dir}: no interpreter for python {version!r} in dep_registry.json")
+        return None
+    python_exe = os.path.normpath(python_exe)
+    if not os.path.isfile(python_exe):
+        print(f"[launch_manifest] {skill_dir}: interpreter does not exist: {python_exe}")
+        return None
+
+    python_paths = [os.path.normpath(p) for p in meta.get("python_paths", [])]
+    manifest = {
+        "format": FORMAT,
+        "python_version": version,
+        "python_exe": python_exe,
+        "python_paths": python_paths,
+        "argv": [python_exe, "-u", "-c", BOOTSTRAP, os.pathsep.join(python_paths)],
+        "env": {"PYTHONUNBUFFERED": "1"},
+        "sources": sources,
+    }
+    try:
+        tmp_path = manifest_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, manifest_path)
+    except OSError as e:
+        print(f"[launch_manifest] Could not cache {manifest_path}: {e}")
+    return manifest
+
+
+def command(manifest, script, args=()):
+    """argv that runs script under the manifest's interpreter and sys.path."""
+    return manifest["argv"] + [os.path.abspath(script)] + list(args)
@@ -1,11 +1,19 @@
 import os
 import io
+import re
 import json
 import yaml
 import time
-import hashlib
-import queue
+import zlib
 import threading
+import collections
+import concurrent.futures
+
+import envelope_bin
+import talos_trace
+import tick_clock
+import inotify_watch
+from shm_ring import RingWriter, RingReader
 
 try:
     import numpy as np
@@ -18,15 +26,61 @@ except ImportError:
     Image = None
 
 WRITE_THREADS = 4
-_last_write_hash = None
 _write_threads = []
 
 MAX_INLINE_SIZE = 2048  # bytes - anything larger gets externalized
 LIST_DICT_LENGTH_THRESHOLD = 64  # tuneable
+HASH_FULL_LIMIT = 1 << 20  # buffers up to this size are checksummed, larger ones compared by identity
+HASH_FULL_ITEMS = 1024  # same for the item count of lists / dicts
+
+#DIRTY TRACKING
+# out_dir -> {"epoch", "version", "attrs": {name: (fingerprint, version, entry)}}
+_writer_state = {}
+
+def _fingerprint(value):
+    """Cheap change token for one attribute value.
+
+    Scalars compare by value, small containers and buffers by crc32. Large buffers and
+    containers compare by identity: the object itself is kept so its id can't be
+    recycled, and a skill that mutates a big array / list / dict in place must call
+    mark_dirty().
+    """
+    if value is None or isinstance(value, (bool, int, float)):
+        return ("v", type(value), value)
+    if isinstance(value, str):
+        if len(value) > HASH_FULL_LIMIT:
+            return ("ref", value)
+        return ("crc", len(value), zlib.crc32(value.encode("utf-8", "surrogatepass")))
+    if isinstance(value, (bytes, bytearray)):
+        if len(value) > HASH_FULL_LIMIT:
+            return ("ref", value)
+        return ("crc", len(value), zlib.crc32(value))
+    if np is not None and isinstance(value, np.ndarray):
+        if value.nbytes > HASH_FULL_LIMIT or value.dtype.hasobject:
+            return ("ref", value)
+        return ("crc", value.shape, value.dtype.str, zlib.crc32(np.ascontiguousarray(value)))
+    if Image is not None and isinstance(value, Image.Image):
+        return ("ref", value)
+    if isinstance(value, (list, tuple, dict)) and len(value) > HASH_FULL_ITEMS:
+        return ("ref", value)
+    try:
+        data = json.dumps(value, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    except (TypeError, ValueError):
+        return ("ref", value)
+    return ("crc", len(data), zlib.crc32(data))
 
+def _same(prev, current):
+    if prev[0] == "ref" or current[0] == "ref":
+        return prev[0] == current[0] and prev[1] is current[1]
+    return prev == current
 
-def _hash_data(obj):
-    return hashlib.md5(json.dumps(obj, sort_keys=True).encode("utf-8")).hexdigest()
+def mark_dirty(out_dir, *names):
+    """Force the next writeToFile to re-encode these attributes (all if none given)."""
+    state = _writer_state.get(out_dir)
+    if state is None:
+        return
+    for name in names or list(state["attrs"]):
+        state["attrs"].pop(name, None)
 
 def _safe_type(value):
     if isinstance(value, bool): return "bool"
@@ -64,70 +118,697 @@ def needs_external_storage(value):
     return False
 
 
-_write_queue = queue.Queue()
+#BLOB WRITER
+# One job per writeToFile call that has blobs: the blobs are written atomically and only
+# then is the envelope that points at them published. Jobs of one output never run
+# concurrently, so envelopes and blobs of an output land in order. A new job is folded
+# into a still-queued job of the same output, so each blob path has at most one pending
+# write and frames superseded before they reached the disk cost no I/O.
+WRITE_QUEUE_SIZE = 64   # queued jobs before the write policy kicks in
+WRITE_POLICY = "block"  # block | drop-oldest, runtime.write_policy overrides it
+
+_pending = collections.deque()  # queued jobs, oldest first
+_busy = set()                   # out_dirs a worker is writing right now
+_invalid = {}                   # out_dir -> attribute names whose blobs were dropped
+_cond = threading.Condition()
 _stop_event = threading.Event()
+_writer_stats = {
+    "jobs": 0, "written": 0, "published": 0, "dropped": 0, "coalesced": 0, "elided": 0, "blobs": 0, "bytes": 0,
+    "write_s": 0.0, "max_write_s": 0.0, "wait_s": 0.0, "max_depth": 0, "blocked_s": 0.0,
+}
+
+def _write_atomic(path, data_bytes):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb", buffering=8192) as bf:
+        bf.write(data_bytes)
+    os.replace(tmp_path, path)
+
+def _take_job():
+    # caller holds _cond
+    for i, job in enumerate(_pending):
+        if job["out_dir"] not in _busy:
+            del _pending[i]
+            return job
+    return None
+
 def _blob_writer():
-    while not _stop_event.is_set():
-        try:
-            blob_path, data_bytes = _write_queue.get(timeout=0.1)
-        except queue.Empty:
-            continue
+    while True:
+        with _cond:
+            job = _take_job()
+            while job is None:
+                if _stop_event.is_set():
+                    return
+                _cond.wait(0.1)
+                job = _take_job()
+            _busy.add(job["out_dir"])
+            _cond.notify_all()  # room in the queue for blocked producers
+            depth = len(_pending)
+
+        start = time.perf_counter()
+        ok = True
         try:
-            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
-            with open(blob_path, "wb", buffering=8192) as bf:
-                bf.write(data_bytes)
+            for blob_path, data_bytes in job["blobs"].items():
+                _write_atomic(blob_path, data_bytes)
+            _publish_envelope(job["out_dir"], job["envelope"], job["transport"], job["fmt"])
         except Exception as e:
-            print(f"[write_worker] Error writing {blob_path}: {e}")
-        finally:
-            _write_queue.task_done()
+            ok = False
+            print(f"[write_worker] Error writing {job['out_dir']}: {e}")
+        elapsed = time.perf_counter() - start
+        if talos_trace.ENABLED:
+            talos_trace.complete("blob_write", start, start + elapsed, "write", {
+                "out_dir": os.path.basename(job["out_dir"]), "blobs": len(job["blobs"]),
+                "bytes": sum(len(b) for b in job["blobs"].values()),
+                "queue_wait_ms": (start - job["queued_at"]) * 1000, "ok": ok})
+            talos_trace.counter("blob_queue", {"depth": depth})
 
-# Start fixed workers
-for _ in range(WRITE_THREADS):
-    t = threading.Thread(target=_blob_writer, daemon=True)
-    t.start()
+        with _cond:
+            _busy.discard(job["out_dir"])
+            if ok:
+                _writer_stats["published"] += 1
+                _writer_stats["blobs"] += len(job["blobs"])
+                _writer_stats["bytes"] += sum(len(b) for b in job["blobs"].values())
+            else:
+                _invalid.setdefault(job["out_dir"], set()).update(job["names"])
+            _writer_stats["written"] += 1
+            _writer_stats["write_s"] += elapsed
+            _writer_stats["max_write_s"] = max(_writer_stats["max_write_s"], elapsed)
+            _writer_stats["wait_s"] += start - job["queued_at"]
+            _cond.notify_all()
+
+def _ensure_writers():
+    # caller holds _cond; workers start on first use instead of at import
+    if _write_threads:
+        return
+    _stop_event.clear()
+    for _ in range(WRITE_THREADS):
+        t = threading.Thread(target=_blob_writer, daemon=True)
+        t.start()
+        _write_threads.append(t)
+
+def _merge_into(newer, older):
+    # caller holds _cond; newer's blobs win, older's other blobs are still needed
+    for path, data_bytes in older["blobs"].items():
+        if path in newer["blobs"]:
+            _writer_stats["elided"] += 1
+        else:
+            newer["blobs"][path] = data_bytes
+    newer["names"] |= older["names"]
+    newer["queued_at"] = min(newer["queued_at"], older["queued_at"])
+    _writer_stats["coalesced"] += 1
+
+def _drop_oldest(new_job):
+    # caller holds _cond. Blobs of the dropped job may still be referenced by a newer
+    # envelope of the same output, so they move into that job instead of being lost.
+    old = _pending.popleft()
+    for job in list(_pending) + [new_job]:
+        if job["out_dir"] == old["out_dir"]:
+            _merge_into(job, old)
+            return
+    _invalid.setdefault(old["out_dir"], set()).update(old["names"])
+    _writer_stats["dropped"] += 1
+
+def _submit(out_dir, blobs, names, envelope, transport, fmt, policy):
+    with _cond:
+        if not blobs and out_dir not in _busy and not any(j["out_dir"] == out_dir for j in _pending):
+            job = None
+        else:
+            _ensure_writers()
+            job = {"out_dir": out_dir, "blobs": blobs, "names": set(names), "envelope": envelope,
+                   "transport": transport, "fmt": fmt, "queued_at": time.perf_counter()}
+            _writer_stats["jobs"] += 1
+            for i, queued in enumerate(_pending):
+                if queued["out_dir"] == out_dir:
+                    # keeps the older job's place in the queue
+                    _merge_into(job, queued)
+                    _pending[i] = job
+                    _cond.notify_all()
+                    return
+            blocked = time.perf_counter()
+            while len(_pending) >= WRITE_QUEUE_SIZE:
+                if policy == "drop-oldest":
+                    _drop_oldest(job)
+                else:
+                    _cond.wait(0.1)
+            _writer_stats["blocked_s"] += time.perf_counter() - blocked
+            _pending.append(job)
+            _writer_stats["max_depth"] = max(_writer_stats["max_depth"], len(_pending))
+            _cond.notify_all()
+    if job is None:
+        # nothing on disk to wait for and nothing queued ahead of us: publish right away
+        _publish_envelope(out_dir, envelope, transport, fmt)
+        with _cond:
+            _writer_stats["published"] += 1
+
+def writer_stats():
+    """Queue depth and write latency counters of the blob writer. `elided` counts blob
+    writes skipped because a newer value for the same path was queued before they ran."""
+    with _cond:
+        st = dict(_writer_stats)
+        st["depth"] = len(_pending)
+        st["in_flight"] = len(_busy)
+    done = max(st["written"], 1)
+    st["mean_write_ms"] = 1000 * st.pop("write_s") / done
+    st["max_write_ms"] = 1000 * st.pop("max_write_s")
+    st["mean_wait_ms"] = 1000 * st.pop("wait_s") / done
+    st["blocked_ms"] = 1000 * st.pop("blocked_s")
+    return st
+
+def flush_writers(timeout=None):
+    """Wait until every queued job is on disk. Returns False on timeout."""
+    deadline = None if timeout is None else time.monotonic() + timeout
+    with _cond:
+        while _pending or _busy:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+            _cond.wait(0.1 if remaining is None else min(0.1, remaining))
+    return True
 
 def shutdown_writers():
     """Call this at program exit to flush and stop writers."""
-    _write_queue.join()
+    flush_writers()
     _stop_event.set()
+    with _cond:
+        _cond.notify_all()
+    for t in _write_threads:
+        t.join()
+    _write_threads.clear()
 
 #ENCODE
+def _encode_png(value, level=None):
+    if Image is not None and isinstance(value, Image.Image):
+        buf = io.BytesIO()
+        if level is None:
+            value.save(buf, format="PNG")
+        else:
+            value.save(buf, format="PNG", compress_level=level)
+        return buf.getvalue()
+    import cv2
+    params = [] if level is None else [cv2.IMWRITE_PNG_COMPRESSION, level]
+    ok, buf = cv2.imencode(".png", value, params)
+    if not ok:
+        raise ValueError("cv2 could not encode array as PNG")
+    return buf.tobytes()
+
 def encode_pil_image(img):
     """Encode PIL image to PNG bytes."""
-    buf = io.BytesIO()
-    img.save(buf, format="PNG")
-    return buf.getvalue(), "png"
+    return _encode_png(img), "png"
 
 
 def encode_numpy_array(arr):
     """Encode numpy/OpenCV array into PNG when possible, otherwise produce raw bytes and metadata."""
     # Try OpenCV encoding to PNG for visual arrays
     try:
-        import cv2
-        ok, buf = cv2.imencode(".png", arr)
-        if ok:
-            return buf.tobytes(), "png"
+        return _encode_png(arr), "png"
     except Exception:
         pass
 
     # Fallback: store raw bytes, but caller must also store shape/dtype
     return arr.tobytes(), "raw"
 
-EXT_MAP = {
-    "png": "png",
-    "json": "json",
-    "utf8": "txt",
-    "bin": "bin",
-    "raw": "raw"
-}
+def _array_from(blob_bytes, attr_meta):
+    return np.frombuffer(blob_bytes, dtype=np.dtype(attr_meta["dtype"])).reshape(tuple(attr_meta["shape"]))
 
-def readFromFile(out_root, conf_path, IP_obj, input_descriptor): # input_descriptor: [(fromSkillID, fromAttributeID, toAttributeID), ...]
+def _encode_delta_zlib(arr):
+    # QOI-like: store the difference to the left neighbour, which is mostly small
+    # for images and compresses well even at the fastest zlib level
+    arr = np.ascontiguousarray(arr)
+    if arr.ndim >= 2 and arr.dtype.kind in "ui":
+        delta = arr.copy()
+        delta[:, 1:] -= arr[:, :-1]
+        arr = delta
+    return zlib.compress(arr.tobytes(), 1)
+
+def _decode_delta_zlib(blob_bytes, attr_meta):
+    arr = _array_from(zlib.decompress(blob_bytes), attr_meta)
+    if arr.ndim >= 2 and arr.dtype.kind in "ui":
+        arr = np.cumsum(arr, axis=1, dtype=arr.dtype)
+    return arr
+
+#CODECS
+# Codec kinds: "image" takes ndarrays and PIL images as they are, "array" takes ndarrays
+# (PIL images are converted and converted back on decode), "text" takes str,
+# "bytes" takes bytes/bytearray and "object" takes anything JSON can dump.
+CODECS = {}
+EXT_MAP = {"npy": "npy"}
+_codec_stats = {}
+_codec_overrides = {}  # "<skill_id>.<attr>" or "<attr>" -> codec name
+
+def register_codec(name, kind, encode, decode, ext="bin"):
+    """encode(value) -> bytes, decode(blob_bytes, attr_meta) -> value."""
+    CODECS[name] = {"kind": kind, "encode": encode, "decode": decode, "ext": ext}
+    EXT_MAP[name] = ext
+    _codec_stats[name] = {"encode_calls": 0, "encode_s": 0.0, "decode_calls": 0, "decode_s": 0.0,
+                          "bytes_out": 0}
+
+def _decode_text(blob_bytes, attr_meta):
+    try:
+        return blob_bytes.decode("utf-8")
+    except Exception:
+        return blob_bytes
+
+def _decode_json(blob_bytes, attr_meta):
+    try:
+        return json.loads(blob_bytes.decode("utf-8"))
+    except Exception:
+        return blob_bytes
+
+register_codec("bin", "bytes", bytes, lambda b, m: b, "bin")
+register_codec("utf8", "text", lambda v: v.encode("utf-8"), _decode_text, "txt")
+register_codec("json", "object", lambda v: json.dumps(v).encode("utf-8"), _decode_json, "json")
+register_codec("json-zlib", "object", lambda v: zlib.compress(json.dumps(v).encode("utf-8"), 1),
+               lambda b, m: _decode_json(zlib.decompress(b), m), "json.z")
+
+try:
+    import lz4.frame
+    register_codec("json-lz4", "object", lambda v: lz4.frame.compress(json.dumps(v).encode("utf-8")),
+                   lambda b, m: _decode_json(lz4.frame.decompress(b), m), "json.lz4")
+except ImportError:
+    pass
+
+if np is not None:
+    register_codec("png", "image", _encode_png, lambda b, m: _decode_png(b, m.get("type")), "png")
+    register_codec("png-fast", "image", lambda v: _encode_png(v, 1), lambda b, m: _decode_png(b, m.get("type")), "png")
+    register_codec("raw", "array", lambda v: np.ascontiguousarray(v).tobytes(), _array_from, "raw")
+    register_codec("delta-zlib", "array", _encode_delta_zlib, _decode_delta_zlib, "dz")
+    try:
+        import qoi
+        register_codec("qoi", "array", qoi.encode, lambda b, m: qoi.decode(b), "qoi")
+    except ImportError:
+        pass
+elif Image is not None:
+    register_codec("png", "image", _encode_png, lambda b, m: _decode_png(b, m.get("type")), "png")
+    register_codec("png-fast", "image", lambda v: _encode_png(v, 1), lambda b, m: _decode_png(b, m.get("type")), "png")
+
+def _codec_accepts(kind, value):
+    if kind == "image":
+        return (np is not None and isinstance(value, np.ndarray)) or (Image is not None and isinstance(value, Image.Image))
+    if kind == "array":
+        return np is not None and (isinstance(value, np.ndarray) or (Image is not None and isinstance(value, Image.Image)))
+    if kind == "text":
+        return isinstance(value, str)
+    if kind == "bytes":
+        return isinstance(value, (bytes, bytearray))
+    if Image is not None and isinstance(value, Image.Image):
+        return False
+    return not isinstance(value, (bytes, bytearray)) and not (np is not None and isinstance(value, np.ndarray))
+
+def set_codec(attr, codec, skill_id=None):
+    """Pick the codec for an externalized attribute from skill code (None resets it)."""
+    if codec is not None and codec != "mmap" and codec not in CODECS:
+        raise ValueError(f"unknown codec '{codec}', registered: {sorted(CODECS)}")
+    key = f"{skill_id}.{attr}" if skill_id else attr
+    if codec is None:
+        _codec_overrides.pop(key, None)
+    else:
+        _codec_overrides[key] = codec
+
+def _default_codec(value, settings):
+    if Image is not None and isinstance(value, Image.Image):
+        return "png"
+    if np is not None and isinstance(value, np.ndarray):
+        return settings.get("ndarray_format", "png")
+    if isinstance(value, str):
+        return "utf8"
+    if isinstance(value, (bytes, bytearray)):
+        return "bin"
+    return "json"
+
+def _select_codec(skill_id, name, value, settings):
+    """set_codec() wins over runtime.codecs in the bot config.yaml, which wins over the type default."""
+    configured = settings.get("codecs") or {}
+    for key in (f"{skill_id}.{name}", name):
+        codec = _codec_overrides.get(key) or configured.get(key)
+        if codec is None:
+            continue
+        if codec == "mmap" or (codec in CODECS and _codec_accepts(CODECS[codec]["kind"], value)):
+            return codec
+        print(f"[writeToFile] Codec '{codec}' can't store {_safe_type(value)} '{name}', using default")
+        break
+    return _default_codec(value, settings)
+
+def encode_value(codec, value):
+    """Encode with a registered codec, recording its timing. Returns (bytes, extra metadata)."""
+    spec = CODECS[codec]
+    meta = {}
+    if spec["kind"] == "array" and Image is not None and isinstance(value, Image.Image):
+        value = np.asarray(value)
+    if np is not None and isinstance(value, np.ndarray):
+        meta["shape"] = list(value.shape)
+        meta["dtype"] = str(value.dtype)
+    start = time.perf_counter()
+    data_bytes = spec["encode"](value)
+    stats = _codec_stats[codec]
+    stats["encode_s"] += time.perf_counter() - start
+    stats["encode_calls"] += 1
+    stats["bytes_out"] += len(data_bytes)
+    return data_bytes, meta
+
+def decode_value(codec, blob_bytes, attr_meta):
+    """Decode with a registered codec, recording its timing. Unknown codecs give the raw bytes."""
+    spec = CODECS.get(codec)
+    if spec is None:
+        return blob_bytes
+    start = time.perf_counter()
+    try:
+        value = spec["decode"](blob_bytes, attr_meta)
+    except Exception:
+        # can't reconstruct, fallback to bytes
+        return blob_bytes
+    if spec["kind"] == "array" and attr_meta.get("type") == "image" and Image is not None:
+        value = Image.fromarray(value)
+    stats = _codec_stats[codec]
+    stats["decode_s"] += time.perf_counter() - start
+    stats["decode_calls"] += 1
+    return value
+
+def codec_stats():
+    """Per codec call counts and mean encode/decode time in ms, for codecs used so far."""
+    report = {}
+    for name, st in _codec_stats.items():
+        if not st["encode_calls"] and not st["decode_calls"]:
+            continue
+        report[name] = {
+            "encode_calls": st["encode_calls"],
+            "encode_ms": 1000 * st["encode_s"] / st["encode_calls"] if st["encode_calls"] else None,
+            "decode_calls": st["decode_calls"],
+            "decode_ms": 1000 * st["decode_s"] / st["decode_calls"] if st["decode_calls"] else None,
+            "mean_bytes": st["bytes_out"] // st["encode_calls"] if st["encode_calls"] else None,
+        }
+    return report
+
+def benchmark_codecs(value, repeat=3):
+    """Try every codec that accepts value; returns rows sorted by encode+decode time."""
+    rows = []
+    declared = {"type": _safe_type(value)}
+    for name, spec in CODECS.items():
+        if not _codec_accepts(spec["kind"], value):
+            continue
+        try:
+            enc = dec = float("inf")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                data_bytes, meta = encode_value(name, value)
+                enc = min(enc, time.perf_counter() - start)
+                meta.update(declared)
+                start = time.perf_counter()
+                decode_value(name, data_bytes, meta)
+                dec = min(dec, time.perf_counter() - start)
+        except Exception as e:
+            print(f"[benchmark_codecs] {name} failed: {e}")
+            continue
+        rows.append({"codec": name, "bytes": len(data_bytes), "encode_ms": enc * 1000, "decode_ms": dec * 1000})
+    rows.sort(key=lambda r: r["encode_ms"] + r["decode_ms"])
+    return rows
+
+#MMAP
+# "npy" blobs are preallocated .npy files that the writer fills in place and readers map.
+# Two files per attribute are used alternately so a reader holding the previous frame
+# is not overwritten mid-read; views handed to readers stay valid for one more tick.
+_mmap_slots = {}   # (out_dir, name) -> slot last written
+_mmap_writers = {} # blob_path -> writable np.memmap
+_mmap_readers = {} # blob_path -> (st_ino, read-only np.memmap)
+
+def _open_mmap_slot(blob_path, shape, dtype):
+    mm = _mmap_writers.get(blob_path)
+    if mm is not None and mm.shape == shape and mm.dtype == dtype:
+        return mm
+    if mm is None and os.path.exists(blob_path):
+        try:
+            mm = np.load(blob_path, mmap_mode="r+")
+            if mm.shape == shape and mm.dtype == dtype:
+                _mmap_writers[blob_path] = mm
+                return mm
+        except Exception:
+            pass
+    # New geometry: build next to the old file and swap, readers keep their old mapping
+    tmp_path = blob_path + ".tmp"
+    mm = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=dtype, shape=shape)
+    os.replace(tmp_path, blob_path)
+    _mmap_writers[blob_path] = mm
+    return mm
+
+def write_mmap_array(out_dir, name, arr):
+    """Copy arr into the next .npy slot of this attribute; returns the blob file name."""
+    slot = _mmap_slots.get((out_dir, name), 1) ^ 1
+    blob_name = f"{name}.{slot}.npy"
+    mm = _open_mmap_slot(os.path.join(out_dir, blob_name), arr.shape, arr.dtype)
+    mm[...] = arr
+    _mmap_slots[(out_dir, name)] = slot
+    return blob_name
+
+def read_mmap_array(blob_path):
+    """Read-only view on a .npy blob, no copy. Copy it if it must outlive the next tick."""
+    ino = os.stat(blob_path).st_ino
+    cached = _mmap_readers.get(blob_path)
+    if cached is not None and cached[0] == ino:
+        return cached[1]
+    arr = np.load(blob_path, mmap_mode="r")
+    _mmap_readers[blob_path] = (ino, arr)
+    return arr
+
+def _use_mmap(value):
+    return np is not None and isinstance(value, np.ndarray) and not value.dtype.hasobject
+
+#SETTINGS
+_conf_cache = {}  # conf_path -> ((mtime_ns, size), static_values, runtime settings)
+
+def _load_bot_conf(conf_path):
+    """Static globals and `runtime:` section of the bot config.yaml, re-parsed only when the file changes."""
+    try:
+        st = os.stat(conf_path)
+    except OSError:
+        return {}, {}
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _conf_cache.get(conf_path)
+    if cached is not None and cached[0] == key:
+        return cached[1], cached[2]
+    with open(conf_path, "r") as f:
+        conf = yaml.safe_load(f) or {}
     static_values = {}
-    if os.path.exists(conf_path):
-        with open(conf_path, "r") as f:
-            conf = yaml.safe_load(f) or {}
-            for a in conf.get("globals", {}).get("attributes", []):
-                static_values[a["id"]] = a.get("value")
+    for a in (conf.get("globals") or {}).get("attributes", []):
+        static_values[a["id"]] = a.get("value")
+    settings = conf.get("runtime") or {}
+    _conf_cache[conf_path] = (key, static_values, settings)
+    return static_values, settings
+
+def _runtime_settings(conf_path):
+    return _load_bot_conf(conf_path)[1]
+
+def _bot_conf_for_out_dir(out_dir):
+    # out_dir is <bot>/out/<skill>_out.glob
+    return os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(out_dir))), "config.yaml")
+
+def _transport(settings):
+    return os.environ.get("TALOS_TRANSPORT") or settings.get("transport", "file")
+
+def _envelope_format(settings):
+    return os.environ.get("TALOS_ENVELOPE") or settings.get("envelope", "json")
+
+def _envelope_path(skill_dir, fmt):
+    return os.path.join(skill_dir, "output.bin" if fmt == "binary" else "output.json")
+
+#TRANSPORT
+_ring_writers = {}
+_ring_readers = {}
+_envelope_cache = {}  # skill_dir -> (stamp, envelope)
+ENVELOPE_HEAD = 512   # leading bytes of an envelope that hold its epoch and version
+_JSON_VERSION = re.compile(rb'"epoch":\s*(\d+),\s*"version":\s*(\d+)')
+
+def _ring_reader(skill_dir):
+    ring = _ring_readers.get(skill_dir)
+    if ring is None:
+        ring = _ring_readers[skill_dir] = RingReader(skill_dir)
+    return ring
+
+def _publish_envelope(out_dir, envelope, transport, fmt):
+    if fmt == "binary":
+        payload = envelope_bin.encode(envelope)
+    else:
+        payload = json.dumps(envelope, separators=(",", ":")).encode("utf-8")
+
+    if transport == "shm":
+        ring = _ring_writers.get(out_dir)
+        if ring is None:
+            ring = _ring_writers[out_dir] = RingWriter(out_dir)
+        ring.publish(payload)
+        return
+
+    # Atomic write
+    tmp_path = os.path.join(out_dir, "output.tmp")
+    with open(tmp_path, "wb", buffering=8192) as f:
+        f.write(payload)
+    os.replace(tmp_path, _envelope_path(out_dir, fmt))
+
+def _parse_envelope(payload):
+    if envelope_bin.is_binary(payload):
+        return envelope_bin.decode(payload)
+    return json.loads(payload)
+
+def _file_stamp(f):
+    """Validity stamp of an open envelope file: inode, mtime and size plus the envelope's
+    epoch and version, read from its head. Inode reuse with a coarse mtime can repeat the
+    stat part for a new envelope; the version can't repeat within an epoch."""
+    st = os.fstat(f.fileno())
+    head = f.read(ENVELOPE_HEAD)
+    version = envelope_bin.peek_version(head)
+    if version is None:
+        match = _JSON_VERSION.search(head)
+        version = (int(match.group(1)), int(match.group(2))) if match else None
+    return (st.st_ino, st.st_mtime_ns, st.st_size, version)
+
+def _load_envelope(skill_dir, transport, fmt):
+    """Latest envelope of an upstream skill, or None if it has not published yet.
+
+    Parsed envelopes are cached until the ring sequence, or the output file's stat and
+    envelope version, change.
+    Binary envelopes only decode the attributes that are actually looked up.
+    """
+    cached = _envelope_cache.get(skill_dir)
+    if transport == "shm":
+        ring = _ring_reader(skill_dir)
+        seq = ring.sequence()
+        if seq:
+            if cached is not None and cached[0] == ("shm", seq):
+                return cached[1]
+            latest = ring.read_latest()
+            if latest is not None:
+                env = _parse_envelope(latest[1])
+                _envelope_cache[skill_dir] = (("shm", latest[0]), env)
+                return env
+        # producer may still be on the file transport
+
+    env_path = _envelope_path(skill_dir, fmt)
+    try:
+        f = open(env_path, "rb")
+    except OSError:
+        print(f"[readFromFile] Missing: {env_path}")
+        return None
+    with f:
+        stamp = _file_stamp(f)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        f.seek(0)
+        env = _parse_envelope(f.read())
+    _envelope_cache[skill_dir] = (stamp, env)
+    return env
+
+#DECODE
+_MISSING = object()
+
+def _decode_png(blob_bytes, declared_type):
+    # PNG: decide whether to return ndarray or PIL.Image based on declared_type
+    if declared_type == "ndarray" and np is not None:
+        try:
+            # Try cv2 first (fast) then PIL->np array fallback
+            try:
+                import cv2
+                arr = np.frombuffer(blob_bytes, dtype=np.uint8)
+                decoded = cv2.imdecode(arr, cv2.IMREAD_UNCHANGED)
+                if decoded is not None:
+                    return decoded
+            except Exception:
+                pass
+
+            # Fallback: PIL -> numpy
+            if Image is not None:
+                img = Image.open(io.BytesIO(blob_bytes))
+                img.load()
+                return np.array(img)
+            # no Image; return raw bytes
+            return blob_bytes
+        except Exception:
+            return blob_bytes
+
+    # If producer declared "image" or declared_type unknown, prefer PIL Image when available
+    if Image is not None:
+        try:
+            img = Image.open(io.BytesIO(blob_bytes))
+            img.load()
+            return img
+        except Exception:
+            pass
+
+    # If numpy exists and PIL not available, decode to numpy via cv2 if possible
+    if np is not None:
+        try:
+            import cv2
+            arr = np.frombuffer(blob_bytes, dtype=np.uint8)
+            decoded = cv2.imdecode(arr, cv2.IMREAD_UNCHANGED)
+            if decoded is not None:
+                return decoded
+        except Exception:
+            pass
+
+    # fallback to raw bytes
+    return blob_bytes
+
+_value_cache = {}  # (skill_dir, attr) -> (key, decoded value)
+READ_THREADS = 4
+_read_pool = None
+
+def _value_key(skill_dir, attr_meta, env):
+    version = attr_meta.get("version")
+    if version is not None:
+        return (env.get("epoch"), version, attr_meta["path"])
+    # envelope from an older writer: fall back to the blob's stat
+    blob_path = os.path.join(skill_dir, attr_meta["path"])
+    try:
+        st = os.stat(blob_path)
+    except OSError:
+        print(f"[readFromFile] Missing blob: {blob_path}")
+        return _MISSING
+    return (attr_meta["path"], st.st_ino, st.st_mtime_ns, st.st_size)
+
+def _load_blob(skill_dir, name, attr_meta, key):
+    blob_path = os.path.join(skill_dir, attr_meta["path"])
+    if not os.path.exists(blob_path):
+        print(f"[readFromFile] Missing blob: {blob_path}")
+        return _MISSING
+    start = time.perf_counter()
+    if attr_meta.get("format") == "npy" and np is not None:
+        value = read_mmap_array(blob_path)
+        size = value.nbytes if value is not None else 0
+    else:
+        with open(blob_path, "rb") as bf:
+            blob_bytes = bf.read()
+        value = decode_value(attr_meta.get("format"), blob_bytes, attr_meta)
+        size = len(blob_bytes)
+    if talos_trace.ENABLED:
+        talos_trace.complete("decode", start, cat="read", args={
+            "attr": name, "format": attr_meta.get("format"), "bytes": size})
+    _value_cache[(skill_dir, name)] = (key, value)
+    return value
+
+def _load_blob_safe(job):
+    skill_dir, name, attr_meta, key = job
+    try:
+        return _load_blob(skill_dir, name, attr_meta, key)
+    except Exception as e:
+        print(f"[readFromFile] Error reading {skill_dir}: {e}")
+        return None
+
+def _get_read_pool():
+    global _read_pool
+    if _read_pool is None:
+        _read_pool = concurrent.futures.ThreadPoolExecutor(READ_THREADS, thread_name_prefix="blob_reader")
+    return _read_pool
+
+def readFromFile(out_root, conf_path, IP_obj, input_descriptor): # input_descriptor: [(fromSkillID, fromAttributeID, toAttributeID), ...]
+    """Each upstream envelope is loaded once per call however many attributes come from it,
+    and blobs that are not cached are read and decoded concurrently.
+
+    Decoded blobs and inline lists/dicts of a cached envelope are shared between ticks
+    until the producer changes them, so consumers must not mutate them in place."""
+    start = time.perf_counter()
+    hits = 0
+    static_values, settings = _load_bot_conf(conf_path)
+    transport = _transport(settings)
+    fmt = _envelope_format(settings)
+
+    values = []     # (to_attr, value) in descriptor order
+    envelopes = {}  # from_skill -> envelope or None
+    loads = []      # (index in values, blob job) for cache misses
 
     for from_skill, from_attr, to_attr, is_static in input_descriptor:
         value = None
@@ -137,15 +818,12 @@ def readFromFile(out_root, conf_path, IP_obj, input_descriptor): # input_descrip
 
         else:
             skill_dir = os.path.join(out_root, from_skill)
-            json_path = os.path.join(skill_dir, "output.json")
-
-            if not os.path.exists(json_path):
-                print(f"[readFromFile] Missing: {json_path}")
-                continue
-
             try:
-                with open(json_path, "r", encoding="utf-8") as f:
-                    env = json.load(f)
+                if from_skill not in envelopes:
+                    envelopes[from_skill] = _load_envelope(skill_dir, transport, fmt)
+                env = envelopes[from_skill]
+                if env is None:
+                    continue
 
                 attr_meta = env["attributes"].get(from_attr)
                 if not attr_meta:
@@ -153,195 +831,247 @@ def readFromFile(out_root, conf_path, IP_obj, input_descriptor): # input_descrip
 
                 if attr_meta["storage"] == "inline":
                     value = attr_meta.get("value")
-
-                elif attr_meta["storage"] == "file":
-                    blob_path = os.path.join(skill_dir, attr_meta["path"])
-                    if not os.path.exists(blob_path):
-                        print(f"[readFromFile] Missing blob: {blob_path}")
+                else:
+                    key = _value_key(skill_dir, attr_meta, env)
+                    if key is _MISSING:
                         continue
-
-                    with open(blob_path, "rb") as bf:
-                        blob_bytes = bf.read()
-
-                    fmt = attr_meta.get("format")
-                    declared_type = attr_meta.get("type")  # "ndarray" or "image" if applicable
-
-                    # JSON (strings/lists/dicts)
-                    if fmt == "json":
-                        try:
-                            value = json.loads(blob_bytes.decode("utf-8"))
-                        except Exception:
-                            value = blob_bytes
-
-                    # UTF-8 string
-                    elif fmt == "utf8":
-                        try:
-                            value = blob_bytes.decode("utf-8")
-                        except Exception:
-                            value = blob_bytes
-
-                    # PNG: decide whether to return ndarray or PIL.Image based on declared_type
-                    elif fmt == "png":
-                        shape = attr_meta.get("shape")
-                        dtype_str = attr_meta.get("dtype")
-                        if declared_type == "ndarray" and np is not None:
-                            try:
-                                # Try cv2 first (fast) then PIL->np array fallback
-                                try:
-                                    import cv2
-                                    arr = np.frombuffer(blob_bytes, dtype=np.uint8)
-                                    decoded = cv2.imdecode(arr, cv2.IMREAD_UNCHANGED)
-                                    if decoded is not None:
-                                        value = decoded
-                                        # ensure we have a numeric array; continue
-                                        continue
-                                except Exception:
-                                    pass
-
-                                # Fallback: PIL -> numpy
-                                if Image is not None:
-                                    img = Image.open(io.BytesIO(blob_bytes))
-                                    img.load()
-                                    value = np.array(img)
-                                else:
-                                    # no Image; return raw bytes
-                                    value = blob_bytes
-                                continue
-                            except Exception:
-                                value = blob_bytes
-                                continue
-
-                        # If producer declared "image" or declared_type unknown, prefer PIL Image when available
-                        if Image is not None:
-                            try:
-                                img = Image.open(io.BytesIO(blob_bytes))
-                                img.load()
-                                value = img
-                                continue
-                            except Exception:
-                                pass
-
-                        # If numpy exists and PIL not available, decode to numpy via cv2 if possible
-                        if np is not None:
-                            try:
-                                import cv2
-                                arr = np.frombuffer(blob_bytes, dtype=np.uint8)
-                                decoded = cv2.imdecode(arr, cv2.IMREAD_UNCHANGED)
-                                if decoded is not None:
-                                    value = decoded
-                                    continue
-                            except Exception:
-                                pass
-
-                        # fallback to raw bytes
-                        value = blob_bytes
-
-                    # Raw ndarray fallback -> must have shape and dtype metadata to reconstruct
-                    elif fmt == "raw" and np is not None:
-                        shape = attr_meta.get("shape")
-                        dtype_str = attr_meta.get("dtype")
-                        if shape is not None and dtype_str is not None:
-                            try:
-                                dtype = np.dtype(dtype_str)
-                                arr = np.frombuffer(blob_bytes, dtype=dtype).reshape(tuple(shape))
-                                value = arr
-                            except Exception:
-                                # can't reconstruct, fallback to bytes
-                                value = blob_bytes
-                        else:
-                            # no metadata -> return raw bytes
-                            value = blob_bytes
-
-                    # Binary fallback
+                    cached = _value_cache.get((skill_dir, from_attr))
+                    if cached is not None and cached[0] == key:
+                        value = cached[1]
+                        hits += 1
                     else:
-                        value = blob_bytes
+                        loads.append((len(values), (skill_dir, from_attr, attr_meta, key)))
 
             except Exception as e:
-                print(f"[readFromFile] Error reading {json_path}: {e}")
+                envelopes.setdefault(from_skill, None)
+                print(f"[readFromFile] Error reading {skill_dir}: {e}")
+
+        values.append((to_attr, value))
+
+    if loads:
+        jobs = [job for _, job in loads]
+        results = map(_load_blob_safe, jobs) if len(jobs) == 1 else _get_read_pool().map(_load_blob_safe, jobs)
+        for (index, _), value in zip(loads, results):
+            values[index] = (values[index][0], value)
 
+    for to_attr, value in values:
+        if value is _MISSING:
+            continue
         if hasattr(IP_obj, to_attr):
             setattr(IP_obj, to_attr, value)
         else:
             print(f"[readFromFile] Warning: {type(IP_obj).__name__} has no '{to_attr}'")
+    if talos_trace.ENABLED:
+        talos_trace.complete("readFromFile", start, cat="read", args={
+            "inputs": len(input_descriptor), "cache_hits": hits, "blob_loads": len(loads)})
     return IP_obj
-    
-def writeToFile(data_obj, out_dir, skill_id):
-    """Fast non-blocking writer; large data goes through background pool."""
-    global _last_write_hash
 
-    current_hash = _hash_data(vars(data_obj))
-    if current_hash == _last_write_hash:
-        return
-    _last_write_hash = current_hash
+def latest_envelope(out_root, conf_path, from_skill):
+    """Envelope last published by from_skill, None if there is none yet. For tools that
+    watch a bot from outside its skills, like the orchestrator."""
+    settings = _runtime_settings(conf_path)
+    transport, fmt = _transport(settings), _envelope_format(settings)
+    skill_dir = os.path.join(out_root, from_skill)
+    if _envelope_stamp(skill_dir, transport, fmt) is None:
+        return None
+    return _load_envelope(skill_dir, transport, fmt)
 
-    os.makedirs(out_dir, exist_ok=True)
-    tmp_json = os.path.join(out_dir, "output.tmp")
-    final_json = os.path.join(out_dir, "output.json")
+#WAIT
+POLL_INTERVAL = 0.002  # seconds between checks when inotify can't be used
+STATIC_INTERVAL = 1.0  # seconds between ticks of a static-only skill that gave no timeout
+_input_stamps = {}     # skill_dir -> last envelope stamp seen by wait_for_inputs
+_watcher = None
+MAX_HZ = float(os.environ.get("TALOS_MAX_HZ") or 0)  # per skill tick cap set by the orchestrator, 0 = none
+_next_tick = 0.0
 
-    envelope = {"skill_id": skill_id, "timestamp": time.time(), "attributes": {}}
+def apply_env():
+    """Re-read the settings that come from the environment, for skills forked from a
+    process that imported this module before their environment was set."""
+    global MAX_HZ
+    MAX_HZ = float(os.environ.get("TALOS_MAX_HZ") or 0)
+    tick_clock.apply_env()
+    talos_trace.configure()
 
-    for name, value in vars(data_obj).items():
-        if value is None:
-            continue
+def _envelope_stamp(skill_dir, transport, fmt):
+    if transport == "shm":
+        seq = _ring_reader(skill_dir).sequence()
+        if seq:
+            return ("shm", seq)
+    try:
+        with open(_envelope_path(skill_dir, fmt), "rb") as f:
+            return _file_stamp(f)
+    except OSError:
+        return None
 
-        entry = {"type": _safe_type(value)}
-        externalize = needs_external_storage(value)
+def _get_watcher():
+    global _watcher
+    if _watcher is None and inotify_watch.available():
+        try:
+            _watcher = inotify_watch.DirWatcher()
+        except OSError:
+            _watcher = False
+    return _watcher or None
 
-        if externalize:
-            safe_name = name.replace(" ", "_")
-            blob_ext = "bin"
+def wait_for_inputs(out_root, input_descriptor, timeout=None):
+    """Block until an upstream envelope changed since the last call.
 
-            if Image is not None and isinstance(value, Image.Image):
-                data_bytes, fmt = encode_pil_image(value)
-                entry["format"] = fmt
-                blob_ext = EXT_MAP.get(fmt, "bin")
+    Returns True when new data is there, False on timeout. The first call returns
+    True right away for every upstream that has already published. Static inputs
+    are not watched; with no dynamic input this just sleeps for `timeout` (or
+    STATIC_INTERVAL without one) and returns True, so static-only skills tick once
+    per interval instead of spinning.
+    With TALOS_MAX_HZ set, calls are spaced at least 1/MAX_HZ apart.
+    """
+    global _next_tick
+    if MAX_HZ > 0:
+        delay = _next_tick - time.monotonic()
+        if delay > 0:
+            if timeout is not None and delay >= timeout:
+                time.sleep(timeout)
+                return False
+            time.sleep(delay)
+            if timeout is not None:
+                timeout -= delay
+        _next_tick = time.monotonic() + 1.0 / MAX_HZ
 
-            elif np is not None and isinstance(value, np.ndarray):
-                data_bytes, fmt = encode_numpy_array(value)
-                entry["format"] = fmt
-                blob_ext = EXT_MAP.get(fmt, "bin")
-                entry["shape"] = list(value.shape)
-                entry["dtype"] = str(value.dtype)
+    skill_dirs = []
+    for from_skill, _, _, is_static in input_descriptor:
+        skill_dir = os.path.join(out_root, from_skill)
+        if is_static != 1 and skill_dir not in skill_dirs:
+            skill_dirs.append(skill_dir)
 
-            elif isinstance(value, (dict, list)):
-                data_bytes = json.dumps(value).encode("utf-8")
-                entry["format"] = "json"
-                blob_ext = EXT_MAP["json"]
+    if not skill_dirs:
+        time.sleep(STATIC_INTERVAL if timeout is None else timeout)
+        return True
 
-            elif isinstance(value, str):
-                data_bytes = value.encode("utf-8")
-                entry["format"] = "utf8"
-                blob_ext = EXT_MAP["utf8"]
+    settings = _runtime_settings(os.path.join(os.path.dirname(os.path.abspath(out_root)), "config.yaml"))
+    transport = _transport(settings)
+    fmt = _envelope_format(settings)
+    # rings are written through mmap which inotify does not see
+    watcher = _get_watcher() if transport != "shm" else None
+    deadline = None if timeout is None else time.monotonic() + timeout
 
-            else:
-                if isinstance(value, (bytes, bytearray)):
-                    data_bytes = bytes(value)
-                else:
-                    try:
-                        data_bytes = json.dumps(value).encode("utf-8")
-                        entry["format"] = "json"
-                        blob_ext = EXT_MAP["json"]
-                    except Exception:
-                        data_bytes = repr(value).encode("utf-8")
-                        entry["format"] = "utf8"
-                        blob_ext = EXT_MAP["utf8"]
-
-            blob_name = f"{safe_name}.{blob_ext}"
-            entry["path"] = blob_name
-            entry["storage"] = "file"
-
-            blob_path = os.path.join(out_dir, blob_name)
-            _write_queue.put((blob_path, data_bytes))  # enqueue write
+    while True:
+        if watcher is not None:
+            watcher.watch(out_root)  # wakes us when a producer dir appears
+            for skill_dir in skill_dirs:
+                watcher.watch(skill_dir)
 
+        changed = False
+        for skill_dir in skill_dirs:
+            stamp = _envelope_stamp(skill_dir, transport, fmt)
+            if stamp is not None and stamp != _input_stamps.get(skill_dir):
+                _input_stamps[skill_dir] = stamp
+                changed = True
+        if changed:
+            return True
+
+        remaining = None if deadline is None else deadline - time.monotonic()
+        if remaining is not None and remaining <= 0:
+            return False
+        if watcher is not None:
+            watcher.wait(remaining)
+        else:
+            time.sleep(POLL_INTERVAL if remaining is None else min(POLL_INTERVAL, remaining))
+
+def _encode_entry(out_dir, skill_id, name, value, settings, blobs):
+    """Envelope entry for one attribute; externalized data is written or added to blobs."""
+    entry = {"type": _safe_type(value)}
+
+    if not needs_external_storage(value):
+        entry["storage"] = "inline"
+        entry["value"] = value
+        return entry
+
+    safe_name = name.replace(" ", "_")
+    entry["storage"] = "file"
+    codec = _select_codec(skill_id, name, value, settings)
+
+    if codec == "mmap" and _use_mmap(value):
+        # written in place right away, nothing to queue
+        entry["format"] = "npy"
+        entry["path"] = write_mmap_array(out_dir, safe_name, value)
+        entry["shape"] = list(value.shape)
+        entry["dtype"] = str(value.dtype)
+        return entry
+    if codec not in CODECS:
+        codec = "png" if "png" in CODECS and _codec_accepts("image", value) else "json"
+
+    try:
+        data_bytes, meta = encode_value(codec, value)
+    except Exception:
+        # e.g. no cv2 for PNG or an object JSON can't dump
+        if np is not None and isinstance(value, np.ndarray) and codec != "raw":
+            codec = "raw"
+            data_bytes, meta = encode_value(codec, value)
         else:
-            entry["storage"] = "inline"
-            entry["value"] = value
+            codec, meta = "utf8", {}
+            data_bytes = repr(value).encode("utf-8")
+    entry.update(meta)
+    entry["format"] = codec
+
+    blob_name = f"{safe_name}.{EXT_MAP.get(codec, 'bin')}"
+    entry["path"] = blob_name
+
+    blobs[os.path.join(out_dir, blob_name)] = data_bytes
+    return entry
+
+def writeToFile(data_obj, out_dir, skill_id):
+    """Fast non-blocking writer; only attributes that changed since the last call are re-encoded
+    and blobs go through the background pool."""
+    start = time.perf_counter()
+    state = _writer_state.get(out_dir)
+    if state is None:
+        # epoch tells readers that versions restarted with a new producer process
+        state = _writer_state[out_dir] = {"epoch": time.time_ns(), "version": 0, "attrs": {}}
+    attrs = state["attrs"]
+    if out_dir in _invalid:
+        with _cond:
+            lost = _invalid.pop(out_dir, ())
+        for name in lost:
+            attrs.pop(name, None)
+
+    current = {name: value for name, value in vars(data_obj).items() if value is not None}
+    changed = [name for name in attrs if name not in current]
+    for name in changed:
+        del attrs[name]
+
+    fingerprints = {}
+    for name, value in current.items():
+        fp = _fingerprint(value)
+        prev = attrs.get(name)
+        if prev is None or not _same(prev[0], fp):
+            fingerprints[name] = fp
+            changed.append(name)
+    if not changed:
+        if talos_trace.ENABLED:
+            talos_trace.complete("writeToFile", start, cat="write", args={"changed": 0})
+        return
+
+    os.makedirs(out_dir, exist_ok=True)
+    settings = _runtime_settings(_bot_conf_for_out_dir(out_dir))
+    state["version"] += 1
+    version = state["version"]
+
+    blobs = {}
+    for name, fp in fingerprints.items():
+        entry = _encode_entry(out_dir, skill_id, name, current[name], settings, blobs)
+        entry["version"] = version
+        attrs[name] = (fp, version, entry)
 
-        envelope["attributes"][name] = entry
+    envelope = {
+        "skill_id": skill_id,
+        "timestamp": time.time(),
+        "epoch": state["epoch"],
+        "version": version,
+        "attributes": {name: attrs[name][2] for name in current},
+    }
 
-    # Atomic JSON write
-    with open(tmp_json, "w", encoding="utf-8", buffering=8192) as f:
-        json.dump(envelope, f, separators=(",", ":"))
-    os.replace(tmp_json, final_json)
+    policy = settings.get("write_policy", WRITE_POLICY)
+    _submit(out_dir, blobs, fingerprints, envelope, _transport(settings), _envelope_format(settings), policy)
+    if talos_trace.ENABLED:
+        talos_trace.complete("writeToFile", start, cat="write", args={
+            "changed": len(changed), "version": version, "blobs": len(blobs),
+            "blob_bytes": sum(len(b) for b in blobs.values())})
 
     # print(f"[writeToFile] wrote {json_path}")
\ No newline at end of file
@@ -0,0 +1,148 @@
+import os
+import mmap
+import struct
+
+# Single-writer ring of envelope slots in an mmap'd file under /out.
+# Readers map the file once and afterwards only touch memory: the header holds
+# the latest sequence number and every slot is guarded by its own sequence
+# (seqlock style) so a reader can detect a slot being rewritten under it.
+
+RING_NAME = "output.ring"
+DEFAULT_SLOT_COUNT = 4
+DEFAULT_SLOT_SIZE = 64 * 1024  # bytes of payload per slot
+
+_MAGIC = b"TLRG"
+_HEADER = struct.Struct("<4sIIIQ")  # magic, flags, slot_count, slot_size, seq
+_HEADER_SIZE = 64
+_SEQ_OFFSET = 16
+_FLAGS_OFFSET = 4
+_SLOT = struct.Struct("<QI4x")  # slot seq, payload length
+_U64 = struct.Struct("<Q")
+_U32 = struct.Struct("<I")
+
+FLAG_STALE = 1  # ring was replaced by a bigger one, readers must reopen
+
+
+def _slot_offset(slot_size, index):
+    return _HEADER_SIZE + index * (_SLOT.size + slot_size)
+
+
+class RingWriter:
+    """Publishes byte payloads into <out_dir>/output.ring."""
+
+    def __init__(self, out_dir, slot_size=DEFAULT_SLOT_SIZE, slot_count=DEFAULT_SLOT_COUNT):
+        self.path = os.path.join(out_dir, RING_NAME)
+        self.slot_count = slot_count
+        self.slot_size = slot_size
+        self.seq = 0
+        self._mm = None
+        self._open(slot_size)
+
+    def _open(self, slot_size):
+        # Reuse a compatible ring left by a previous run so attached readers keep working
+        if self._mm is None and os.path.exists(self.path):
+            try:
+                with open(self.path, "r+b") as f:
+                    mm = mmap.mmap(f.fileno(), 0)
+                magic, flags, count, size, seq = _HEADER.unpack_from(mm, 0)
+                if magic == _MAGIC and not flags & FLAG_STALE and count == self.slot_count and size >= slot_size:
+                    self._mm, self.slot_size, self.seq = mm, size, seq
+                    return
+                if magic == _MAGIC:
+                    _U32.pack_into(mm, _FLAGS_OFFSET, flags | FLAG_STALE)
+                    self.seq = seq
+                mm.close()
+            except (OSError, ValueError, struct.error):
+                pass
+
+        total = _slot_offset(slot_size, self.slot_count)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w+b") as f:
+            f.truncate(total)
+            mm = mmap.mmap(f.fileno(), total)
+        _HEADER.pack_into(mm, 0, _MAGIC, 0, self.slot_count, slot_size, self.seq)
+        os.replace(tmp_path, self.path)
+
+        if self._mm is not None:
+            old_flags = _U32.unpack_from(self._mm, _FLAGS_OFFSET)[0]
+            _U32.pack_into(self._mm, _FLAGS_OFFSET, old_flags | FLAG_STALE)
+            self._mm.close()
+        self._mm, self.slot_size = mm, slot_size
+
+    def publish(self, payload):
+        if len(payload) > self.slot_size:
+            new_size = self.slot_size
+            while new_size < len(payload):
+                new_size *= 2
+            self._open(new_size)
+
+        seq = self.seq + 1
+        off = _slot_offset(self.slot_size, seq % self.slot_count)
+        mm = self._mm
+        _SLOT.pack_into(mm, off, 0, 0)  # mark slot as being written
+        start = off + _SLOT.size
+        mm[start:start + len(payload)] = payload
+        _SLOT.pack_into(mm, off, seq, len(payload))
+        _U64.pack_into(mm, _SEQ_OFFSET, seq)
+        self.seq = seq
+        return seq
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+
+class RingReader:
+    """Reads the latest payload from <skill_dir>/output.ring."""
+
+    def __init__(self, skill_dir):
+        self.path = os.path.join(skill_dir, RING_NAME)
+        self._mm = None
+
+    def _attach(self):
+        if not os.path.exists(self.path):
+            return False
+        try:
+            with open(self.path, "rb") as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return False
+        magic, _, count, size, _ = _HEADER.unpack_from(mm, 0)
+        if magic != _MAGIC:
+            mm.close()
+            return False
+        self._mm, self.slot_count, self.slot_size = mm, count, size
+        return True
+
+    def sequence(self):
+        """Latest published sequence number (0 if nothing was published yet)."""
+        if self._mm is None and not self._attach():
+            return None
+        if _U32.unpack_from(self._mm, _FLAGS_OFFSET)[0] & FLAG_STALE:
+            self.close()
+            if not self._attach():
+                return None
+        return _U64.unpack_from(self._mm, _SEQ_OFFSET)[0]
+
+    def read_latest(self, retries=8):
+        """Returns (seq, payload) of the newest consistent slot, or None."""
+        for _ in range(retries):
+            seq = self.sequence()
+            if not seq:
+                return None
+            mm = self._mm
+            off = _slot_offset(self.slot_size, seq % self.slot_count)
+            slot_seq, length = _SLOT.unpack_from(mm, off)
+            if slot_seq != seq:
+                continue
+            start = off + _SLOT.size
+            payload = mm[start:start + length]
+            if _SLOT.unpack_from(mm, off)[0] == seq:
+                return seq, payload
+        return None
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
@@ -0,0 +1,120 @@
+import os
+import sys
+import time
+import importlib.util
+
+import talos_trace
+from read_write_temp import readFromFile, writeToFile
+
+# In-process skills: several pure-Python skills share one interpreter (the orchestrator's).
+# Each skill's skill_io/user_main are imported under unique module names, and a tick runs
+# the skills in topological order, handing _OP attributes to the downstream _IP objects
+# in memory. Only inputs from isolated skills and static attributes still go through
+# readFromFile, and only skills with isolated consumers still write to /out.
+
+
+def _load_module(name, path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_skill(skill_dir, node_id):
+    """Returns (skill_io module, user_main module) of a skill, private to that skill."""
+    src = os.path.join(os.path.abspath(skill_dir), "src")
+    prefix = f"talos_skill_{node_id}"
+    saved_path = list(sys.path)
+    saved_io = sys.modules.get("skill_io")
+    before = set(sys.modules)
+    sys.path.insert(0, src)
+    try:
+        skill_io = _load_module(f"{prefix}_skill_io", os.path.join(src, "skill_io.py"))
+        # `from skill_io import *` in user_main has to resolve to this skill's classes
+        sys.modules["skill_io"] = skill_io
+        user_main = _load_module(f"{prefix}_user_main", os.path.join(src, "user_main.py"))
+    finally:
+        sys.path[:] = saved_path
+        # plain-named modules from the skill's src/ must not leak into the next skill
+        for name in set(sys.modules) - before:
+            path = getattr(sys.modules[name], "__file__", None) or ""
+            if name == "skill_io" or os.path.abspath(path).startswith(src + os.sep):
+                if not name.startswith(prefix):
+                    del sys.modules[name]
+        if saved_io is not None:
+            sys.modules["skill_io"] = saved_io
+    return skill_io, user_main
+
+
+def _io_class(skill_io, node_id, suffix):
+    cls = getattr(skill_io, f"{node_id}_{suffix}", None)
+    if cls is None:
+        found = [v for k, v in vars(skill_io).items() if k.endswith("_" + suffix) and isinstance(v, type)]
+        cls = found[0] if len(found) == 1 else None
+    if cls is None:
+        raise ImportError(f"no {node_id}_{suffix} class in {skill_io.__file__}")
+    return cls
+
+
+class InProcessSkill:
+    def __init__(self, node_id, skill_dir, file_inputs, memory_inputs, output_file=None):
+        """file_inputs: readFromFile descriptor, memory_inputs: [(from_node, from_attr, to_attr)],
+        output_file: out dir to publish to when isolated skills consume this one."""
+        self.node_id = node_id
+        skill_io, user_main = load_skill(skill_dir, node_id)
+        self.ip_cls = _io_class(skill_io, node_id, "IP")
+        self.user_main = user_main.userMain
+        self.file_inputs = file_inputs
+        self.memory_inputs = memory_inputs
+        self.output_file = output_file
+        self.errors = 0
+
+
+class InProcessGroup:
+    """Runs in-process skills tick by tick, in the given (topological) order."""
+
+    def __init__(self, skills, out_root, conf_path, interval=0.005):
+        self.skills = skills
+        self.out_root = out_root
+        self.conf_path = conf_path
+        self.interval = interval
+        self.outputs = {}  # node_id -> latest _OP object
+        self.ticks = 0
+        self.tick_s = 0.0  # duration of the last tick
+
+    def tick(self):
+        start = time.perf_counter()
+        for skill in self.skills:
+            skill_start = time.perf_counter()
+            ip = skill.ip_cls()
+            if skill.file_inputs:
+                ip = readFromFile(self.out_root, self.conf_path, ip, skill.file_inputs)
+            for from_node, from_attr, to_attr in skill.memory_inputs:
+                op = self.outputs.get(from_node)
+                if op is not None and hasattr(op, from_attr):
+                    setattr(ip, to_attr, getattr(op, from_attr))
+            try:
+                op = skill.user_main(ip)
+            except Exception as e:
+                skill.errors += 1
+                print(f"[{skill.node_id}] Error: {e}")
+                continue
+            self.outputs[skill.node_id] = op
+            if skill.output_file is not None:
+                writeToFile(op, skill.output_file, skill.node_id)
+            if talos_trace.ENABLED:
+                talos_trace.complete(skill.node_id, skill_start, cat="in_process")
+        self.ticks += 1
+        self.tick_s = time.perf_counter() - start
+
+    def run(self, stop_event):
+        next_tick = time.monotonic()
+        while not stop_event.is_set():
+            self.tick()
+            next_tick += self.interval
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                stop_event.wait(delay)
+            else:
+                next_tick = time.monotonic()  # overran, don't try to catch up
@@ -0,0 +1,291 @@
+import os
+import sys
+import json
+import runpy
+import signal
+import select
+import socket
+import importlib
+import threading
+import traceback
+import subprocess
+
+# Warm skill launcher (POSIX only).
+# A zygote is a long-lived interpreter that already imported std_functs and the heavy
+# deps; every skill start is a fork of it, so starting or restarting a skill costs a
+# fork instead of two interpreter boots plus the numpy/cv2/PIL imports. Skill code is
+# only imported in the forked child, so a restart always runs the current sources.
+# The orchestrator runs one zygote per (python_version, python_paths) and talks to it
+# over a SOCK_SEQPACKET socketpair, one JSON message per packet:
+#   request   {"op": "spawn", "id", "main_py", "cwd", "env", "cpus", "nice"} + the fd to use as stdout/stderr
+#   replies   {"op": "started", "id", "pid"}, {"op": "error", "id", "error"},
+#             {"op": "exited", "pid", "code"}
+
+DEFAULT_PRELOAD = ["read_write_temp"]
+_MSG_SIZE = 64 * 1024
+
+
+def available():
+    return hasattr(os, "fork") and hasattr(socket, "send_fds") and hasattr(socket, "SOCK_SEQPACKET")
+
+
+def _send(sock, msg):
+    sock.send(json.dumps(msg).encode("utf-8"))
+
+
+#ZYGOTE SIDE
+def _run_child(sock, wake_r, wake_w, out_fd, req):
+    """Runs in the forked child, never returns."""
+    code = 0
+    try:
+        sock.close()
+        signal.set_wakeup_fd(-1)
+        os.close(wake_r)
+        os.close(wake_w)
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        os.dup2(out_fd, 1)
+        os.dup2(out_fd, 2)
+        os.close(out_fd)
+
+        # everything per skill is set up here, before the skill code runs or starts threads:
+        # the zygote imported std_functs with its own env, and by pid the orchestrator could
+        # only pin/renice the main thread once the skill is already running
+        os.environ.update(req.get("env") or {})
+        if "read_write_temp" in sys.modules:
+            sys.modules["read_write_temp"].apply_env()
+        if req.get("cpus") and hasattr(os, "sched_setaffinity"):
+            try:
+                os.sched_setaffinity(0, req["cpus"])
+            except OSError as e:
+                print(f"[skill_zygote] Could not pin to cores {req['cpus']}: {e}")
+        if req.get("nice") is not None and hasattr(os, "setpriority"):
+            try:
+                os.setpriority(os.PRIO_PROCESS, 0, int(req["nice"]))
+            except OSError as e:
+                print(f"[skill_zygote] Could not set nice {req['nice']}: {e}")
+        main_py = req["main_py"]
+        os.chdir(req.get("cwd") or os.path.dirname(main_py))
+        script_dir = os.path.dirname(main_py)
+        if script_dir not in sys.path:
+            sys.path.insert(0, script_dir)
+        sys.argv = [main_py] + req.get("args", [])
+        runpy.run_path(main_py, run_name="__main__")
+    except SystemExit as e:
+        code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except BaseException:
+        traceback.print_exc()
+        code = 1
+    finally:
+        try:
+            # os._exit skips atexit handlers
+            if "talos_trace" in sys.modules:
+                sys.modules["talos_trace"].flush()
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(code)
+
+
+def _reap(sock):
+    while True:
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            return
+        if pid == 0:
+            return
+        _send(sock, {"op": "exited", "pid": pid, "code": os.waitstatus_to_exitcode(status)})
+
+
+def serve(fd, preload, python_paths):
+    for p in python_paths:
+        if p and p not in sys.path:
+            sys.path.insert(0, p)
+    for name in preload:
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            print(f"[skill_zygote] Could not preload {name}: {e}")
+
+    sock = socket.socket(fileno=fd)
+    # Ctrl+C reaches the whole process group; the skills handle it, the zygote keeps going
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    wake_r, wake_w = os.pipe()
+    os.set_blocking(wake_r, False)
+    os.set_blocking(wake_w, False)
+    signal.set_wakeup_fd(wake_w)
+    signal.signal(signal.SIGCHLD, lambda *_: None)
+
+    while True:
+        try:
+            ready, _, _ = select.select([sock, wake_r], [], [])
+        except InterruptedError:
+            continue
+        if wake_r in ready:
+            try:
+                while os.read(wake_r, 512):
+                    pass
+            except BlockingIOError:
+                pass
+            _reap(sock)
+        if sock not in ready:
+            continue
+        data, fds, _, _ = socket.recv_fds(sock, _MSG_SIZE, 4)
+        if not data:
+            break  # orchestrator went away
+        req = json.loads(data)
+        out_fd = fds[0] if fds else os.open(os.devnull, os.O_WRONLY)
+        for extra in fds[1:]:
+            os.close(extra)
+        if req.get("op") != "spawn":
+            os.close(out_fd)
+            _send(sock, {"op": "error", "id": req.get("id"), "error": f"unknown op {req.get('op')}"})
+            continue
+        try:
+            pid = os.fork()
+        except OSError as e:
+            os.close(out_fd)
+            _send(sock, {"op": "error", "id": req["id"], "error": str(e)})
+            continue
+        if pid == 0:
+            _run_child(sock, wake_r, wake_w, out_fd, req)
+        os.close(out_fd)
+        _send(sock, {"op": "started", "id": req["id"], "pid": pid})
+
+
+#ORCHESTRATOR SIDE
+class WarmProcess:
+    """Popen-like handle of a skill forked by a zygote."""
+
+    def __init__(self, pid, stdout_fd):
+        self.pid = pid
+        self.stdout = os.fdopen(stdout_fd, "rb")
+        self.returncode = None
+        self._exited = threading.Event()
+
+    def _set_exit(self, code):
+        self.returncode = code
+        self._exited.set()
+
+    def poll(self):
+        return self.returncode
+
+    def wait(self, timeout=None):
+        if not self._exited.wait(timeout):
+            raise subprocess.TimeoutExpired(f"pid {self.pid}", timeout)
+        return self.returncode
+
+    def send_signal(self, sig):
+        if self.returncode is None:
+            try:
+                os.kill(self.pid, sig)
+            except ProcessLookupError:
+                pass
+
+    def terminate(self):
+        self.send_signal(signal.SIGTERM)
+
+    def kill(self):
+        self.send_signal(signal.SIGKILL)
+
+
+class Zygote:
+    """One zygote process and the skills it forked."""
+
+    def __init__(self, python_exe, python_paths=(), preload=None):
+        preload = DEFAULT_PRELOAD if preload is None else preload
+        parent, child = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+        try:
+            self.proc = subprocess.Popen(
+                [python_exe, "-u", os.path.abspath(__file__), str(child.fileno()),
+                 ",".join(preload), ";".join(python_paths)],
+                pass_fds=(child.fileno(),),
+            )
+        finally:
+            child.close()
+        self.sock = parent
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self._pending = {}   # request id -> {"event", "stdout", "proc", "error"}
+        self._children = {}  # pid -> WarmProcess
+        self._reader = threading.Thread(target=self._read_loop, daemon=True)
+        self._reader.start()
+
+    def alive(self):
+        return self.proc.poll() is None
+
+    def _read_loop(self):
+        while True:
+            try:
+                data = self.sock.recv(_MSG_SIZE)
+            except OSError:
+                data = b""
+            if not data:
+                break
+            msg = json.loads(data)
+            op = msg.get("op")
+            if op == "exited":
+                proc = self._children.pop(msg["pid"], None)
+                if proc is not None:
+                    proc._set_exit(msg["code"])
+                continue
+            pending = self._pending.pop(msg.get("id"), None)
+            if pending is None:
+                continue
+            if op == "started":
+                pending["proc"] = self._children[msg["pid"]] = WarmProcess(msg["pid"], pending["stdout"])
+            else:
+                pending["error"] = msg.get("error", "spawn failed")
+            pending["event"].set()
+
+        # zygote is gone: nobody can report how its skills end anymore
+        for pending in list(self._pending.values()):
+            pending["error"] = "zygote exited"
+            pending["event"].set()
+        if self._children:
+            print(f"[skill_zygote] zygote exited, exit codes of pids {sorted(self._children)} are unknown")
+        for proc in self._children.values():
+            proc._set_exit(-1)
+        self._children.clear()
+
+    def spawn(self, main_py, cwd=None, env=None, cpus=None, nice=None, timeout=10.0):
+        r, w = os.pipe()
+        with self._lock:
+            self._next_id += 1
+            req_id = self._next_id
+            pending = self._pending[req_id] = {"event": threading.Event(), "stdout": r, "proc": None, "error": None}
+            try:
+                socket.send_fds(self.sock, [json.dumps({"op": "spawn", "id": req_id, "main_py": main_py,
+                                                        "cwd": cwd, "env": env,
+                                                        "cpus": sorted(cpus) if cpus else None,
+                                                        "nice": nice}).encode("utf-8")], [w])
+            except OSError as e:
+                self._pending.pop(req_id, None)
+                pending["error"] = str(e)
+                pending["event"].set()
+        os.close(w)
+        if not pending["event"].wait(timeout):
+            self._pending.pop(req_id, None)
+            pending["error"] = "no reply from zygote"
+        if pending["proc"] is None:
+            os.close(r)
+            raise OSError(f"[skill_zygote] Could not start {main_py}: {pending['error']}")
+        return pending["proc"]
+
+    def close(self, timeout=2.0):
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+            self.sock.close()
+        except OSError:
+            pass
+        try:
+            self.proc.wait(timeout)
+        except subprocess.TimeoutExpired:
+            self.proc.terminate()
+
+
+if __name__ == "__main__":
+    serve(int(sys.argv[1]),
+          [m for m in sys.argv[2].split(",") if m] if len(sys.argv) > 2 else DEFAULT_PRELOAD,
+          sys.argv[3].split(";") if len(sys.argv) > 3 else [])
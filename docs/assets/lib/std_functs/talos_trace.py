@@ -0,0 +1,134 @@
+import os
+import sys
+import json
+import glob
+import time
+import atexit
+import signal
+import threading
+
+# Opt-in timeline tracing in Chrome trace event format (chrome://tracing, ui.perfetto.dev).
+# Enabled with TALOS_TRACE=<dir>, which the orchestrator sets for every skill when the
+# bot's runtime.trace is on. Each process appends its events to <dir>/<pid>.jsonl and
+# the orchestrator merges them into <dir>/trace.json at the end of the run.
+# Timestamps come from time.perf_counter(), a system-wide monotonic clock, so the
+# events of all skills line up on one timeline.
+# (Not named trace.py: std_functs is on sys.path after the stdlib, which has a trace module.)
+
+FLUSH_EVERY = 1024    # buffered events before they are appended to the file
+FLUSH_INTERVAL = 1.0  # or seconds since the last append
+
+ENABLED = False
+TRACE_DIR = None
+_process_name = None
+_events = []
+_lock = threading.Lock()
+_pid = None
+_seen_threads = set()
+_last_flush = 0.0
+
+
+def configure(trace_dir=None, process_name=None):
+    """(Re)read the settings, from the environment unless given. Called at import, and
+    by forked processes whose environment changed after the import."""
+    global ENABLED, TRACE_DIR, _process_name
+    TRACE_DIR = trace_dir or os.environ.get("TALOS_TRACE") or None
+    ENABLED = TRACE_DIR is not None
+    _process_name = process_name or os.environ.get("TALOS_SKILL") or os.path.basename(sys.argv[0] or "python")
+    if ENABLED:
+        os.makedirs(TRACE_DIR, exist_ok=True)
+        # skills are stopped with SIGTERM; exit through SystemExit so atexit flushes
+        if threading.current_thread() is threading.main_thread() and \
+                signal.getsignal(signal.SIGTERM) == signal.SIG_DFL:
+            signal.signal(signal.SIGTERM, lambda *_: sys.exit(128 + signal.SIGTERM))
+
+
+def _emit(event):
+    global _pid
+    pid = os.getpid()
+    with _lock:
+        if pid != _pid:
+            # first event, or first one after a fork: events of the parent are not ours
+            _pid = pid
+            _events.clear()
+            _seen_threads.clear()
+            _events.append({"name": "process_name", "ph": "M", "pid": pid, "tid": 0,
+                            "args": {"name": _process_name}})
+        tid = threading.get_native_id()
+        if tid not in _seen_threads:
+            _seen_threads.add(tid)
+            _events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                            "args": {"name": threading.current_thread().name}})
+        event["pid"] = pid
+        event["tid"] = tid
+        _events.append(event)
+        full = len(_events) >= FLUSH_EVERY or event["ts"] * 1e-6 - _last_flush >= FLUSH_INTERVAL
+    if full:
+        flush()
+
+
+def complete(name, start, end=None, cat="talos", args=None):
+    """Span from start to end (perf_counter seconds, end defaults to now)."""
+    if not ENABLED:
+        return
+    if end is None:
+        end = time.perf_counter()
+    event = {"name": name, "cat": cat, "ph": "X", "ts": start * 1e6, "dur": (end - start) * 1e6}
+    if args:
+        event["args"] = args
+    _emit(event)
+
+
+def instant(name, cat="talos", args=None):
+    if not ENABLED:
+        return
+    event = {"name": name, "cat": cat, "ph": "i", "s": "p", "ts": time.perf_counter() * 1e6}
+    if args:
+        event["args"] = args
+    _emit(event)
+
+
+def counter(name, values, cat="talos"):
+    if not ENABLED:
+        return
+    _emit({"name": name, "cat": cat, "ph": "C", "ts": time.perf_counter() * 1e6, "args": values})
+
+
+def flush():
+    global _last_flush
+    if not ENABLED:
+        return
+    with _lock:
+        _last_flush = time.perf_counter()
+        if not _events:
+            return
+        lines = "".join(json.dumps(e, separators=(",", ":")) + "\n" for e in _events)
+        _events.clear()
+        pid = _pid
+    try:
+        with open(os.path.join(TRACE_DIR, f"{pid}.jsonl"), "a") as f:
+            f.write(lines)
+    except OSError as e:
+        print(f"[talos_trace] Could not write trace events: {e}")
+
+
+def merge(trace_dir, out_path=None):
+    """Merge the per-process event files of a run into one trace JSON, returns its path."""
+    out_path = out_path or os.path.join(trace_dir, "trace.json")
+    events = []
+    for path in sorted(glob.glob(os.path.join(trace_dir, "*.jsonl"))):
+        with open(path, "r") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    try:
+                        events.append(json.loads(line))
+                    except ValueError:
+                        pass  # torn last line of a killed process
+    with open(out_path, "w") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+    return out_path
+
+
+configure()
+atexit.register(flush)
@@ -0,0 +1,159 @@
+import os
+import json
+import time
+
+import talos_trace
+
+# Fixed-rate clock for skill loops.
+#
+#   clock = TickClock(hz=60)
+#   while True:
+#       clock.wait()
+#       with clock.phase("read"): ...
+#       with clock.phase("compute"): ...
+#       with clock.phase("write"): ...
+#
+# Deadlines are absolute (monotonic perf_counter), so time spent in the loop body does not make the
+# rate drift. When a tick runs past the next deadline the policy decides what happens:
+#   drop      skip the missed deadlines and stay on the original grid (default)
+#   catch-up  run the missed ticks back to back, at most MAX_CATCH_UP of them
+#
+# TALOS_MAX_HZ (runtime.scheduling.<skill>.max_hz, set by the orchestrator) caps a fixed rate. An
+# unpaced clock is left alone, its loop is paced by wait_for_inputs, which applies the same cap.
+
+POLICIES = ("drop", "catch-up")
+MAX_CATCH_UP = 8
+REPORT_INTERVAL = 5.0  # seconds between stats dumps
+MAX_HZ = float(os.environ.get("TALOS_MAX_HZ") or 0)  # 0 = no cap
+
+
+def apply_env():
+    """Re-read TALOS_MAX_HZ, for skills forked after this module was imported."""
+    global MAX_HZ
+    MAX_HZ = float(os.environ.get("TALOS_MAX_HZ") or 0)
+
+
+class _Phase:
+    __slots__ = ("clock", "name", "start")
+
+    def __init__(self, clock, name):
+        self.clock = clock
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        self.clock._add_phase(self.name, end - self.start)
+        if talos_trace.ENABLED:
+            talos_trace.complete(self.name, self.start, end, "tick")
+        return False
+
+
+class TickClock:
+    """hz=0 (or None) runs unpaced and only keeps the statistics. Without hz the rate
+    comes from TALOS_TICK_HZ. A fixed rate is capped at TALOS_MAX_HZ. stats_path: JSON
+    file the stats are dumped to every REPORT_INTERVAL seconds."""
+
+    def __init__(self, hz=None, policy="drop", stats_path=None):
+        if hz is None:
+            hz = float(os.environ.get("TALOS_TICK_HZ") or 0)
+        if policy not in POLICIES:
+            raise ValueError(f"unknown tick policy {policy!r}, expected one of {POLICIES}")
+        if hz and MAX_HZ > 0:
+            hz = min(hz, MAX_HZ)
+        self.hz = hz
+        self.period = 1.0 / hz if hz else 0.0
+        self.policy = policy
+        self.stats_path = stats_path
+        self.ticks = 0
+        self.overruns = 0   # ticks that took longer than one period
+        self.dropped = 0    # deadlines skipped by the drop policy
+        self.late_s = 0.0   # how late the last tick started
+        self.phases = {}    # name -> [count, total_s, max_s]
+        self._deadline = None
+        self._tick_start = None
+        self._behind = 0
+        self._next_report = time.perf_counter() + REPORT_INTERVAL
+
+    def phase(self, name):
+        return _Phase(self, name)
+
+    def _add_phase(self, name, seconds):
+        entry = self.phases.get(name)
+        if entry is None:
+            entry = self.phases[name] = [0, 0.0, 0.0]
+        entry[0] += 1
+        entry[1] += seconds
+        if seconds > entry[2]:
+            entry[2] = seconds
+
+    def wait(self):
+        """Sleep until the next tick is due. Returns how late (seconds) the tick starts."""
+        now = time.perf_counter()
+        if self._tick_start is not None:
+            elapsed = now - self._tick_start
+            self._add_phase("tick", elapsed)
+            overrun = bool(self.period) and elapsed > self.period
+            if overrun:
+                self.overruns += 1
+            if talos_trace.ENABLED:
+                talos_trace.complete("tick", self._tick_start, now, "tick", {"n": self.ticks, "overrun": overrun})
+        if self.stats_path and now >= self._next_report:
+            self._next_report = now + REPORT_INTERVAL
+            self.dump()
+
+        if not self.period:
+            self._tick_start = now
+            self.ticks += 1
+            return 0.0
+
+        if self._deadline is None:
+            self._deadline = now
+        else:
+            self._deadline += self.period
+        late = now - self._deadline
+        if late >= self.period:
+            missed = int(late // self.period)
+            if self.policy == "drop" or self._behind + missed > MAX_CATCH_UP:
+                self.dropped += missed
+                self._deadline += missed * self.period
+                self._behind = 0
+            else:
+                self._behind += 1
+        elif late > 0:
+            self._behind = 0
+        else:
+            self._behind = 0
+            time.sleep(-late)
+        now = time.perf_counter()
+        self.late_s = max(0.0, now - self._deadline)
+        self._tick_start = now
+        self.ticks += 1
+        return self.late_s
+
+    def stats(self):
+        return {
+            "time": time.time(),
+            "hz": self.hz,
+            "policy": self.policy,
+            "ticks": self.ticks,
+            "overruns": self.overruns,
+            "dropped": self.dropped,
+            "late_ms": round(self.late_s * 1000, 3),
+            "phases": {name: {"count": count, "mean_ms": round(total / count * 1000, 3),
+                              "max_ms": round(peak * 1000, 3)}
+                       for name, (count, total, peak) in self.phases.items()},
+        }
+
+    def dump(self):
+        try:
+            os.makedirs(os.path.dirname(self.stats_path), exist_ok=True)
+            tmp_path = self.stats_path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self.stats(), f)
+            os.replace(tmp_path, self.stats_path)
+        except OSError as e:
+            print(f"[TickClock] Could not write {self.stats_path}: {e}")
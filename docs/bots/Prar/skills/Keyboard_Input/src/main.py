@@ -15,6 +15,7 @@ if path not in sys.path:
     sys.path.append(path)
 
 from read_write_temp import readFromFile, writeToFile
+from tick_clock import TickClock
 
 
 CURRENT = os.path.abspath(os.path.dirname(__file__))
@@ -37,14 +38,22 @@ def main():
     keys = ["w", "a", "s", "d", "space"]
     print("Press some keys...")
 
+    input_descriptor = [("keys", "v_out", "keys", 1)] #[(fromSkillID, fromAttributeID, toAttributeID, isStatic? 1:0), ...]
+
+    clock = TickClock(200, stats_path=os.path.join(OUTPUT_FILE, "tick_stats.json"))
+
     try:
         while True:
-            keyboard_input_IP_obj = keyboard_input_IP()
-            input_descriptor = [("keys", "v_out", "keys", 1)] #[(fromSkillID, fromAttributeID, toAttributeID, isStatic? 1:0), ...]
-            keyboard_input_IP_obj = readFromFile(T_O_P, CONF_FILE, keyboard_input_IP_obj, input_descriptor)
-            keyboard_input_OP_obj = userMain(keyboard_input_IP_obj)
-
-            writeToFile(keyboard_input_OP_obj, OUTPUT_FILE, "keyboard_input")
+            # keyboard state has to be polled, at a fixed rate instead of spinning a core
+            clock.wait()
+
+            with clock.phase("read"):
+                keyboard_input_IP_obj = keyboard_input_IP()
+                keyboard_input_IP_obj = readFromFile(T_O_P, CONF_FILE, keyboard_input_IP_obj, input_descriptor)
+            with clock.phase("compute"):
+                keyboard_input_OP_obj = userMain(keyboard_input_IP_obj)
+            with clock.phase("write"):
+                writeToFile(keyboard_input_OP_obj, OUTPUT_FILE, "keyboard_input")
 
     except KeyboardInterrupt:
         print("\nStopped.")
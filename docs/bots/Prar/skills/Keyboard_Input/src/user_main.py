@@ -9,13 +9,19 @@ from skill_io import *
 #     res = [keyboard.is_pressed(key) for key in key_list]
 #     return res
 
+# key_list arrives every tick, it is only parsed again when it changes
+_watched = None
+
 def userMain(keyboard_input_IP_obj) -> keyboard_input_OP:
     #----------- Input unwrapping -----------#
     key_list = keyboard_input_IP_obj.keys
     #----------------------------------------
     OP_obj = keyboard_input_OP()
     #----------- User-Driver Code -----------#
-    res =  [keyboard.is_pressed(key) for key in key_list]
+    global _watched
+    if _watched is None or _watched.hotkeys != tuple(key_list):
+        _watched = keyboard.KeySet(key_list)
+    res = keyboard.are_pressed(_watched)
     #----------------------------------------
 
     #-------- Output->Object wrapping -------#
@@ -1,15 +1,46 @@
 # Orchestrator
 import subprocess
+import selectors
 import threading
 import platform
+import collections
+import json
 import os
 import sys
 import time
-from typing import Dict, List
+import signal
+from typing import Dict, List, Optional, Set
+
+import yaml
 
 BOT_ROOT = os.path.dirname(os.path.abspath(__file__))  # /src
 BOT_DIR = os.path.dirname(BOT_ROOT)                    # /bot root
 SKILLS_DIR = os.path.join(BOT_DIR, "skills")
+OUT_DIR = os.path.join(BOT_DIR, "out")
+CONF_FILE = os.path.join(BOT_DIR, "config.yaml")
+SKILLGRAPH_FILE = os.path.join(BOT_DIR, "skillgraph.json")
+STD_FUNCTS = os.path.join(os.path.expanduser("~"), "Documents", "talos", "assets", "lib", "std_functs")
+GLOBAL_DEPS = os.path.join(os.path.expanduser("~"), "Documents", "talos", "global_deps")
+
+if STD_FUNCTS not in sys.path:
+    sys.path.append(STD_FUNCTS)
+try:
+    import launch_manifest
+except ImportError:
+    launch_manifest = None
+try:
+    import skill_zygote
+except ImportError:
+    skill_zygote = None
+try:
+    import talos_trace
+except ImportError:
+    talos_trace = None
+
+NON_SKILL_TYPES = ("start", "end", "static_attribute")
+REPORT_INTERVAL = 5.0  # seconds between critical-path reports
+STARTUP_WAIT = 10.0    # max seconds a consumer waits for its producers' first output
+
 def get_wrapper_path(skill_dir: str) -> str:
     if platform.system() == "Windows":
         wrapper = os.path.join(skill_dir, "env", "Scripts", "python_wrapper.py")
@@ -17,73 +48,951 @@ def get_wrapper_path(skill_dir: str) -> str:
         wrapper = os.path.join(skill_dir, "env", "bin", "python_wrapper.sh")
     return wrapper
 
-def run_skill(skill_name: str):
+def load_runtime_settings() -> dict:
+    if not os.path.exists(CONF_FILE):
+        return {}
+    with open(CONF_FILE, "r") as f:
+        conf = yaml.safe_load(f) or {}
+    return conf.get("runtime") or {}
+
+def _norm(node_id: str) -> str:
+    # skillgraph ids are not consistent ("KeyboardInput", "keyboard_input", "Keyboard_Input")
+    return node_id.lower().replace("_", "")
+
+class SkillGraph:
+    """Skill nodes of skillgraph.json and the dependencies between them."""
+
+    def __init__(self, path: str = SKILLGRAPH_FILE):
+        with open(path, "r") as f:
+            graph = json.load(f)
+        nodes = graph.get("nodes", [])
+        self.skills: List[str] = [n["id"] for n in nodes
+                                  if n.get("skillType", n.get("type")) not in NON_SKILL_TYPES]
+        by_norm = {_norm(s): s for s in self.skills}
+        statics = {_norm(n["id"]): n["id"] for n in nodes if n.get("skillType") == "static_attribute"}
+
+        self.upstream: Dict[str, Set[str]] = {s: set() for s in self.skills}
+        self.downstream: Dict[str, Set[str]] = {s: set() for s in self.skills}
+        self.attr_edges: List[tuple] = []  # (from_skill, from_attr, to_skill, to_attr)
+        self.static_inputs: Dict[str, List[tuple]] = {s: [] for s in self.skills}  # skill -> [(static_id, attr, to_attr)]
+        for edge in graph.get("edges", []):
+            from_id = _norm(edge.get("fromSkillId", edge.get("from", "")))
+            src = by_norm.get(from_id)
+            dst = by_norm.get(_norm(edge.get("toSkillId", edge.get("to", ""))))
+            if edge.get("type") == "attribute" and dst:
+                if src:
+                    self.attr_edges.append((src, edge.get("fromPortId"), dst, edge.get("toPortId")))
+                elif from_id in statics:
+                    self.static_inputs[dst].append((statics[from_id], edge.get("fromPortId"), edge.get("toPortId")))
+            # edges from start/static nodes don't order skills
+            if src and dst and src != dst:
+                self.upstream[dst].add(src)
+                self.downstream[src].add(dst)
+
+        self.levels = self._levels()
+        self.components = self._components()
+
+    def _levels(self) -> List[List[str]]:
+        """Topological levels: every skill only depends on skills of earlier levels."""
+        indegree = {s: len(self.upstream[s]) for s in self.skills}
+        level = [s for s in self.skills if indegree[s] == 0]
+        levels = []
+        seen = set()
+        while level:
+            levels.append(level)
+            seen.update(level)
+            nxt = []
+            for s in level:
+                for d in sorted(self.downstream[s]):
+                    indegree[d] -= 1
+                    if indegree[d] == 0:
+                        nxt.append(d)
+            level = nxt
+        cyclic = [s for s in self.skills if s not in seen]
+        if cyclic:
+            print(f"[orchestrator] Cycle in skillgraph between {cyclic}, starting them last")
+            levels.append(cyclic)
+        return levels
+
+    def _components(self) -> List[List[str]]:
+        """Independent branches: skills that share no edge, even indirectly."""
+        comp_of: Dict[str, int] = {}
+        components: List[List[str]] = []
+        for s in self.skills:
+            if s in comp_of:
+                continue
+            stack, members = [s], []
+            comp_of[s] = len(components)
+            while stack:
+                cur = stack.pop()
+                members.append(cur)
+                for nxt in self.upstream[cur] | self.downstream[cur]:
+                    if nxt not in comp_of:
+                        comp_of[nxt] = len(components)
+                        stack.append(nxt)
+            components.append(members)
+        return components
+
+    def order(self) -> List[str]:
+        return [s for level in self.levels for s in level]
+
+    def sinks(self) -> List[str]:
+        return [s for s in self.skills if not self.downstream[s]]
+
+    def core_plan(self, cpus: List[int]) -> Dict[str, int]:
+        """Every independent branch (component) gets its own slice of the cores, sized by
+        its skill count, and its skills take turns on that slice in level order. With
+        fewer cores than branches, whole branches share cores round-robin."""
+        plan: Dict[str, int] = {}
+        if not cpus:
+            return plan
+        components = sorted(self.components, key=len, reverse=True)
+        if len(cpus) < len(components):
+            for i, members in enumerate(components):
+                for skill in members:
+                    plan[skill] = cpus[i % len(cpus)]
+            return plan
+
+        shares = [1] * len(components)
+        for _ in range(len(cpus) - len(components)):
+            wanting = [i for i, members in enumerate(components) if shares[i] < len(members)]
+            if not wanting:
+                break
+            shares[max(wanting, key=lambda i: len(components[i]) / shares[i])] += 1
+        position = {s: i for i, s in enumerate(self.order())}
+        start = 0
+        for members, share in zip(components, shares):
+            cores = cpus[start:start + share]
+            start += share
+            for i, skill in enumerate(sorted(members, key=position.get)):
+                plan[skill] = cores[i % share]
+        return plan
+
+def skill_dir_for(node_id: str) -> Optional[str]:
+    """skills/ folder of a skillgraph node, matched like the graph ids are."""
+    if not os.path.isdir(SKILLS_DIR):
+        return None
+    for name in os.listdir(SKILLS_DIR):
+        if _norm(name) == _norm(node_id) and os.path.isdir(os.path.join(SKILLS_DIR, name)):
+            return name
+    return None
+
+def out_name(node_id: str) -> str:
+    return f"{node_id}_out.glob"
+
+def launch_skill(skill_name: str, env: Optional[dict] = None,
+                 cpus: Optional[Set[int]] = None, nice: Optional[int] = None) -> Optional[subprocess.Popen]:
     skill_dir = os.path.join(SKILLS_DIR, skill_name)
-    wrapper = get_wrapper_path(skill_dir)
     main_py = os.path.join(skill_dir, "src", "main.py")
 
-    if not os.path.exists(wrapper):
-        print(f"[{skill_name}] Wrapper not found: {wrapper}")
-        return
     if not os.path.exists(main_py):
         print(f"[{skill_name}] main.py not found: {main_py}")
-        return
+        return None
+
+    # exec the skill's interpreter directly from its cached launch manifest, the wrapper
+    # (an extra interpreter start that re-reads both JSON files) is the fallback
+    manifest = launch_manifest.resolve(skill_dir, GLOBAL_DEPS) if launch_manifest is not None else None
+    if manifest is not None:
+        cmd = launch_manifest.command(manifest, main_py)
+        env = dict(env if env is not None else os.environ, **manifest["env"])
+    else:
+        wrapper = get_wrapper_path(skill_dir)
+        if not os.path.exists(wrapper):
+            print(f"[{skill_name}] Wrapper not found: {wrapper}")
+            return None
+        cmd = [sys.executable, "-u",  os.path.abspath(wrapper), os.path.abspath(main_py)]  # run wrapper, pass main.py
 
-    # Launch process
     try:
-        process = subprocess.Popen(
-            [sys.executable, "-u",  os.path.abspath(wrapper), os.path.abspath(main_py)],  # run wrapper, pass main.py
+        return subprocess.Popen(
+            cmd,
             cwd=skill_dir,
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
-            text=True,
-            shell=False
+            env=env,
+            shell=False,
+            preexec_fn=child_scheduling(skill_name, cpus, nice)
         )
+    except Exception as e:
+        print(f"[{skill_name}] Error: {e}")
+        return None
+
+def resolve_interpreter(skill_dir: str):
+    """(python_exe, python_version, python_paths) of a skill, resolved the way its wrapper does."""
+    if launch_manifest is not None:
+        manifest = launch_manifest.resolve(skill_dir, GLOBAL_DEPS)
+        if manifest is None:
+            return None
+        return manifest["python_exe"], manifest["python_version"], tuple(manifest["python_paths"])
+    try:
+        with open(os.path.join(skill_dir, "env", "env_meta.json"), "r") as f:
+            meta = json.load(f)
+        with open(os.path.join(GLOBAL_DEPS, "dep_registry.json"), "r") as f:
+            registry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    version = meta.get("python_version", "")
+    python_exe = registry.get("python_interpreters", {}).get(version, "")
+    if not python_exe or not os.path.isfile(python_exe):
+        return None
+    return python_exe, version, tuple(meta.get("python_paths", []))
 
-        # Live log stream
-        for line in iter(process.stdout.readline, ""):
-            print(f"[{skill_name}] {line.strip()}")
+def prepare_in_process(skill_dir: str) -> Optional[str]:
+    """Why a skill can't share the orchestrator's interpreter, None if it can. Puts the
+    skill's python_paths on sys.path when it can."""
+    try:
+        with open(os.path.join(skill_dir, "config.yaml"), "r") as f:
+            conf = yaml.safe_load(f) or {}
+        with open(os.path.join(skill_dir, "env", "env_meta.json"), "r") as f:
+            meta = json.load(f)
+    except (OSError, ValueError, yaml.YAMLError) as e:
+        return f"unreadable skill config ({e})"
+    if conf.get("language", "python") != "python":
+        return f"language is {conf.get('language')}"
+    version = meta.get("python_version", "")
+    if version.split(".")[:2] != [str(sys.version_info.major), str(sys.version_info.minor)]:
+        return f"needs python {version}"
+    for p in meta.get("python_paths", []):
+        if p not in sys.path:
+            sys.path.append(p)
+    return None
 
-        process.wait()
-        print(f"[{skill_name}] exited with code {process.returncode}")
+def stream_logs(skill_name: str, process: subprocess.Popen):
+    # Live log stream
+    for line in iter(process.stdout.readline, b""):
+        print(f"[{skill_name}] {line.decode(errors='replace').strip()}")
 
-    except Exception as e:
-        print(f"[{skill_name}] Error: {e}")
+    process.wait()
+    print(f"[{skill_name}] exited with code {process.returncode}")
+
+class _LogSource:
+    def __init__(self, name: str, process, log_file: Optional[str]):
+        self.name = name
+        self.process = process
+        self.prefix = f"[{name}] ".encode()
+        self.partial = b""
+        self.tokens = 0.0
+        self.refill_at = time.monotonic()
+        self.suppressed = 0
+        self.log_file = log_file
+        self.log = open(log_file, "ab") if log_file else None
+
+class LogPump:
+    """One thread multiplexing the stdout pipes of all skills.
+
+    Pipes are read in binary chunks, complete lines are prefixed and written to the
+    console in one batch per wakeup. rate_limit caps the lines per second each skill
+    may log (0 = no limit); the rest is dropped and counted, so a spamming skill costs
+    the others nothing but the read. With log_dir every skill also gets a log file,
+    rotated at log_max_bytes keeping log_backups old files.
+    """
+
+    def __init__(self, settings: dict):
+        self.rate_limit = float(settings.get("log_rate_limit", 0))
+        self.log_dir = settings.get("log_dir")
+        if self.log_dir:
+            self.log_dir = os.path.join(BOT_DIR, self.log_dir)
+            os.makedirs(self.log_dir, exist_ok=True)
+        self.max_bytes = int(settings.get("log_max_bytes", 10 * 1024 * 1024))
+        self.backups = int(settings.get("log_backups", 3))
+        self.selector = selectors.DefaultSelector()
+        self.exiting: List[_LogSource] = []  # pipes closed, process not reaped yet
+        self._lock = threading.Lock()
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        self.selector.register(self._wake_r, selectors.EVENT_READ, None)
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+
+    @staticmethod
+    def supported() -> bool:
+        # select() only takes sockets on Windows
+        return platform.system() != "Windows"
+
+    def add(self, skill_name: str, process):
+        log_file = os.path.join(self.log_dir, f"{skill_name}.log") if self.log_dir else None
+        source = _LogSource(skill_name, process, log_file)
+        source.tokens = self.rate_limit
+        with self._lock:
+            self.selector.register(process.stdout.fileno(), selectors.EVENT_READ, source)
+        os.write(self._wake_w, b"\0")
+
+    def _allow(self, source: _LogSource, now: float) -> bool:
+        if self.rate_limit <= 0:
+            return True
+        source.tokens = min(self.rate_limit, source.tokens + (now - source.refill_at) * self.rate_limit)
+        source.refill_at = now
+        if source.tokens >= 1.0:
+            source.tokens -= 1.0
+            return True
+        source.suppressed += 1
+        return False
+
+    def _write_file(self, source: _LogSource, data: bytes):
+        source.log.write(data)
+        if source.log.tell() < self.max_bytes:
+            return
+        source.log.close()
+        for i in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{source.log_file}.{i}"):
+                os.replace(f"{source.log_file}.{i}", f"{source.log_file}.{i + 1}")
+        if self.backups > 0:
+            os.replace(source.log_file, f"{source.log_file}.1")
+        else:
+            os.remove(source.log_file)
+        source.log = open(source.log_file, "ab")
+
+    def _lines(self, source: _LogSource, lines: List[bytes], out: List[bytes], now: float):
+        kept = [line.rstrip(b"\r") for line in lines if self._allow(source, now)]
+        if source.suppressed and (self.rate_limit <= 0 or source.tokens >= 1.0):
+            kept.append(f"... {source.suppressed} lines suppressed (log_rate_limit)".encode())
+            source.suppressed = 0
+        if not kept:
+            return
+        out.append(b"".join(source.prefix + line + b"\n" for line in kept))
+        if source.log is not None:
+            self._write_file(source, b"".join(line + b"\n" for line in kept))
+
+    def _close(self, source: _LogSource, out: List[bytes], now: float):
+        with self._lock:
+            self.selector.unregister(source.process.stdout.fileno())
+        if source.partial:
+            self._lines(source, [source.partial], out, now)
+        source.process.stdout.close()
+        if source.log is not None:
+            source.log.close()
+        self.exiting.append(source)
+
+    def _reap(self, out: List[bytes]):
+        for source in list(self.exiting):
+            code = source.process.poll()
+            if code is not None:
+                self.exiting.remove(source)
+                out.append(source.prefix + f"exited with code {code}\n".encode())
+
+    def run(self):
+        stdout = sys.stdout.buffer
+        while True:
+            events = self.selector.select(0.5 if self.exiting else None)
+            now = time.monotonic()
+            out: List[bytes] = []
+            for key, _ in events:
+                source = key.data
+                if source is None:
+                    try:
+                        while os.read(self._wake_r, 512):
+                            pass
+                    except BlockingIOError:
+                        pass
+                    continue
+                try:
+                    chunk = os.read(key.fd, 65536)
+                except OSError:
+                    chunk = b""
+                if not chunk:
+                    self._close(source, out, now)
+                    continue
+                lines = (source.partial + chunk).split(b"\n")
+                source.partial = lines.pop()
+                self._lines(source, lines, out, now)
+            self._reap(out)
+            if out:
+                sys.stdout.flush()
+                stdout.write(b"".join(out))
+                stdout.flush()
+
+def child_scheduling(skill_name: str, cpus: Optional[Set[int]] = None, nice: Optional[int] = None):
+    """preexec_fn that pins and renices a launched skill before it execs, so every thread
+    it starts inherits both. None when there is nothing to set or the platform can't."""
+    cpus = set(cpus) if cpus and hasattr(os, "sched_setaffinity") else None
+    nice = nice if nice is not None and hasattr(os, "setpriority") else None
+    if cpus is None and nice is None:
+        return None
+
+    def setup():
+        # runs between fork and exec: no print (locks), stdout is already the log pipe
+        if cpus is not None:
+            try:
+                os.sched_setaffinity(0, cpus)
+            except OSError as e:
+                os.write(1, f"[{skill_name}] Could not pin to cores {sorted(cpus)}: {e}\n".encode())
+        if nice is not None:
+            try:
+                os.setpriority(os.PRIO_PROCESS, 0, nice)
+            except OSError as e:
+                os.write(1, f"[{skill_name}] Could not set nice {nice}: {e}\n".encode())
+    return setup
+
+def skill_scheduling(skill_name: str, settings: dict) -> dict:
+    """cpus / nice / max_hz of a skill: `scheduling:` in the skill's config.yaml, overridden
+    per key by runtime.scheduling.<skill> in the bot's config.yaml."""
+    sched = {}
+    try:
+        with open(os.path.join(SKILLS_DIR, skill_name, "config.yaml"), "r") as f:
+            sched.update((yaml.safe_load(f) or {}).get("scheduling") or {})
+    except (OSError, yaml.YAMLError):
+        pass
+    sched.update((settings.get("scheduling") or {}).get(skill_name) or {})
+    if sched.get("cpus") is not None:
+        cpus = sched["cpus"]
+        sched["cpus"] = {cpus} if isinstance(cpus, int) else set(cpus)
+    return sched
+
+def envelope_reader(feature: str):
+    """node_id -> latest envelope of that skill (or None), None if std_functs can't be imported."""
+    try:
+        from read_write_temp import latest_envelope
+    except ImportError as e:
+        print(f"[orchestrator] {feature} disabled, std_functs not importable: {e}")
+        return None
+    return lambda node_id: latest_envelope(OUT_DIR, CONF_FILE, out_name(node_id))
+
+def _proc_tree(pid: int) -> List[int]:
+    """pid and its descendants (skills launched cold run under their wrapper)."""
+    pids, stack = [], [pid]
+    while stack:
+        cur = stack.pop()
+        pids.append(cur)
+        try:
+            with open(f"/proc/{cur}/task/{cur}/children", "r") as f:
+                stack.extend(int(c) for c in f.read().split())
+        except OSError:
+            pass
+    return pids
+
+_CLK_TCK = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+def _proc_usage(pid: int):
+    """(cpu seconds, rss bytes) of a process tree from /proc, None where /proc is missing."""
+    cpu, rss, found = 0.0, 0, False
+    for p in _proc_tree(pid):
+        try:
+            with open(f"/proc/{p}/stat", "r") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+            with open(f"/proc/{p}/statm", "r") as f:
+                rss += int(f.read().split()[1]) * _PAGE_SIZE
+        except (OSError, IndexError, ValueError):
+            continue
+        # utime and stime are fields 14 and 15 of stat, 12 and 13 after the command name
+        cpu += (int(fields[11]) + int(fields[12])) / _CLK_TCK
+        found = True
+    return (cpu, rss) if found else None
+
+class _SkillState:
+    def __init__(self, skill_name: str, node_id: str):
+        self.skill_name = skill_name
+        self.node_id = node_id
+        self.state = "running"
+        self.restarts = 0
+        self.backoff = 0.0
+        self.next_restart = 0.0
+        self.started_at = time.monotonic()
+        self.exit_code = None
+        self.cpu_percent = 0.0
+        self.rss = 0
+        self.tick_hz = None   # from the skill's TickClock stats, None without a TickClock
+        self.pub_hz = 0.0     # envelope versions per second, only bumps when the output changes
+        self.tick_clock = None
+        self._cpu = None      # (wall, cpu seconds) of the previous sample
+        self._version = None  # (wall, envelope version) of the previous sample
+
+class Supervisor:
+    """Restarts skills by their restart policy and samples what each one costs.
+
+    runtime.restart is always | on-failure (default) | never, or a map of skill name
+    to policy with an optional "default". on-failure restarts after
+    restart_backoff seconds, doubling up to restart_backoff_max, and the backoff
+    resets once a skill ran for STABLE_AFTER seconds. Every status_interval seconds
+    a table of cpu%, rss, ticks/s and pub/s is printed and written to out/supervisor_stats.json.
+    ticks/s comes from the tick_stats.json the skill's TickClock dumps, pub/s from the
+    envelope version, so an idle skill ticks without publishing.
+    """
+
+    STABLE_AFTER = 60.0
+
+    def __init__(self, orchestrator: "SkillOrchestrator", settings: dict):
+        self.orchestrator = orchestrator
+        policy = settings.get("restart", "on-failure")
+        self.policies = policy if isinstance(policy, dict) else {"default": policy}
+        self.backoff_min = float(settings.get("restart_backoff", 0.5))
+        self.backoff_max = float(settings.get("restart_backoff_max", 30.0))
+        self.status_interval = float(settings.get("status_interval", 10.0))
+        self.stats_file = os.path.join(OUT_DIR, "supervisor_stats.json")
+        self.skills: Dict[str, _SkillState] = {}
+        self._stop = threading.Event()
+        self._read_envelope = None
+
+    def policy(self, skill_name: str) -> str:
+        return self.policies.get(skill_name, self.policies.get("default", "on-failure"))
+
+    def started(self, skill_name: str, node_id: str):
+        state = self.skills.get(skill_name)
+        if state is None:
+            state = self.skills[skill_name] = _SkillState(skill_name, node_id)
+        state.state, state.exit_code = "running", None
+        state.started_at = time.monotonic()
+        state._cpu = None
+
+    def start(self):
+        self._read_envelope = envelope_reader("Tick rate sampling")
+        threading.Thread(target=self.run, daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _check(self, state: _SkillState, now: float):
+        process = self.orchestrator.processes.get(state.skill_name)
+        if process is None:
+            return
+        if state.state == "backoff":
+            if now >= state.next_restart:
+                state.restarts += 1
+                print(f"[supervisor] Restarting {state.skill_name} (restart {state.restarts})")
+                self.orchestrator.start_skill(state.skill_name, self.orchestrator.cpus.get(state.skill_name))
+                if state.state == "backoff":  # launch failed, try again later
+                    state.backoff = min(self.backoff_max, state.backoff * 2)
+                    state.next_restart = now + state.backoff
+            return
+        code = process.poll()
+        if code is None:
+            if now - state.started_at >= self.STABLE_AFTER:
+                state.backoff = 0.0
+            return
+        if state.state != "running":
+            return
+        state.exit_code = code
+        if talos_trace is not None:
+            talos_trace.instant("skill_exit", "orchestrator", {"skill": state.skill_name, "code": code})
+        policy = self.policy(state.skill_name)
+        if policy == "always" or (policy == "on-failure" and code != 0):
+            state.backoff = min(self.backoff_max, state.backoff * 2) if state.backoff else self.backoff_min
+            state.next_restart = now + state.backoff
+            state.state = "backoff"
+            print(f"[supervisor] {state.skill_name} exited with code {code}, restarting in {state.backoff:.1f}s")
+        else:
+            state.state = "exited"
+
+    def _sample(self, state: _SkillState, now: float):
+        process = self.orchestrator.processes.get(state.skill_name)
+        usage = _proc_usage(process.pid) if process is not None and state.state == "running" else None
+        if usage is None:
+            state.cpu_percent, state.rss = 0.0, 0
+        else:
+            if state._cpu is not None and now > state._cpu[0]:
+                state.cpu_percent = 100.0 * (usage[0] - state._cpu[1]) / (now - state._cpu[0])
+            state._cpu = (now, usage[0])
+            state.rss = usage[1]
+        if self._read_envelope is not None:
+            try:
+                env = self._read_envelope(state.node_id)
+            except Exception:
+                env = None
+            if env is not None:
+                version = env.get("version", 0)
+                if state._version is not None and now > state._version[0]:
+                    state.pub_hz = max(0.0, version - state._version[1]) / (now - state._version[0])
+                state._version = (now, version)
+        # dumped by the skill's TickClock
+        try:
+            with open(os.path.join(OUT_DIR, out_name(state.node_id), "tick_stats.json"), "r") as f:
+                tick_clock = json.load(f)
+        except (OSError, ValueError):
+            tick_clock = None
+        previous, state.tick_clock = state.tick_clock, tick_clock
+        if tick_clock is None:
+            state.tick_hz = None
+        elif previous is not None and tick_clock.get("time", 0) > previous.get("time", 0):
+            # a restarted skill counts from zero again
+            ticks = max(0, tick_clock["ticks"] - previous["ticks"])
+            state.tick_hz = ticks / (tick_clock["time"] - previous["time"])
+
+    def snapshot(self) -> dict:
+        stats = {"time": time.time(), "skills": {}}
+        for name, state in self.skills.items():
+            process = self.orchestrator.processes.get(name)
+            stats["skills"][name] = {
+                "pid": process.pid if process is not None else None,
+                "state": state.state,
+                "policy": self.policy(name),
+                "restarts": state.restarts,
+                "exit_code": state.exit_code,
+                "cpu_percent": round(state.cpu_percent, 1),
+                "rss_bytes": state.rss,
+                "ticks_per_s": round(state.tick_hz, 1) if state.tick_hz is not None else None,
+                "pub_per_s": round(state.pub_hz, 1),
+            }
+            if state.tick_clock is not None:
+                stats["skills"][name]["tick_clock"] = state.tick_clock
+        group = self.orchestrator.in_process
+        if group is not None:
+            stats["in_process"] = {"ticks": group.ticks, "tick_ms": round(group.tick_s * 1000, 3),
+                                   "skills": [s.node_id for s in group.skills]}
+        return stats
+
+    def report(self, stats: dict):
+        lines = [f"{'skill':<24}{'pid':>8}  {'state':<9}{'restarts':>9}{'cpu%':>8}{'rss MB':>9}{'ticks/s':>9}{'pub/s':>8}"]
+        for name, row in stats["skills"].items():
+            lines.append(f"{name:<24}{row['pid'] or '-':>8}  {row['state']:<9}{row['restarts']:>9}"
+                         f"{row['cpu_percent']:>8.1f}{row['rss_bytes'] / 1e6:>9.1f}"
+                         f"{'-' if row['ticks_per_s'] is None else row['ticks_per_s']:>9}{row['pub_per_s']:>8.1f}")
+        print("\n".join(f"[supervisor] {line}" for line in lines))
+        try:
+            os.makedirs(OUT_DIR, exist_ok=True)
+            tmp_path = self.stats_file + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(stats, f, indent=2)
+            os.replace(tmp_path, self.stats_file)
+        except OSError as e:
+            print(f"[supervisor] Could not write {self.stats_file}: {e}")
+
+    def run(self):
+        next_report = time.monotonic() + self.status_interval
+        while not self._stop.wait(1.0):
+            now = time.monotonic()
+            with self.orchestrator.lock:
+                for state in list(self.skills.values()):
+                    self._check(state, now)
+            for state in list(self.skills.values()):
+                self._sample(state, now)
+            if self.status_interval > 0 and now >= next_report:
+                next_report = now + self.status_interval
+                self.report(self.snapshot())
+
+class LatencyMonitor:
+    """Samples every skill's envelope timestamp and reports the critical path.
+
+    Stage delay of a skill = its output timestamp minus the newest timestamp among its
+    producers. Path latency accumulates stage delays from the sources, and the
+    critical path is the slowest chain ending in a sink.
+    """
+
+    def __init__(self, graph: SkillGraph):
+        self.graph = graph
+        self.samples: Dict[str, collections.deque] = {s: collections.deque(maxlen=1000) for s in graph.sinks()}
+        self._stop = threading.Event()
+        self._read_envelope = envelope_reader("Latency report")
+
+    def stop(self):
+        self._stop.set()
+
+    def _timestamps(self) -> Dict[str, float]:
+        stamps = {}
+        for skill in self.graph.skills:
+            try:
+                env = self._read_envelope(skill)
+            except Exception:
+                env = None
+            if env is not None:
+                stamps[skill] = env.get("timestamp", 0.0)
+        return stamps
+
+    def critical_path(self, stamps: Dict[str, float]):
+        latency: Dict[str, float] = {}
+        via: Dict[str, Optional[str]] = {}
+        for skill in self.graph.order():
+            if skill not in stamps:
+                continue
+            ups = [u for u in self.graph.upstream[skill] if u in latency]
+            if not ups:
+                latency[skill], via[skill] = 0.0, None
+                continue
+            newest = max(stamps[u] for u in ups)
+            slowest = max(ups, key=lambda u: latency[u])
+            latency[skill] = latency[slowest] + max(0.0, stamps[skill] - newest)
+            via[skill] = slowest
+        return latency, via
+
+    def run(self):
+        if self._read_envelope is None:
+            return
+        last_seen: Dict[str, float] = {}
+        next_report = time.monotonic() + REPORT_INTERVAL
+        while not self._stop.wait(0.05):
+            stamps = self._timestamps()
+            latency, via = self.critical_path(stamps)
+            for sink, samples in self.samples.items():
+                # one sample per new output of the sink = one tick of that pipeline
+                if sink in latency and stamps[sink] != last_seen.get(sink):
+                    last_seen[sink] = stamps[sink]
+                    samples.append(latency[sink])
+            if time.monotonic() >= next_report:
+                next_report += REPORT_INTERVAL
+                self.report(latency, via)
+
+    def report(self, latency: Dict[str, float], via: Dict[str, Optional[str]]):
+        for sink, samples in self.samples.items():
+            if not samples or sink not in latency:
+                continue
+            path, cur = [], sink
+            while cur is not None:
+                path.append(cur)
+                cur = via.get(cur)
+            ordered = sorted(samples)
+            p50 = ordered[len(ordered) // 2] * 1000
+            worst = ordered[-1] * 1000
+            print(f"[orchestrator] critical path {' -> '.join(reversed(path))}: "
+                  f"p50 {p50:.1f} ms, max {worst:.1f} ms over {len(ordered)} ticks")
+            samples.clear()
 
 class SkillOrchestrator:
     def __init__(self):
-        self.threads: Dict[str, threading.Thread] = {}
+        self.threads: Dict[str, threading.Thread] = {}  # log threads where there is no LogPump
+        self.processes: Dict[str, subprocess.Popen] = {}
+        self.cpus: Dict[str, Set[int]] = {}
+        self.monitor: Optional[LatencyMonitor] = None
+        self.in_process = None  # skill_inproc.InProcessGroup
+        self._stop = threading.Event()
+        self.settings = load_runtime_settings()
+        self.zygotes: Dict[tuple, "skill_zygote.Zygote"] = {}
+        self.worker_pool = bool(self.settings.get("worker_pool", False))
+        if self.worker_pool and (skill_zygote is None or not skill_zygote.available()):
+            print("[orchestrator] Worker pool is not supported here, launching skills cold")
+            self.worker_pool = False
+        self.log_pump = LogPump(self.settings) if LogPump.supported() else None
+        self.lock = threading.RLock()  # start/restart vs the supervisor
+        self.node_of: Dict[str, str] = {}  # skill folder -> skillgraph node id
+        self.stop_timeout = float(self.settings.get("stop_timeout", 3.0))
+        self.supervisor = Supervisor(self, self.settings)
+        self.trace_dir = None
+        if self.settings.get("trace", False):
+            if talos_trace is None:
+                print("[orchestrator] Tracing disabled, std_functs not importable")
+            else:
+                # one folder per run; skills get it through TALOS_TRACE
+                self.trace_dir = os.path.join(OUT_DIR, "trace", time.strftime("%Y%m%d-%H%M%S"))
+                talos_trace.configure(self.trace_dir, "orchestrator")
 
-    def start_skill(self, skill_name: str):
-        if skill_name in self.threads and self.threads[skill_name].is_alive():
-            print(f"[{skill_name}] Already running.")
-            return
+    def _warm_launch(self, skill_name: str, env: Optional[dict] = None,
+                     cpus: Optional[Set[int]] = None, nice: Optional[int] = None):
+        """Fork the skill from the zygote of its interpreter, None to fall back to a cold start.
+        env, cpus and nice are applied in the child before the skill code runs."""
+        skill_dir = os.path.join(SKILLS_DIR, skill_name)
+        interpreter = resolve_interpreter(skill_dir)
+        if interpreter is None:
+            print(f"[{skill_name}] No interpreter found for the worker pool, launching cold")
+            return None
+        python_exe, _, python_paths = interpreter
+        try:
+            zygote = self.zygotes.get(interpreter)
+            if zygote is None or not zygote.alive():
+                zygote = self.zygotes[interpreter] = skill_zygote.Zygote(python_exe, python_paths,
+                                                                 self.settings.get("preload"))
+            return zygote.spawn(os.path.join(skill_dir, "src", "main.py"), cwd=skill_dir, env=env,
+                                cpus=cpus, nice=nice)
+        except OSError as e:
+            print(f"[{skill_name}] {e}, launching cold")
+            return None
+
+    def start_skill(self, skill_name: str, cpus: Optional[Set[int]] = None):
+        with self.lock:
+            running = self.processes.get(skill_name)
+            if running is not None and running.poll() is None:
+                print(f"[{skill_name}] Already running.")
+                return
+
+            # explicit scheduling settings win over the automatic core plan
+            sched = skill_scheduling(skill_name, self.settings)
+            cpus = sched.get("cpus") or cpus
+            env = {}
+            if sched.get("max_hz"):
+                env["TALOS_MAX_HZ"] = str(sched["max_hz"])
+            if self.trace_dir:
+                env["TALOS_TRACE"] = self.trace_dir
+                env["TALOS_SKILL"] = skill_name
+
+            nice = int(sched["nice"]) if sched.get("nice") is not None else None
+            process = self._warm_launch(skill_name, env, cpus, nice) if self.worker_pool else None
+            if process is None:
+                # cpus/nice are set in the forked child before it execs the skill interpreter
+                process = launch_skill(skill_name, dict(os.environ, **env) if env else None, cpus, nice)
+                if process is None:
+                    return
+            if cpus:
+                self.cpus[skill_name] = cpus
+            self.processes[skill_name] = process
+            self.supervisor.started(skill_name, self.node_of.get(skill_name, skill_name.lower()))
+            if self.log_pump is not None:
+                self.log_pump.add(skill_name, process)
+            else:
+                thread = threading.Thread(target=stream_logs, args=(skill_name, process), daemon=True)
+                self.threads[skill_name] = thread
+                thread.start()
+            if self.trace_dir:
+                talos_trace.instant("skill_start", "orchestrator", {"skill": skill_name, "pid": process.pid})
+            print(f"[{skill_name}] Started.")
+
+    def _signal(self, process, sig):
+        # cold launched skills run under their wrapper, signal the whole tree
+        pids = _proc_tree(process.pid) if os.path.isdir("/proc") else [process.pid]
+        for pid in reversed(pids):
+            try:
+                os.kill(pid, sig)
+            except (ProcessLookupError, PermissionError):
+                pass
+
+    def stop_processes(self, names: List[str], timeout: float):
+        """SIGTERM, then SIGKILL whatever is still alive after timeout."""
+        alive = [self.processes[n] for n in names if n in self.processes and self.processes[n].poll() is None]
+        for process in alive:
+            if platform.system() == "Windows":
+                process.terminate()
+            else:
+                self._signal(process, signal.SIGTERM)
+        deadline = time.monotonic() + timeout
+        for process in alive:
+            try:
+                process.wait(max(0.0, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                if platform.system() == "Windows":
+                    process.kill()
+                else:
+                    self._signal(process, signal.SIGKILL)
+                process.wait()
 
-        thread = threading.Thread(target=run_skill, args=(skill_name,), daemon=True)
-        self.threads[skill_name] = thread
-        thread.start()
-        print(f"[{skill_name}] Started.")
+    def restart_skill(self, skill_name: str):
+        """Stop a skill and start it again from its current sources, on the same cores."""
+        with self.lock:
+            self.stop_processes([skill_name], self.stop_timeout)
+            thread = self.threads.get(skill_name)
+            if thread is not None:
+                thread.join(self.stop_timeout)
+            self.start_skill(skill_name, self.cpus.get(skill_name))
+
+    def wait_for_output(self, node_ids: Set[str], timeout: float) -> bool:
+        """Wait until every producer in node_ids wrote its first output."""
+        deadline = time.monotonic() + timeout
+        pending = set(node_ids)
+        while pending and time.monotonic() < deadline:
+            pending = {n for n in pending if not self._has_output(n)}
+            if pending:
+                time.sleep(0.05)
+        return not pending
+
+    def _has_output(self, node_id: str) -> bool:
+        out = os.path.join(OUT_DIR, out_name(node_id))
+        return any(os.path.exists(os.path.join(out, f)) for f in ("output.json", "output.bin", "output.ring"))
+
+    def start_graph(self, graph: SkillGraph):
+        """Start skills level by level so producers are up before their consumers, with
+        independent skills pinned to different cores when there are enough of them."""
+        pin = self.settings.get("pin_skills", "auto")
+        cpus = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else []
+        # cores given to skills explicitly are kept free of automatically pinned ones
+        reserved = set()
+        for node_id in graph.skills:
+            skill_name = skill_dir_for(node_id)
+            if skill_name is not None:
+                reserved |= skill_scheduling(skill_name, self.settings).get("cpus") or set()
+        cpus = [c for c in cpus if c not in reserved] or cpus
+        if pin == "auto":
+            pin = len(cpus) >= len(graph.skills) > 1
+        plan = graph.core_plan(cpus) if pin else {}
+        # in-process skills tolerate missing inputs, so they go first and isolated
+        # consumers find their output when they start
+        in_process = self.start_in_process(graph)
+
+        for level in graph.levels:
+            level = [s for s in level if s not in in_process]
+            producers = set().union(*(graph.upstream[s] for s in level))
+            if producers and not self.wait_for_output(producers, STARTUP_WAIT):
+                print(f"[orchestrator] Producers {sorted(producers)} have no output yet, starting {level} anyway")
+            for node_id in level:
+                skill_name = skill_dir_for(node_id)
+                if skill_name is None:
+                    print(f"[{node_id}] No skill folder in {SKILLS_DIR}")
+                    continue
+                self.node_of[skill_name] = node_id
+                cpu = plan.get(node_id)
+                self.start_skill(skill_name, {cpu} if cpu is not None else None)
+
+        self.monitor = LatencyMonitor(graph)
+        threading.Thread(target=self.monitor.run, daemon=True).start()
+
+    def start_in_process(self, graph: SkillGraph) -> Set[str]:
+        """Run the skills allowed by runtime.in_process inside this interpreter, returns their ids."""
+        if not self.settings.get("in_process", False):
+            return set()
+        try:
+            from skill_inproc import InProcessSkill, InProcessGroup
+        except ImportError as e:
+            print(f"[orchestrator] In-process mode disabled, std_functs not importable: {e}")
+            return set()
+
+        isolate = {_norm(s) for s in self.settings.get("isolate", [])}
+        nodes = set()
+        for node_id in graph.skills:
+            skill_name = skill_dir_for(node_id)
+            if skill_name is None or _norm(node_id) in isolate:
+                continue
+            reason = prepare_in_process(os.path.join(SKILLS_DIR, skill_name))
+            if reason:
+                print(f"[{node_id}] Running isolated: {reason}")
+                continue
+            nodes.add(node_id)
+
+        skills = []
+        for node_id in graph.order():
+            if node_id not in nodes:
+                continue
+            file_inputs = [(static_id, attr, to_attr, 1) for static_id, attr, to_attr in graph.static_inputs[node_id]]
+            memory_inputs = []
+            for src, src_attr, dst, dst_attr in graph.attr_edges:
+                if dst != node_id:
+                    continue
+                if src in nodes:
+                    memory_inputs.append((src, src_attr, dst_attr))
+                else:
+                    file_inputs.append((out_name(src), src_attr, dst_attr, 0))
+            try:
+                skills.append(InProcessSkill(node_id, os.path.join(SKILLS_DIR, skill_dir_for(node_id)),
+                                             file_inputs, memory_inputs))
+            except Exception as e:
+                # loaded in topological order, so its consumers read it from /out instead
+                print(f"[{node_id}] Could not load in-process, running isolated: {e}")
+                nodes.discard(node_id)
+
+        for skill in skills:
+            if any(d not in nodes for d in graph.downstream[skill.node_id]):
+                skill.output_file = os.path.join(OUT_DIR, out_name(skill.node_id))
+        if not skills:
+            return set()
+
+        hz = float(self.settings.get("in_process_hz", 200))
+        self.in_process = InProcessGroup(skills, OUT_DIR, CONF_FILE, 1.0 / hz)
+        threading.Thread(target=self.in_process.run, args=(self._stop,), daemon=True).start()
+        print(f"[orchestrator] Running in-process: {[s.node_id for s in skills]}")
+        return nodes
 
     def stop_all(self):
         print("\n Stopping all skills...")
-        # Threads will stop automatically when their process exits (daemon=True)
+        self._stop.set()
+        self.supervisor.stop()
+        if self.monitor is not None:
+            self.monitor.stop()
+        with self.lock:
+            self.stop_processes(list(self.processes), self.stop_timeout)
+        for zygote in self.zygotes.values():
+            zygote.close()
+        # Log threads end with their process (daemon=True)
         for name, thread in self.threads.items():
-            if thread.is_alive():
-                print(f"[{name}] (thread running)")
-        print(" All threads cleaned up.")
+            thread.join(0.5)
+        print(" All skills stopped.")
+        if self.trace_dir:
+            talos_trace.flush()
+            print(f" Trace written to {talos_trace.merge(self.trace_dir)}")
 
 def main():
     orchestrator = SkillOrchestrator()
 
-    # List of skills to start
-    skills_to_run = [
-        "Keyboard_Input",
-    ]
-
-    for skill in skills_to_run:
-        orchestrator.start_skill(skill)
+    if os.path.exists(SKILLGRAPH_FILE):
+        orchestrator.start_graph(SkillGraph(SKILLGRAPH_FILE))
+    else:
+        # no graph: start every skill of the bot, unordered
+        for skill in sorted(os.listdir(SKILLS_DIR)):
+            orchestrator.start_skill(skill)
+    orchestrator.supervisor.start()
 
-    # Keep orchestrator alive while skills runasd
+    # Keep orchestrator alive while skills run
     try:
         while True:
             time.sleep(1)
@@ -92,4 +1001,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
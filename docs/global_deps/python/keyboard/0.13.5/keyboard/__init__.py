@@ -84,6 +84,8 @@ version = '0.13.5'
 import re as _re
 import itertools as _itertools
 import collections as _collections
+import functools as _functools
+import bisect as _bisect
 from threading import Thread as _Thread, Lock as _Lock
 import time as _time
 # Python2... Buggy on time changes and leap seconds, but no other good option (https://stackoverflow.com/questions/1205722/how-do-i-get-monotonic-time-durations-in-python).
@@ -148,6 +150,26 @@ _pressed_events_lock = _Lock()
 _pressed_events = {}
 _physically_pressed_keys = _pressed_events
 _logically_pressed_keys = {}
+
+# Snapshot of the scan codes in `_pressed_events`, as a bitmask of
+# `_scan_code_bit`s. Ints are immutable and the name is rebound in a single
+# step on every key event, so readers never need `_pressed_events_lock`.
+_pressed_mask = 0
+def _scan_code_bit(scan_code):
+    # Scan codes can be negative (Windows uses -vk for keys without one).
+    return 1 << (scan_code * 2 if scan_code >= 0 else -scan_code * 2 - 1)
+
+def _scan_codes_mask(scan_codes):
+    mask = 0
+    for scan_code in scan_codes:
+        mask |= _scan_code_bit(scan_code)
+    return mask
+
+# Sorted tuple of the scan codes in `_pressed_events`, the key of the
+# `blocking_hotkeys`/`nonblocking_hotkeys` tables. Updated in place of
+# `tuple(sorted(_pressed_events))` only when a key goes down or up, not on
+# every event (key repeats), and replaced like `_pressed_mask`.
+_pressed_key = ()
 class _KeyboardListener(_GenericListener):
     transition_table = {
         #Current state of the modifier, per `modifier_states`.
@@ -209,12 +231,12 @@ class _KeyboardListener(_GenericListener):
         self.modifier_states = {} # "alt" -> "allowed"
 
     def pre_process_event(self, event):
-        for key_hook in self.nonblocking_keys[event.scan_code]:
+        for key_hook in self.nonblocking_keys.get(event.scan_code, ()):
             key_hook(event)
 
-        with _pressed_events_lock:
-            hotkey = tuple(sorted(_pressed_events))
-        for callback in self.nonblocking_hotkeys[hotkey]:
+        # `.get` instead of indexing, the defaultdicts would otherwise grow an
+        # empty entry for every combination ever typed.
+        for callback in self.nonblocking_hotkeys.get(_pressed_key, ()):
             callback(event)
 
         return event.scan_code or (event.name and event.name != 'unknown')
@@ -240,17 +262,28 @@ class _KeyboardListener(_GenericListener):
         scan_code = event.scan_code
 
         # Update tables of currently pressed keys and modifiers.
+        global _pressed_mask, _pressed_key
         with _pressed_events_lock:
             if event_type == KEY_DOWN:
                 if is_modifier(scan_code): self.active_modifiers.add(scan_code)
                 _pressed_events[scan_code] = event
-            hotkey = tuple(sorted(_pressed_events))
+                if scan_code not in _pressed_key:
+                    i = _bisect.bisect(_pressed_key, scan_code)
+                    _pressed_key = _pressed_key[:i] + (scan_code,) + _pressed_key[i:]
+            hotkey = _pressed_key
             if event_type == KEY_UP:
                 self.active_modifiers.discard(scan_code)
                 if scan_code in _pressed_events: del _pressed_events[scan_code]
+                if scan_code in _pressed_key:
+                    _pressed_key = tuple(c for c in _pressed_key if c != scan_code)
+            if _is_number(scan_code):
+                if event_type == KEY_DOWN:
+                    _pressed_mask = _pressed_mask | _scan_code_bit(scan_code)
+                else:
+                    _pressed_mask = _pressed_mask & ~_scan_code_bit(scan_code)
 
         # Mappings based on individual keys instead of hotkeys.
-        for key_hook in self.blocking_keys[scan_code]:
+        for key_hook in self.blocking_keys.get(scan_code, ()):
             if not key_hook(event):
                 return False
 
@@ -265,7 +298,7 @@ class _KeyboardListener(_GenericListener):
                 modifiers_to_update = self.active_modifiers
                 if is_modifier(scan_code):
                     modifiers_to_update = modifiers_to_update | {scan_code}
-                callback_results = [callback(event) for callback in self.blocking_hotkeys[hotkey]]
+                callback_results = [callback(event) for callback in self.blocking_hotkeys.get(hotkey, ())]
                 if callback_results:
                     accept = all(callback_results)
                     origin = 'hotkey'
@@ -295,6 +328,43 @@ class _KeyboardListener(_GenericListener):
 
 _listener = _KeyboardListener()
 
+# Parse results of string and scan code hotkeys. They are immutable and only depend on the
+# OS name tables, so all caches are dropped when `_os_keyboard.tables_version`
+# changes; a cache that reaches `_parse_cache_size` entries starts over.
+_parse_cache_size = 1024
+_parse_caches = []
+_parse_cache_version = None
+def _cached_parse(function):
+    cache = {}
+    _parse_caches.append(cache)
+
+    @_functools.wraps(function)
+    def cached(hotkey, *args, **kwargs):
+        global _parse_cache_version
+        if not _is_str(hotkey) and not _is_number(hotkey):
+            return function(hotkey, *args, **kwargs)
+
+        version = getattr(_os_keyboard, 'tables_version', 0)
+        if version != _parse_cache_version:
+            for parse_cache in _parse_caches:
+                parse_cache.clear()
+            _parse_cache_version = version
+
+        key = (hotkey,) + args
+        if kwargs:
+            key += tuple(sorted(kwargs.items()))
+        try:
+            return cache[key]
+        except KeyError:
+            pass
+        result = function(hotkey, *args, **kwargs)
+        if len(cache) >= _parse_cache_size:
+            cache.clear()
+        cache[key] = result
+        return result
+    return cached
+
+@_cached_parse
 def key_to_scan_codes(key, error_if_missing=True):
     """
     Returns a list of scan codes associated with this key (name or scan code).
@@ -325,6 +395,7 @@ def key_to_scan_codes(key, error_if_missing=True):
     else:
         return t
 
+@_cached_parse
 def parse_hotkey(hotkey):
     """
     Parses a user-provided hotkey into nested tuples representing the
@@ -407,24 +478,56 @@ def is_pressed(hotkey):
         is_pressed('space') #-> True
         is_pressed('ctrl+space') #-> True
     """
-    _listener.start_if_necessary()
+    if not _listener.listening:
+        _listener.start_if_necessary()
 
     if _is_number(hotkey):
         # Shortcut.
-        with _pressed_events_lock:
-            return hotkey in _pressed_events
+        return bool(_pressed_mask & _scan_code_bit(hotkey))
+
+    pressed = _pressed_mask
+    return all(mask & pressed for mask in _hotkey_masks(hotkey))
 
+@_cached_parse
+def _hotkey_masks(hotkey):
     steps = parse_hotkey(hotkey)
     if len(steps) > 1:
         raise ValueError("Impossible to check if multi-step hotkeys are pressed (`a+b` is ok, `a, b` isn't).")
+    return tuple(_scan_codes_mask(scan_codes) for scan_codes in steps[0])
 
-    # Convert _pressed_events into a set 
-    with _pressed_events_lock:
-        pressed_scan_codes = set(_pressed_events)
-    for scan_codes in steps[0]:
-        if not any(scan_code in pressed_scan_codes for scan_code in scan_codes):
-            return False
-    return True
+class KeySet(object):
+    """
+    A list of keys and single-step hotkeys, parsed once into scan code
+    bitmasks for `are_pressed`.
+
+        watched = KeySet(['a', 'space', 'ctrl+s', 57])
+        are_pressed(watched) #-> [False, True, False, True]
+    """
+    def __init__(self, hotkeys):
+        self.hotkeys = tuple(hotkeys)
+        # One mask per key of each hotkey, any of its scan codes counts.
+        self.masks = tuple(_hotkey_masks(hotkey) for hotkey in self.hotkeys)
+
+    def __len__(self):
+        return len(self.hotkeys)
+
+def are_pressed(keys):
+    """
+    Returns a list with `is_pressed` of each of `keys`, all read from the same
+    snapshot of the keyboard state and without taking any lock. `keys` is a
+    `KeySet`; other lists are compiled into one first, so keep the `KeySet`
+    around when polling.
+
+        are_pressed(['a', 'ctrl+space']) #-> [False, True]
+    """
+    if not isinstance(keys, KeySet):
+        keys = KeySet(keys)
+    if not _listener.listening:
+        _listener.start_if_necessary()
+
+    pressed = _pressed_mask
+    return [bool(masks[0] & pressed) if len(masks) == 1 else all(mask & pressed for mask in masks)
+            for masks in keys.masks]
 
 def call_later(fn, args=(), delay=0.001):
     """
@@ -556,6 +659,7 @@ def remap_key(src, dst):
     return hook_key(src, handler, suppress=True)
 unremap_key = unhook_key
 
+@_cached_parse
 def parse_hotkey_combinations(hotkey):
     """
     Parses a user-provided hotkey. Differently from `parse_hotkey`,
@@ -2,24 +2,110 @@
 from threading import Thread, Lock
 import traceback
 import functools
+import time
 
 try:
     from queue import Queue
 except ImportError:
     from Queue import Queue
 
+_monotonic = getattr(time, 'monotonic', None) or time.time
+
+class _TimedQueue(Queue):
+    """
+    Queue that remembers when each item was put, so the consumer can tell how
+    long the last item it got has been waiting (`last_put_time`).
+    """
+    last_put_time = None
+
+    def _put(self, item):
+        self.queue.append((_monotonic(), item))
+
+    def _get(self):
+        self.last_put_time, item = self.queue.popleft()
+        return item
+
+    def get_batch(self, max_items):
+        """
+        Blocks until an item is available, then also takes the items queued
+        behind it, up to `max_items` in total. Returns the items and how long
+        the first one waited.
+        """
+        items = [self.get()]
+        waited = _monotonic() - self.last_put_time
+        with self.mutex:
+            while self.queue and len(items) < max_items:
+                items.append(self._get())
+            self.not_full.notify(len(items) - 1)
+        return items, waited
+
+class _HandlerOptions(object):
+    def __init__(self, priority, batch, event_types, scan_codes):
+        self.priority = priority
+        self.batch = batch
+        self.event_types = event_types
+        self.scan_codes = scan_codes
+
+    def accepts(self, event):
+        if self.event_types is not None and getattr(event, 'event_type', None) not in self.event_types:
+            return False
+        if self.scan_codes is not None and getattr(event, 'scan_code', None) not in self.scan_codes:
+            return False
+        return True
+
 class GenericListener(object):
     lock = Lock()
+    # Maximum number of queued events processed per wakeup.
+    batch_size = 64
 
     def __init__(self):
         self.handlers = []
+        # Handlers added with non-default options, see `add_handler`.
+        self.handler_options = {}
+        # (event_type, scan_code) -> [(handler, is_batch)] of the handlers
+        # interested in such events. Rebuilt when handlers are added or
+        # removed; the length also catches `del handlers[:]`.
+        self.handlers_version = 0
+        self._dispatch = {}
+        self._dispatch_version = None
         self.listening = False
-        self.queue = Queue()
+        self.queue = _TimedQueue()
+
+        self.processed_events = 0
+        self.processed_batches = 0
+        self.max_batch = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+
+    def invoke_handlers(self, event, batched=None):
+        """
+        Calls the handlers interested in `event`, in priority order, until one
+        of them returns True. Batch handlers are not called, the event is
+        appended to their list in `batched` instead (without it they get
+        `[event]` right away).
+        """
+        version = (self.handlers_version, len(self.handlers))
+        if version != self._dispatch_version:
+            self._dispatch = {}
+            self._dispatch_version = version
+        key = (getattr(event, 'event_type', None), getattr(event, 'scan_code', None))
+        entries = self._dispatch.get(key)
+        if entries is None:
+            entries = self._dispatch[key] = []
+            for handler in self.handlers:
+                options = self.handler_options.get(handler)
+                if options is None or options.accepts(event):
+                    entries.append((handler, options is not None and options.batch))
 
-    def invoke_handlers(self, event):
-        for handler in self.handlers:
+        for handler, is_batch in entries:
+            argument = event
+            if is_batch:
+                if batched is not None:
+                    batched.setdefault(handler, []).append(event)
+                    continue
+                argument = [event]
             try:
-                if handler(event):
+                if handler(argument):
                     # Stop processing this hotkey.
                     return 1
             except Exception as e:
@@ -50,24 +136,88 @@ class GenericListener(object):
 
     def process(self):
         """
-        Loops over the underlying queue of events and processes them in order.
+        Loops over the underlying queue of events and processes them in order,
+        taking up to `batch_size` events at a time. Each event goes through
+        `pre_process_event` and the per-event handlers before the next one;
+        batch handlers get their share of the batch at the end, as one list.
         """
         assert self.queue is not None
         while True:
-            event = self.queue.get()
-            if self.pre_process_event(event):
-                self.invoke_handlers(event)
-            self.queue.task_done()
-            
-    def add_handler(self, handler):
+            events, lag = self.queue.get_batch(self.batch_size)
+            self.update_stats(len(events), lag)
+
+            batched = {}
+            for event in events:
+                if self.pre_process_event(event):
+                    self.invoke_handlers(event, batched)
+            for handler in list(self.handlers):
+                handler_events = batched.pop(handler, None)
+                if handler_events:
+                    try:
+                        handler(handler_events)
+                    except Exception as e:
+                        traceback.print_exc()
+
+            for event in events:
+                self.queue.task_done()
+
+    def update_stats(self, batch_size, lag):
+        """
+        Records a batch of `batch_size` events, the oldest of which waited
+        `lag` seconds in the queue.
+        """
+        self.processed_events += batch_size
+        self.processed_batches += 1
+        self.max_batch = max(self.max_batch, batch_size)
+        self.last_lag = lag
+        self.max_lag = max(self.max_lag, lag)
+
+    def lag_stats(self):
+        """
+        Returns how far the processing thread is behind the OS events: events
+        still queued, seconds the oldest event of the last batch waited and the
+        worst such wait, and batch counts.
+        """
+        return {
+            'queued': self.queue.qsize(),
+            'last_lag': self.last_lag,
+            'max_lag': self.max_lag,
+            'events': self.processed_events,
+            'batches': self.processed_batches,
+            'max_batch': self.max_batch,
+        }
+
+    def add_handler(self, handler, priority=0, batch=False, event_types=None, scan_codes=None):
         """
         Adds a function to receive each event captured, starting the capturing
         process if necessary.
+
+        - `priority`: handlers with higher priority are called first, ties in
+        the order they were added.
+        - `batch`: if true the handler is called once per processed batch with
+        the list of its events, instead of once per event.
+        - `event_types`, `scan_codes`: only events with one of these
+        `event_type`s / `scan_code`s are passed to the handler.
         """
         self.start_if_necessary()
-        self.handlers.append(handler)
+        priority_of = lambda h: getattr(self.handler_options.get(h), 'priority', 0)
+        index = len(self.handlers)
+        while index and priority_of(self.handlers[index - 1]) < priority:
+            index -= 1
+
+        if priority or batch or event_types is not None or scan_codes is not None:
+            self.handler_options[handler] = _HandlerOptions(
+                priority, batch,
+                None if event_types is None else frozenset(event_types),
+                None if scan_codes is None else frozenset(scan_codes))
+        else:
+            self.handler_options.pop(handler, None)
+        self.handlers.insert(index, handler)
+        self.handlers_version += 1
 
     def remove_handler(self, handler):
         """ Removes a previously added event handler. """
         while handler in self.handlers:
             self.handlers.remove(handler)
+        self.handler_options.pop(handler, None)
+        self.handlers_version += 1
@@ -110,6 +110,8 @@ class TestKeyboard(unittest.TestCase):
         del output_events[:]
         keyboard._recording = None
         keyboard._pressed_events.clear()
+        keyboard._pressed_mask = 0
+        keyboard._pressed_key = ()
         keyboard._physically_pressed_keys.clear()
         keyboard._logically_pressed_keys.clear()
         keyboard._hotkeys.clear()
@@ -176,6 +178,12 @@ class TestKeyboard(unittest.TestCase):
     def test_key_to_scan_code_empty(self):
         with self.assertRaises(ValueError):
             keyboard.key_to_scan_codes('none')
+    def test_key_to_scan_code_keyword_argument(self):
+        self.assertEqual(keyboard.key_to_scan_codes('none', error_if_missing=False), ())
+        self.assertEqual(keyboard.key_to_scan_codes(1, error_if_missing=False), (1,))
+        self.assertEqual(keyboard.key_to_scan_codes('a', error_if_missing=False), (1,))
+        with self.assertRaises(ValueError):
+            keyboard.key_to_scan_codes('none', error_if_missing=True)
     def test_key_to_scan_code_duplicated(self):
         self.assertEqual(keyboard.key_to_scan_codes('duplicated'), (20,))
 
@@ -207,6 +215,17 @@ class TestKeyboard(unittest.TestCase):
         self.assertEqual(keyboard.parse_hotkey(result), (((1,),),))
     def test_parse_hotkey_list_names(self):
         self.assertEqual(keyboard.parse_hotkey(['a', 'b', 'c']), (((1,), (2,), (3,)),))
+    def test_parse_hotkey_cached(self):
+        self.assertIs(keyboard.parse_hotkey('a+b'), keyboard.parse_hotkey('a+b'))
+    def test_parse_hotkey_cache_invalidated(self):
+        self.assertEqual(keyboard.parse_hotkey('a+b'), (((1,), (2,)),))
+        dummy_keys['a'] = [(30, [])]
+        keyboard._os_keyboard.tables_version += 1
+        try:
+            self.assertEqual(keyboard.parse_hotkey('a+b'), (((30,), (2,)),))
+        finally:
+            dummy_keys['a'] = [(1, [])]
+            keyboard._os_keyboard.tables_version += 1
 
     def test_is_pressed_none(self):
         self.assertFalse(keyboard.is_pressed('a'))
@@ -237,6 +256,20 @@ class TestKeyboard(unittest.TestCase):
         with self.assertRaises(ValueError):
             keyboard.is_pressed('a, b')
 
+    def test_are_pressed(self):
+        keys = keyboard.KeySet(['a', 'b', 'shift+a', 'shift+b', 1, -1])
+        self.assertEqual(keyboard.are_pressed(keys), [False] * 6)
+        self.do(d_shift+d_a)
+        self.assertEqual(keyboard.are_pressed(keys), [True, False, True, False, True, False])
+        self.do(u_a)
+        self.assertEqual(keyboard.are_pressed(keys), [False, False, False, False, False, False])
+    def test_are_pressed_list(self):
+        self.do(d_a)
+        self.assertEqual(keyboard.are_pressed(['a', 'b']), [True, False])
+    def test_are_pressed_multi_step_fail(self):
+        with self.assertRaises(ValueError):
+            keyboard.KeySet(['a, b'])
+
     def test_send_single_press_release(self):
         keyboard.send('a', do_press=True, do_release=True)
         self.do([], d_a+u_a)
@@ -293,6 +326,34 @@ class TestKeyboard(unittest.TestCase):
         keyboard.unhook_all()
         self.do(d_a+u_a, d_a+u_a)
         self.assertEqual(self.i, 4)
+    def test_handler_priority(self):
+        calls = []
+        keyboard._listener.add_handler(lambda e: calls.append('low'), priority=-1)
+        keyboard._listener.add_handler(lambda e: calls.append('default'))
+        keyboard._listener.add_handler(lambda e: calls.append('high'), priority=1)
+        self.do(d_a)
+        self.assertEqual(calls, ['high', 'default', 'low'])
+    def test_handler_filters(self):
+        calls = []
+        keyboard._listener.add_handler(lambda e: calls.append(('b', e.event_type)), scan_codes=[2])
+        keyboard._listener.add_handler(lambda e: calls.append(('up', e.scan_code)), event_types=[KEY_UP])
+        self.do(d_a+u_a+d_b)
+        self.assertEqual(calls, [('up', 1), ('b', KEY_DOWN)])
+    def test_handler_batch(self):
+        batches = []
+        keyboard._listener.add_handler(batches.append, batch=True, event_types=[KEY_DOWN])
+        self.do(d_a+d_b+u_a)
+        self.assertTrue(all(isinstance(batch, list) and batch for batch in batches))
+        self.assertEqual([e.scan_code for batch in batches for e in batch], [1, 2])
+    def test_lag_stats(self):
+        before = keyboard._listener.lag_stats()['events']
+        keyboard.hook(lambda e: None)
+        self.do(du_a)
+        stats = keyboard._listener.lag_stats()
+        self.assertEqual(stats['events'] - before, 2)
+        self.assertEqual(stats['queued'], 0)
+        self.assertGreaterEqual(stats['max_lag'], stats['last_lag'])
+
     def test_hook_blocking(self):
         self.i = 0
         def count(e):
@@ -2,15 +2,20 @@
 import struct
 import os
 import atexit
+import select
 from time import time as now
 from threading import Thread
 from glob import glob
+from collections import deque
 try:
     from queue import Queue
 except ImportError:
     from Queue import Queue
 
 event_bin_format = 'llHHI'
+event_size = struct.calcsize(event_bin_format)
+# Maximum number of events taken from a device with a single read.
+read_batch_size = 64
 
 # Taken from include/linux/input.h
 # https://www.kernel.org/doc/Documentation/input/event-codes.txt
@@ -80,10 +85,13 @@ class EventDevice(object):
         return self._output_file
 
     def read_event(self):
-        data = self.input_file.read(struct.calcsize(event_bin_format))
+        data = self.input_file.read(event_size)
         seconds, microseconds, type, code, value = struct.unpack(event_bin_format, data)
         return seconds + microseconds / 1e6, type, code, value, self.path
 
+    def read_events(self):
+        return [self.read_event()]
+
     def write_event(self, type, code, value):
         integer, fraction = divmod(now(), 1)
         seconds = int(integer)
@@ -97,20 +105,70 @@ class EventDevice(object):
         self.output_file.flush()
 
 class AggregatedEventDevice(object):
+    """
+    Reads all devices from a single thread. epoll (select where unavailable)
+    reports which devices have input, each of them is read with one syscall
+    of up to `read_batch_size` events into a preallocated buffer, and the
+    decoded events of that read are queued together as one batch.
+    """
     def __init__(self, devices, output=None):
         self.event_queue = Queue()
         self.devices = devices
         self.output = output or self.devices[0]
-        def start_reading(device):
-            while True:
-                self.event_queue.put(device.read_event())
-        for device in self.devices:
-            thread = Thread(target=start_reading, args=[device])
-            thread.setDaemon(True)
-            thread.start()
+        self._pending = deque()
+        thread = Thread(target=self._read_devices)
+        thread.daemon = True
+        thread.start()
+
+    def _read_devices(self):
+        devices_by_fd = {device.input_file.fileno(): device for device in self.devices}
+        buffer = bytearray(event_size * read_batch_size)
+        view = memoryview(buffer)
+
+        if hasattr(select, 'epoll'):
+            poller = select.epoll()
+            for fd in devices_by_fd:
+                poller.register(fd, select.EPOLLIN)
+            wait = lambda: [fd for fd, mask in poller.poll()]
+            forget = poller.unregister
+        else:
+            wait = lambda: select.select(list(devices_by_fd), [], [])[0]
+            forget = lambda fd: None
+
+        while devices_by_fd:
+            for fd in wait():
+                device = devices_by_fd.get(fd)
+                if device is None:
+                    continue
+                try:
+                    size = os.readv(fd, [buffer])
+                except (BlockingIOError, InterruptedError):
+                    continue
+                except OSError:
+                    size = 0
+                if not size:
+                    # Device was unplugged, keep reading the others.
+                    del devices_by_fd[fd]
+                    forget(fd)
+                    continue
+                # The kernel only returns whole events.
+                batch = [(seconds + microseconds / 1e6, type, code, value, device.path)
+                         for seconds, microseconds, type, code, value
+                         in struct.iter_unpack(event_bin_format, view[:size - size % event_size])]
+                self.event_queue.put(batch)
+
+    def read_events(self):
+        """ Blocks until events are available and returns all of them, in order. """
+        if self._pending:
+            batch = list(self._pending)
+            self._pending.clear()
+            return batch
+        return self.event_queue.get(block=True)
 
     def read_event(self):
-        return self.event_queue.get(block=True)
+        while not self._pending:
+            self._pending.extend(self.event_queue.get(block=True))
+        return self._pending.popleft()
 
     def write_event(self, type, code, value):
         self.output.write_event(type, code, value)
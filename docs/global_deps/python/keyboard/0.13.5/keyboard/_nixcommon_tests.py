@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+import os
+import struct
+import unittest
+
+from . import _nixcommon
+from . import _nixkeyboard
+from ._nixcommon import AggregatedEventDevice, EV_KEY, EV_SYN, event_bin_format
+from ._keyboard_event import KEY_DOWN, KEY_UP
+
+def pack(seconds, type, code, value):
+    return struct.pack(event_bin_format, seconds, 500000, type, code, value)
+
+class FakeEventDevice(object):
+    """ Pipe standing in for /dev/input/eventX. """
+    def __init__(self, path):
+        self.path = path
+        read_fd, self.write_fd = os.pipe()
+        self.input_file = os.fdopen(read_fd, 'rb')
+
+    def write(self, *events):
+        # One write below PIPE_BUF is atomic, like an evdev read of whole events.
+        os.write(self.write_fd, b''.join(pack(*event) for event in events))
+
+    def unplug(self):
+        if self.write_fd is not None:
+            os.close(self.write_fd)
+            self.write_fd = None
+
+class TestAggregatedEventDevice(unittest.TestCase):
+    def setUp(self):
+        self.first = FakeEventDevice('first')
+        self.second = FakeEventDevice('second')
+        self.device = AggregatedEventDevice([self.first, self.second])
+
+    def tearDown(self):
+        # The reader thread drops both devices and exits.
+        self.first.unplug()
+        self.second.unplug()
+
+    def test_batch_of_one_read(self):
+        self.first.write((1, EV_KEY, 30, 1), (1, EV_SYN, 0, 0), (2, EV_KEY, 30, 0))
+        self.assertEqual(self.device.read_events(), [
+            (1.5, EV_KEY, 30, 1, 'first'),
+            (1.5, EV_SYN, 0, 0, 'first'),
+            (2.5, EV_KEY, 30, 0, 'first'),
+        ])
+
+    def test_read_event_splits_batches(self):
+        self.first.write((1, EV_KEY, 30, 1), (2, EV_KEY, 30, 0))
+        self.assertEqual(self.device.read_event(), (1.5, EV_KEY, 30, 1, 'first'))
+        self.assertEqual(self.device.read_event(), (2.5, EV_KEY, 30, 0, 'first'))
+
+    def test_read_events_returns_leftovers_first(self):
+        self.first.write((1, EV_KEY, 30, 1), (2, EV_KEY, 30, 0), (3, EV_KEY, 31, 1))
+        self.device.read_event()
+        self.assertEqual([e[0] for e in self.device.read_events()], [2.5, 3.5])
+
+    def test_batches_are_capped(self):
+        count = _nixcommon.read_batch_size + 3
+        self.first.write(*[(i, EV_KEY, 30, i % 2) for i in range(count)])
+        events = []
+        while len(events) < count:
+            batch = self.device.read_events()
+            self.assertLessEqual(len(batch), _nixcommon.read_batch_size)
+            events.extend(batch)
+        self.assertEqual([e[0] for e in events], [i + 0.5 for i in range(count)])
+
+    def test_unplugged_device_does_not_stop_the_others(self):
+        self.first.unplug()
+        self.second.write((4, EV_KEY, 44, 1))
+        self.assertEqual(self.device.read_events(), [(4.5, EV_KEY, 44, 1, 'second')])
+
+class _Stop(Exception):
+    pass
+
+class FakeBatchDevice(object):
+    def __init__(self, batches):
+        self.batches = list(batches)
+
+    def read_events(self):
+        if not self.batches:
+            raise _Stop()
+        return self.batches.pop(0)
+
+class TestNixKeyboardListen(unittest.TestCase):
+    def setUp(self):
+        self.saved = (_nixkeyboard.build_device, _nixkeyboard.build_tables, _nixkeyboard.device,
+                      dict(_nixkeyboard.to_name), set(_nixkeyboard.pressed_modifiers))
+        _nixkeyboard.build_device = lambda: None
+        _nixkeyboard.build_tables = lambda: None
+        _nixkeyboard.to_name.clear()
+        _nixkeyboard.to_name[(42, ())] = ['shift']
+        _nixkeyboard.to_name[(30, ())] = ['a']
+        _nixkeyboard.to_name[(30, ('shift',))] = ['A']
+        _nixkeyboard.pressed_modifiers.clear()
+
+    def tearDown(self):
+        build_device, build_tables, device, to_name, pressed = self.saved
+        _nixkeyboard.build_device, _nixkeyboard.build_tables, _nixkeyboard.device = build_device, build_tables, device
+        _nixkeyboard.to_name.clear()
+        _nixkeyboard.to_name.update(to_name)
+        _nixkeyboard.pressed_modifiers.clear()
+        _nixkeyboard.pressed_modifiers.update(pressed)
+
+    def listen(self, *batches):
+        _nixkeyboard.device = FakeBatchDevice(batches)
+        events = []
+        with self.assertRaises(_Stop):
+            _nixkeyboard.listen(events.append)
+        return events
+
+    def test_every_event_of_a_batch_in_order(self):
+        events = self.listen(
+            [(1, EV_KEY, 42, 1, 'kbd'), (1, EV_SYN, 0, 0, 'kbd'), (2, EV_KEY, 30, 1, 'kbd')],
+            [(3, EV_KEY, 30, 0, 'kbd'), (4, EV_KEY, 42, 0, 'kbd'), (5, EV_KEY, 30, 1, 'kbd')])
+        self.assertEqual([(e.event_type, e.name, e.time) for e in events], [
+            (KEY_DOWN, 'shift', 1), (KEY_DOWN, 'A', 2), (KEY_UP, 'A', 3),
+            (KEY_UP, 'shift', 4), (KEY_DOWN, 'a', 5)])
+
+    def test_modifiers_update_within_a_batch(self):
+        events = self.listen([(1, EV_KEY, 42, 1, 'kbd'), (2, EV_KEY, 30, 1, 'kbd')])
+        self.assertEqual(events[0].modifiers, ())
+        self.assertEqual(events[1].modifiers, ('shift',))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -52,6 +52,8 @@ import re
 to_name = defaultdict(list)
 from_name = defaultdict(list)
 keypad_scan_codes = set()
+# Incremented whenever the tables above are (re)built.
+tables_version = 0
 
 def register_key(key_and_modifiers, name):
     if name not in to_name[key_and_modifiers]:
@@ -60,6 +62,7 @@ def register_key(key_and_modifiers, name):
         from_name[name].append(key_and_modifiers)
 
 def build_tables():
+    global tables_version
     if to_name and from_name: return
     ensure_root()
 
@@ -102,6 +105,8 @@ def build_tables():
             from_name[original].extend(from_name[synonym])
             from_name[synonym].extend(from_name[original])
 
+    tables_version += 1
+
 device = None
 def build_device():
     global device
@@ -120,25 +125,25 @@ def listen(callback):
     build_tables()
 
     while True:
-        time, type, code, value, device_id = device.read_event()
-        if type != EV_KEY:
-            continue
-
-        scan_code = code
-        event_type = KEY_DOWN if value else KEY_UP # 0 = UP, 1 = DOWN, 2 = HOLD
-
-        pressed_modifiers_tuple = tuple(sorted(pressed_modifiers))
-        names = to_name[(scan_code, pressed_modifiers_tuple)] or to_name[(scan_code, ())] or ['unknown']
-        name = names[0]
-            
-        if name in all_modifiers:
-            if event_type == KEY_DOWN:
-                pressed_modifiers.add(name)
-            else:
-                pressed_modifiers.discard(name)
-
-        is_keypad = scan_code in keypad_scan_codes
-        callback(KeyboardEvent(event_type=event_type, scan_code=scan_code, name=name, time=time, device=device_id, is_keypad=is_keypad, modifiers=pressed_modifiers_tuple))
+        for time, type, code, value, device_id in device.read_events():
+            if type != EV_KEY:
+                continue
+
+            scan_code = code
+            event_type = KEY_DOWN if value else KEY_UP # 0 = UP, 1 = DOWN, 2 = HOLD
+
+            pressed_modifiers_tuple = tuple(sorted(pressed_modifiers))
+            names = to_name[(scan_code, pressed_modifiers_tuple)] or to_name[(scan_code, ())] or ['unknown']
+            name = names[0]
+
+            if name in all_modifiers:
+                if event_type == KEY_DOWN:
+                    pressed_modifiers.add(name)
+                else:
+                    pressed_modifiers.discard(name)
+
+            is_keypad = scan_code in keypad_scan_codes
+            callback(KeyboardEvent(event_type=event_type, scan_code=scan_code, name=name, time=time, device=device_id, is_keypad=is_keypad, modifiers=pressed_modifiers_tuple))
 
 def write_event(scan_code, is_down):
     build_device()
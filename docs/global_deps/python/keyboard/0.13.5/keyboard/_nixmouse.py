@@ -76,29 +76,35 @@ def listen(queue):
     build_device()
 
     while True:
-        time, type, code, value, device_id = device.read_event()
-        if type == EV_SYN or type == EV_MSC:
-            continue
-
-        event = None
-        arg = None
-
-        if type == EV_KEY:
-            event = ButtonEvent(DOWN if value else UP, button_by_code.get(code, '?'), time)
-        elif type == EV_REL:
-            value, = struct.unpack('i', struct.pack('I', value))
-
-            if code == REL_WHEEL:
-                event = WheelEvent(value, time)
-            elif code in (REL_X, REL_Y):
-                x, y = get_position()
-                event = MoveEvent(x, y, time)
-
-        if event is None:
-            # Unknown event type.
-            continue
-
-        queue.put(event)
+        # The pointer position is queried, not computed from the deltas, so
+        # consecutive motion events of a batch make a single MoveEvent.
+        moved = False
+        for time, type, code, value, device_id in device.read_events():
+            if type == EV_SYN or type == EV_MSC:
+                continue
+
+            event = None
+            arg = None
+
+            if type == EV_KEY:
+                event = ButtonEvent(DOWN if value else UP, button_by_code.get(code, '?'), time)
+            elif type == EV_REL:
+                value, = struct.unpack('i', struct.pack('I', value))
+
+                if code == REL_WHEEL:
+                    event = WheelEvent(value, time)
+                elif code in (REL_X, REL_Y):
+                    if moved:
+                        continue
+                    x, y = get_position()
+                    event = MoveEvent(x, y, time)
+
+            if event is None:
+                # Unknown event type.
+                continue
+
+            moved = isinstance(event, MoveEvent)
+            queue.put(event)
 
 def press(button=LEFT):
     build_device()
@@ -333,6 +333,8 @@ tables_lock = Lock()
 to_name = defaultdict(list)
 from_name = defaultdict(list)
 scan_code_to_vk = {}
+# Incremented whenever the tables above are (re)built.
+tables_version = 0
 
 distinct_modifiers = [
     (),
@@ -385,6 +387,7 @@ def _setup_name_tables():
     Ensures the scan code/virtual key code/name translation tables are
     filled.
     """
+    global tables_version
     with tables_lock:
         if to_name: return
 
@@ -435,6 +438,8 @@ def _setup_name_tables():
     for name, entries in list(from_name.items()):
         from_name[name] = sorted(set(entries), key=order_key)
 
+    tables_version += 1
+
 # Called by keyboard/__init__.py
 init = _setup_name_tables
 
@@ -0,0 +1,13 @@
+import os
+import sys
+
+# std_functs and the orchestrator are not packages, skills and the bot import them
+# from sys.path, so the tests do the same.
+# Run with `python -m pytest tests` or `python -m unittest discover -s tests`.
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STD_FUNCTS = os.path.join(REPO_ROOT, "docs", "assets", "lib", "std_functs")
+PRAR_SRC = os.path.join(REPO_ROOT, "docs", "bots", "Prar", "src")
+
+for path in (STD_FUNCTS, PRAR_SRC):
+    if path not in sys.path:
+        sys.path.insert(0, path)
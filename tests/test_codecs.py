@@ -0,0 +1,107 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import _paths  # noqa: F401
+import yaml
+import read_write_temp as rwt
+
+np = rwt.np
+
+
+class _Data:
+    def __init__(self, **attrs):
+        self.__dict__.update(attrs)
+
+
+def _sample(kind):
+    if kind == "bytes":
+        return bytes(range(256)) * 20
+    if kind == "text":
+        return "talos ünïcode " * 300
+    if kind == "object":
+        return {"list": [1.5, 2, None, "x"], "nested": {"a": [True, False]}}
+    if np is None:
+        return None
+    # 2d gradients keep the left-neighbour deltas of delta-zlib small but non-zero
+    return (np.arange(48 * 64 * 3, dtype=np.uint16) % 251).astype(np.uint8).reshape(48, 64, 3)
+
+
+class CodecRoundTripTest(unittest.TestCase):
+    def assertSameValue(self, expected, actual):
+        if np is not None and isinstance(expected, np.ndarray):
+            self.assertIsInstance(actual, np.ndarray)
+            self.assertEqual(actual.dtype, expected.dtype)
+            np.testing.assert_array_equal(actual, expected)
+        else:
+            self.assertEqual(actual, expected)
+
+    def test_every_registered_codec(self):
+        for name, spec in rwt.CODECS.items():
+            value = _sample(spec["kind"])
+            if value is None:
+                continue
+            with self.subTest(codec=name):
+                try:
+                    data, meta = rwt.encode_value(name, value)
+                except ImportError as e:
+                    self.skipTest(f"{name}: {e}")
+                meta["type"] = rwt._safe_type(value)
+                self.assertIsInstance(data, bytes)
+                self.assertSameValue(value, rwt.decode_value(name, data, meta))
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_delta_zlib_signed_and_wrapping(self):
+        value = np.array([[0, 255, 1, 254], [7, 7, 0, 200]], dtype=np.uint8)
+        data, meta = rwt.encode_value("delta-zlib", value)
+        np.testing.assert_array_equal(rwt.decode_value("delta-zlib", data, meta), value)
+        value = np.array([[-5, 100, -100], [3, -3, 0]], dtype=np.int16)
+        data, meta = rwt.encode_value("delta-zlib", value)
+        np.testing.assert_array_equal(rwt.decode_value("delta-zlib", data, meta), value)
+
+    def test_unknown_codec_decodes_to_bytes(self):
+        self.assertEqual(rwt.decode_value("no-such-codec", b"abc", {}), b"abc")
+
+    def test_set_codec_rejects_unknown(self):
+        with self.assertRaises(ValueError):
+            rwt.set_codec("frame", "no-such-codec")
+
+
+class CodecEndToEndTest(unittest.TestCase):
+    """writeToFile -> readFromFile with the codec picked by runtime.codecs."""
+
+    def setUp(self):
+        self.bot = tempfile.mkdtemp(prefix="talos_test_")
+        self.out_root = os.path.join(self.bot, "out")
+        self.out_dir = os.path.join(self.out_root, "producer_out.glob")
+        self.conf = os.path.join(self.bot, "config.yaml")
+
+    def tearDown(self):
+        rwt.flush_writers()
+        rwt._writer_state.pop(self.out_dir, None)
+        shutil.rmtree(self.bot, ignore_errors=True)
+
+    def roundtrip(self, codec, value):
+        with open(self.conf, "w") as f:
+            yaml.safe_dump({"runtime": {"codecs": {"payload": codec}}}, f)
+        rwt.writeToFile(_Data(payload=value), self.out_dir, "producer")
+        self.assertTrue(rwt.flush_writers(5))
+        env = rwt._load_envelope(self.out_dir, "file", "json")
+        self.assertEqual(env["attributes"]["payload"]["format"], codec)
+        got = rwt.readFromFile(self.out_root, self.conf, _Data(payload=None),
+                               [("producer_out.glob", "payload", "payload", 0)])
+        return got.payload
+
+    def test_json_zlib_list(self):
+        value = [float(i) / 3 for i in range(500)]
+        self.assertEqual(self.roundtrip("json-zlib", value), value)
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_raw_ndarray(self):
+        value = _sample("array")
+        np.testing.assert_array_equal(self.roundtrip("raw", value), value)
+
+
+if __name__ == "__main__":
+    unittest.main()
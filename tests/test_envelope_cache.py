@@ -0,0 +1,140 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import _paths  # noqa: F401
+import yaml
+import envelope_bin
+import read_write_temp as rwt
+
+np = rwt.np
+
+
+class _Data:
+    def __init__(self, **attrs):
+        self.__dict__.update(attrs)
+
+
+def _envelope(epoch, version):
+    return {"skill_id": "producer", "timestamp": 1.0, "epoch": epoch, "version": version,
+            "attributes": {"x": {"storage": "inline", "type": "int", "value": 1, "version": version}}}
+
+
+def _rewrite_in_place(path, payload):
+    """Same inode, size and mtime as before: only the envelope itself tells them apart."""
+    st = os.stat(path)
+    with open(path, "r+b") as f:
+        f.write(payload)
+        f.truncate()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    after = os.stat(path)
+    assert (after.st_ino, after.st_size, after.st_mtime_ns) == (st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+class EnvelopeCacheTest(unittest.TestCase):
+    FORMATS = {
+        "json": lambda env: json.dumps(env, separators=(",", ":")).encode("utf-8"),
+        "binary": envelope_bin.encode,
+    }
+
+    def setUp(self):
+        self.skill_dir = tempfile.mkdtemp(prefix="talos_test_")
+
+    def tearDown(self):
+        rwt._envelope_cache.pop(self.skill_dir, None)
+        shutil.rmtree(self.skill_dir, ignore_errors=True)
+
+    def publish(self, fmt, env):
+        with open(rwt._envelope_path(self.skill_dir, fmt), "wb") as f:
+            f.write(self.FORMATS[fmt](env))
+
+    def test_unchanged_file_is_not_parsed_again(self):
+        for fmt in self.FORMATS:
+            with self.subTest(fmt=fmt):
+                self.publish(fmt, _envelope(1, 7))
+                first = rwt._load_envelope(self.skill_dir, "file", fmt)
+                self.assertIs(rwt._load_envelope(self.skill_dir, "file", fmt), first)
+
+    def test_new_version_with_identical_stat_is_reloaded(self):
+        for fmt, encode in self.FORMATS.items():
+            with self.subTest(fmt=fmt):
+                self.publish(fmt, _envelope(1, 7))
+                self.assertEqual(rwt._load_envelope(self.skill_dir, "file", fmt)["version"], 7)
+                _rewrite_in_place(rwt._envelope_path(self.skill_dir, fmt), encode(_envelope(1, 8)))
+                self.assertEqual(rwt._load_envelope(self.skill_dir, "file", fmt)["version"], 8)
+
+    def test_new_epoch_with_identical_stat_is_reloaded(self):
+        for fmt, encode in self.FORMATS.items():
+            with self.subTest(fmt=fmt):
+                self.publish(fmt, _envelope(1, 7))
+                self.assertEqual(rwt._load_envelope(self.skill_dir, "file", fmt)["epoch"], 1)
+                _rewrite_in_place(rwt._envelope_path(self.skill_dir, fmt), encode(_envelope(2, 7)))
+                self.assertEqual(rwt._load_envelope(self.skill_dir, "file", fmt)["epoch"], 2)
+
+    def test_missing_envelope(self):
+        self.assertIsNone(rwt._load_envelope(self.skill_dir, "file", "json"))
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class ValueCacheTest(unittest.TestCase):
+    """Blobs are decoded again only when their attribute version or the epoch changes."""
+
+    DESCRIPTOR = [("producer_out.glob", "payload", "payload", 0), ("producer_out.glob", "seq", "seq", 0)]
+
+    def setUp(self):
+        self.bot = tempfile.mkdtemp(prefix="talos_test_")
+        self.out_root = os.path.join(self.bot, "out")
+        self.out_dir = os.path.join(self.out_root, "producer_out.glob")
+        self.conf = os.path.join(self.bot, "config.yaml")
+        with open(self.conf, "w") as f:
+            yaml.safe_dump({"runtime": {"codecs": {"payload": "raw"}}}, f)
+        self.array = np.arange(4096, dtype=np.uint8).reshape(64, 64)
+
+    def tearDown(self):
+        rwt.flush_writers()
+        rwt._writer_state.pop(self.out_dir, None)
+        rwt._envelope_cache.pop(self.out_dir, None)
+        for key in [k for k in rwt._value_cache if k[0] == self.out_dir]:
+            del rwt._value_cache[key]
+        shutil.rmtree(self.bot, ignore_errors=True)
+
+    def publish(self, seq, payload):
+        rwt.writeToFile(_Data(payload=payload, seq=seq), self.out_dir, "producer")
+        self.assertTrue(rwt.flush_writers(5))
+
+    def read(self):
+        return rwt.readFromFile(self.out_root, self.conf, _Data(payload=None, seq=None), self.DESCRIPTOR)
+
+    def test_unchanged_blob_is_served_from_cache(self):
+        self.publish(1, self.array)
+        first = self.read()
+        self.publish(2, self.array)
+        second = self.read()
+        self.assertEqual(second.seq, 2)
+        self.assertIs(second.payload, first.payload)
+
+    def test_mark_dirty_reloads(self):
+        self.publish(1, self.array)
+        first = self.read()
+        # nothing changed, but mark_dirty forces a new version of the attribute
+        rwt.mark_dirty(self.out_dir, "payload")
+        self.publish(1, self.array)
+        second = self.read()
+        self.assertIsNot(second.payload, first.payload)
+        np.testing.assert_array_equal(second.payload, self.array)
+
+    def test_new_epoch_reloads(self):
+        self.publish(1, self.array)
+        first = self.read()
+        # a restarted producer counts versions from 1 again, under a new epoch
+        rwt._writer_state.pop(self.out_dir)
+        self.publish(1, self.array)
+        second = self.read()
+        self.assertIsNot(second.payload, first.payload)
+        np.testing.assert_array_equal(second.payload, self.array)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import _paths  # noqa: F401
+import launch_manifest
+
+
+class LaunchManifestTest(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp(prefix="talos_test_")
+        self.skill_dir = os.path.join(self.root, "skills", "Skill")
+        self.global_deps = os.path.join(self.root, "global_deps")
+        os.makedirs(os.path.join(self.skill_dir, "env"))
+        os.makedirs(os.path.join(self.skill_dir, "src"))
+        os.makedirs(self.global_deps)
+        self.paths = [os.path.join(self.root, "lib_a"), os.path.join(self.root, "lib_b")]
+        self.write_meta("3.x", self.paths)
+        self.write_registry({"3.x": sys.executable})
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def write_meta(self, version, paths):
+        with open(os.path.join(self.skill_dir, "env", "env_meta.json"), "w") as f:
+            json.dump({"python_version": version, "python_paths": paths}, f)
+
+    def write_registry(self, interpreters):
+        with open(os.path.join(self.global_deps, "dep_registry.json"), "w") as f:
+            json.dump({"python_interpreters": interpreters}, f)
+
+    def resolve(self):
+        return launch_manifest.resolve(self.skill_dir, self.global_deps)
+
+    def cached_path(self):
+        return os.path.join(self.skill_dir, "env", launch_manifest.MANIFEST_NAME)
+
+    def poison_cache(self):
+        """Marks the cached manifest, so a resolve that returns the mark came from the cache."""
+        with open(self.cached_path()) as f:
+            manifest = json.load(f)
+        manifest["python_paths"] = ["from-cache"]
+        with open(self.cached_path(), "w") as f:
+            json.dump(manifest, f)
+
+    def test_resolve(self):
+        manifest = self.resolve()
+        self.assertEqual(manifest["python_exe"], os.path.normpath(sys.executable))
+        self.assertEqual(manifest["python_paths"], [os.path.normpath(p) for p in self.paths])
+        self.assertTrue(os.path.isfile(self.cached_path()))
+
+    def test_unchanged_sources_use_the_cache(self):
+        self.resolve()
+        self.poison_cache()
+        self.assertEqual(self.resolve()["python_paths"], ["from-cache"])
+
+    def test_env_meta_change_invalidates(self):
+        self.resolve()
+        self.poison_cache()
+        self.write_meta("3.x", self.paths + [os.path.join(self.root, "lib_c")])
+        self.assertEqual(len(self.resolve()["python_paths"]), 3)
+
+    def test_registry_change_invalidates(self):
+        self.resolve()
+        self.poison_cache()
+        self.write_registry({"3.x": sys.executable, "2.7": "/nowhere/python2.7"})
+        self.assertNotEqual(self.resolve()["python_paths"], ["from-cache"])
+
+    def test_old_format_invalidates(self):
+        self.resolve()
+        self.poison_cache()
+        with open(self.cached_path()) as f:
+            manifest = json.load(f)
+        manifest["format"] = launch_manifest.FORMAT - 1
+        with open(self.cached_path(), "w") as f:
+            json.dump(manifest, f)
+        self.assertNotEqual(self.resolve()["python_paths"], ["from-cache"])
+
+    def test_unknown_version(self):
+        self.write_meta("9.9", self.paths)
+        self.assertIsNone(self.resolve())
+
+    def test_missing_interpreter(self):
+        self.write_registry({"3.x": os.path.join(self.root, "no-python")})
+        self.assertIsNone(self.resolve())
+
+    def test_command_sets_sys_path_like_the_wrapper(self):
+        script = os.path.join(self.skill_dir, "src", "main.py")
+        with open(script, "w") as f:
+            f.write("import sys, json\nprint(json.dumps([sys.path[:3], sys.argv]))\n")
+        out = subprocess.run(launch_manifest.command(self.resolve(), script, ["--flag"]),
+                             capture_output=True, text=True, check=True).stdout
+        path, argv = json.loads(out)
+        # python_wrapper inserts every python_path at the front in turn, then the script dir
+        lib_a, lib_b = (os.path.normpath(p) for p in self.paths)
+        self.assertEqual(path, [os.path.dirname(script), lib_b, lib_a])
+        self.assertEqual(argv, [script, "--flag"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import _paths  # noqa: F401
+import shm_ring
+from shm_ring import RingReader, RingWriter
+
+
+class _LaggingReader(RingReader):
+    """Sees a stale header sequence on its first look, like a reader preempted between
+    reading the header and the slot while the writer went on publishing."""
+
+    def __init__(self, skill_dir, stale_seq):
+        super().__init__(skill_dir)
+        self.stale_seq = stale_seq
+        self.calls = 0
+
+    def sequence(self):
+        self.calls += 1
+        seq = super().sequence()
+        return self.stale_seq if self.calls == 1 else seq
+
+
+class RingTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp(prefix="talos_test_")
+        self.writer = RingWriter(self.dir, slot_size=64, slot_count=4)
+
+    def tearDown(self):
+        self.writer.close()
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def publish(self, *payloads):
+        for payload in payloads:
+            self.writer.publish(payload)
+
+    def test_nothing_published(self):
+        reader = RingReader(self.dir)
+        self.assertEqual(reader.sequence(), 0)
+        self.assertIsNone(reader.read_latest())
+        reader.close()
+
+    def test_missing_ring(self):
+        reader = RingReader(os.path.join(self.dir, "nowhere"))
+        self.assertIsNone(reader.sequence())
+        self.assertIsNone(reader.read_latest())
+
+    def test_reads_latest(self):
+        reader = RingReader(self.dir)
+        self.publish(b"one", b"two", b"three")
+        self.assertEqual(reader.read_latest(), (3, b"three"))
+        self.publish(b"four", b"five")  # wraps around the 4 slots
+        self.assertEqual(reader.read_latest(), (5, b"five"))
+        reader.close()
+
+    def test_overwritten_slot_is_retried(self):
+        self.publish(b"1", b"2", b"3", b"4", b"5")
+        # slot of seq 1 now holds seq 5: the stale look must not return it as seq 1
+        reader = _LaggingReader(self.dir, stale_seq=1)
+        self.assertEqual(reader.read_latest(), (5, b"5"))
+        self.assertEqual(reader.calls, 2)
+        reader.close()
+
+    def test_slot_being_written_is_not_returned(self):
+        self.publish(b"first", b"second")
+        # the writer zeroes a slot's sequence while it copies the payload in
+        off = shm_ring._slot_offset(self.writer.slot_size, 2 % self.writer.slot_count)
+        shm_ring._SLOT.pack_into(self.writer._mm, off, 0, 0)
+        reader = RingReader(self.dir)
+        self.assertIsNone(reader.read_latest(retries=3))
+        shm_ring._SLOT.pack_into(self.writer._mm, off, 2, len(b"second"))
+        self.assertEqual(reader.read_latest(), (2, b"second"))
+        reader.close()
+
+    def test_growing_ring_reattaches_readers(self):
+        reader = RingReader(self.dir)
+        self.publish(b"small")
+        self.assertEqual(reader.read_latest(), (1, b"small"))
+        big = bytes(range(256)) * 2
+        self.publish(big)
+        self.assertGreaterEqual(self.writer.slot_size, len(big))
+        self.assertEqual(reader.read_latest(), (2, big))
+        reader.close()
+
+    def test_writer_resumes_sequence_of_existing_ring(self):
+        self.publish(b"a", b"b")
+        self.writer.close()
+        self.writer = RingWriter(self.dir, slot_size=64, slot_count=4)
+        self.assertEqual(self.writer.publish(b"c"), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
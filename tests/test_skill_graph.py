@@ -0,0 +1,74 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import _paths  # noqa: F401
+import main as orchestrator
+
+
+def _graph(path, skills, edges, extra_nodes=()):
+    nodes = [{"id": "start", "skillType": "start"}] + [{"id": s, "skillType": "skill"} for s in skills]
+    nodes += list(extra_nodes)
+    with open(path, "w") as f:
+        json.dump({"nodes": nodes, "edges": [
+            {"type": "attribute", "fromSkillId": a, "toSkillId": b, "fromPortId": "out", "toPortId": "in"}
+            for a, b in edges]}, f)
+    return orchestrator.SkillGraph(path)
+
+
+class SkillGraphTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp(prefix="talos_test_")
+        self.path = os.path.join(self.dir, "skillgraph.json")
+        # two branches, A -> B -> C with A -> C, X -> Y, and a lone Z
+        self.graph = _graph(self.path, ["A", "B", "C", "X", "Y", "Z"],
+                            [("start", "A"), ("A", "B"), ("B", "C"), ("A", "C"), ("X", "Y")])
+
+    def tearDown(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def test_levels(self):
+        levels = self.graph.levels
+        index = {s: i for i, level in enumerate(levels) for s in level}
+        self.assertEqual(sorted(levels[0]), ["A", "X", "Z"])
+        self.assertLess(index["A"], index["B"])
+        self.assertLess(index["B"], index["C"])
+        self.assertLess(index["X"], index["Y"])
+        self.assertEqual(sorted(self.graph.sinks()), ["C", "Y", "Z"])
+
+    def test_components(self):
+        self.assertEqual(sorted(sorted(c) for c in self.graph.components), [["A", "B", "C"], ["X", "Y"], ["Z"]])
+
+    def test_core_plan_enough_cores(self):
+        plan = self.graph.core_plan([0, 1, 2, 3, 4, 5])
+        self.assertEqual(sorted(plan), ["A", "B", "C", "X", "Y", "Z"])
+        self.assertEqual(len(set(plan.values())), 6)
+
+    def test_core_plan_branches_keep_to_their_cores(self):
+        plan = self.graph.core_plan([0, 1, 2, 3])
+        branch_cores = [{plan[s] for s in c} for c in self.graph.components]
+        for i, cores in enumerate(branch_cores):
+            for other in branch_cores[i + 1:]:
+                self.assertFalse(cores & other)
+        # the biggest branch gets the spare core
+        self.assertEqual(len({plan[s] for s in "ABC"}), 2)
+
+    def test_core_plan_fewer_cores_than_branches(self):
+        plan = self.graph.core_plan([0, 1])
+        for branch in self.graph.components:
+            self.assertEqual(len({plan[s] for s in branch}), 1)
+        self.assertEqual(set(plan.values()), {0, 1})
+
+    def test_core_plan_without_cores(self):
+        self.assertEqual(self.graph.core_plan([]), {})
+
+    def test_cycle_starts_last(self):
+        graph = _graph(self.path, ["A", "B", "C"], [("A", "B"), ("B", "C"), ("C", "B")])
+        self.assertEqual(graph.levels[0], ["A"])
+        self.assertEqual(sorted(graph.levels[-1]), ["B", "C"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+import time
+import unittest
+
+import _paths  # noqa: F401
+import main as orchestrator
+
+
+class _Process:
+    _next_pid = 1000
+
+    def __init__(self):
+        _Process._next_pid += 1
+        self.pid = _Process._next_pid
+        self.returncode = None
+
+    def poll(self):
+        return self.returncode
+
+
+class _Orchestrator:
+    """What the supervisor uses of SkillOrchestrator: the processes and start_skill."""
+
+    def __init__(self):
+        self.processes = {}
+        self.cpus = {}
+        self.in_process = None
+        self.supervisor = None
+        self.launch_fails = False
+        self.starts = []
+
+    def start_skill(self, skill_name, cpus=None):
+        self.starts.append((skill_name, cpus))
+        if self.launch_fails:
+            return
+        self.processes[skill_name] = _Process()
+        self.supervisor.started(skill_name, skill_name.lower())
+
+
+class SupervisorTest(unittest.TestCase):
+    def supervise(self, **settings):
+        self.orch = _Orchestrator()
+        self.sup = self.orch.supervisor = orchestrator.Supervisor(
+            self.orch, dict({"restart_backoff": 1.0, "restart_backoff_max": 4.0}, **settings))
+        self.now = time.monotonic()
+        self.orch.start_skill("Skill")
+        return self.sup.skills["Skill"]
+
+    def exit(self, code):
+        self.orch.processes["Skill"].returncode = code
+
+    def check(self, after=0.0):
+        self.now += after
+        self.sup._check(self.sup.skills["Skill"], self.now)
+
+    def crash_and_restart(self):
+        """Crashes the running skill and returns the backoff it was restarted after."""
+        state = self.sup.skills["Skill"]
+        self.exit(1)
+        self.check()
+        self.assertEqual(state.state, "backoff")
+        backoff = state.backoff
+        self.check(backoff - 0.01)
+        self.assertEqual(state.state, "backoff")
+        self.check(0.01)
+        self.assertEqual(state.state, "running")
+        return backoff
+
+    def test_backoff_doubles_up_to_the_max(self):
+        state = self.supervise()
+        self.assertEqual([self.crash_and_restart() for _ in range(5)], [1.0, 2.0, 4.0, 4.0, 4.0])
+        self.assertEqual(state.restarts, 5)
+        self.assertEqual(len(self.orch.starts), 6)
+
+    def test_backoff_resets_once_stable(self):
+        self.supervise()
+        self.crash_and_restart()
+        self.crash_and_restart()
+        self.check(orchestrator.Supervisor.STABLE_AFTER)
+        self.assertEqual(self.crash_and_restart(), 1.0)
+
+    def test_failed_launch_retries_with_longer_backoff(self):
+        state = self.supervise()
+        self.exit(1)
+        self.check()
+        self.orch.launch_fails = True
+        self.check(1.0)
+        self.assertEqual(state.state, "backoff")
+        self.assertEqual(state.backoff, 2.0)
+        self.orch.launch_fails = False
+        self.check(2.0)
+        self.assertEqual(state.state, "running")
+        self.assertEqual(state.restarts, 2)
+
+    def test_on_failure_leaves_clean_exits(self):
+        state = self.supervise()
+        self.exit(0)
+        self.check()
+        self.assertEqual((state.state, state.exit_code), ("exited", 0))
+        self.check(100.0)
+        self.assertEqual(len(self.orch.starts), 1)
+
+    def test_never(self):
+        state = self.supervise(restart="never")
+        self.exit(3)
+        self.check()
+        self.assertEqual((state.state, state.exit_code), ("exited", 3))
+
+    def test_always_restarts_clean_exits(self):
+        state = self.supervise(restart="always")
+        self.exit(0)
+        self.check()
+        self.assertEqual(state.state, "backoff")
+        self.check(1.0)
+        self.assertEqual(state.state, "running")
+
+    def test_policy_per_skill(self):
+        self.supervise(restart={"Skill": "never", "default": "always"})
+        self.assertEqual(self.sup.policy("Skill"), "never")
+        self.assertEqual(self.sup.policy("Other"), "always")
+        self.assertEqual(orchestrator.Supervisor(self.orch, {"restart": {}}).policy("Other"), "on-failure")
+
+    def test_restart_keeps_planned_cores(self):
+        self.supervise()
+        self.orch.cpus["Skill"] = {2}
+        self.crash_and_restart()
+        self.assertEqual(self.orch.starts[-1], ("Skill", {2}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import _paths  # noqa: F401
+import tick_clock
+from tick_clock import TickClock
+
+
+class _FakeTime:
+    """Stands in for the time module: perf_counter only moves when someone sleeps or
+    the test runs the loop body."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def perf_counter(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    def time(self):
+        return 1000.0 + self.now
+
+    def run(self, seconds):
+        self.now += seconds
+
+
+class TickClockTest(unittest.TestCase):
+    def setUp(self):
+        self.time = _FakeTime()
+        patcher = mock.patch.object(tick_clock, "time", self.time)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(tick_clock, "MAX_HZ", 0.0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def starts(self, clock, bodies):
+        """Runs one tick per body duration, returns the times the ticks started at."""
+        starts = []
+        for body in bodies:
+            clock.wait()
+            starts.append(round(self.time.now, 6))
+            self.time.run(body)
+        return starts
+
+    def test_steady_rate_sleeps_to_the_grid(self):
+        clock = TickClock(10)
+        self.assertEqual(self.starts(clock, [0.03, 0.05, 0.0, 0.02]), [0.0, 0.1, 0.2, 0.3])
+        self.assertEqual((clock.ticks, clock.overruns, clock.dropped), (4, 0, 0))
+
+    def test_drop_skips_missed_deadlines(self):
+        clock = TickClock(10, policy="drop")
+        # the second tick runs until 0.45: the 0.2 and 0.3 deadlines are dropped and the
+        # third tick starts at once for the 0.4 one, the fourth is back on the grid
+        self.assertEqual(self.starts(clock, [0.0, 0.35, 0.0, 0.0]), [0.0, 0.1, 0.45, 0.5])
+        self.assertEqual(clock.dropped, 2)
+        self.assertEqual(clock.overruns, 1)
+
+    def test_catch_up_runs_missed_ticks_back_to_back(self):
+        clock = TickClock(10, policy="catch-up")
+        self.assertEqual(self.starts(clock, [0.35, 0.0, 0.0, 0.0, 0.0]), [0.0, 0.35, 0.35, 0.35, 0.4])
+        self.assertEqual(clock.dropped, 0)
+        self.assertEqual(clock.ticks, 5)
+
+    def test_catch_up_gives_up_past_max_catch_up(self):
+        clock = TickClock(10, policy="catch-up")
+        behind = (tick_clock.MAX_CATCH_UP + 5) * 0.1
+        self.starts(clock, [behind, 0.0])
+        self.assertGreater(clock.dropped, 0)
+
+    def test_unpaced_clock_never_sleeps(self):
+        clock = TickClock(0)
+        self.starts(clock, [0.5, 0.0, 0.2])
+        self.assertEqual(clock.ticks, 3)
+        self.assertEqual(self.time.sleeps, [])
+
+    def test_phases_are_recorded(self):
+        clock = TickClock(10)
+        clock.wait()
+        with clock.phase("read"):
+            self.time.run(0.01)
+        with clock.phase("read"):
+            self.time.run(0.03)
+        stats = clock.stats()["phases"]["read"]
+        self.assertEqual(stats["count"], 2)
+        self.assertAlmostEqual(stats["mean_ms"], 20.0)
+        self.assertAlmostEqual(stats["max_ms"], 30.0)
+
+    def test_unknown_policy(self):
+        with self.assertRaises(ValueError):
+            TickClock(10, policy="sometimes")
+
+    def test_hz_from_environment(self):
+        with mock.patch.dict(os.environ, {"TALOS_TICK_HZ": "25"}):
+            self.assertEqual(TickClock().hz, 25.0)
+
+    def test_max_hz_caps_fixed_rates_only(self):
+        with mock.patch.dict(os.environ, {"TALOS_MAX_HZ": "50"}):
+            tick_clock.apply_env()
+        self.assertEqual(TickClock(200).hz, 50.0)
+        self.assertEqual(TickClock(20).hz, 20)
+        self.assertEqual(TickClock(0).hz, 0)
+        with mock.patch.dict(os.environ, {"TALOS_MAX_HZ": ""}):
+            tick_clock.apply_env()
+        self.assertEqual(TickClock(200).hz, 200)
+
+    def test_stats_are_dumped(self):
+        out = tempfile.mkdtemp(prefix="talos_test_")
+        self.addCleanup(shutil.rmtree, out, True)
+        path = os.path.join(out, "skill_out.glob", "tick_stats.json")
+        clock = TickClock(10, stats_path=path)
+        self.starts(clock, [0.0] * int(tick_clock.REPORT_INTERVAL * 10 + 5))
+        with open(path) as f:
+            stats = json.load(f)
+        self.assertGreater(stats["ticks"], 0)
+        self.assertIn("time", stats)
+
+
+if __name__ == "__main__":
+    unittest.main()